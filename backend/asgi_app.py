@@ -0,0 +1,326 @@
+"""
+Stress2Health ASGI Backend
+Asyncio variant of backend/app.py with the same `/`, `/health`, `/chat`,
+`/chat/draft`, `/sessions/stats` and `/metrics` contract. The event loop
+only parses requests and steps sessions; prediction, risk lookup and
+guidance rendering run in a bounded thread pool, so one worker can hold thousands of open
+connections and idle conversations while the model is busy.
+
+Run from backend/:
+    uvicorn asgi_app:app --host 0.0.0.0 --port 5001
+"""
+
+import asyncio
+import json
+import os
+import sys
+import time
+import warnings
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qs
+
+# Suppress sklearn version mismatch and feature-name warnings (the stress model
+# loads from its version-stamped bundle; these cover the joblib fallback and
+# the deep / fused models)
+warnings.filterwarnings("ignore", message="Trying to unpickle estimator")
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+# allow imports from project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from chatbot.chat_service import ChatService, ChatError, create_chatbot, create_sessions
+from chatbot.metrics import CONTENT_TYPE as METRICS_CONTENT_TYPE, MetricsRegistry
+from chatbot.profiling import create_profiler
+from chatbot.session_store import MemorySessionStore
+
+MAX_BODY_BYTES = 64 * 1024
+
+# initialize chatbot once (micro-batch sizes go to the /metrics registry)
+metrics_registry = MetricsRegistry()
+chatbot = create_chatbot(metrics_registry)
+
+# -----------------------------
+# Conversation store
+# -----------------------------
+sessions = create_sessions()
+chat_service = ChatService(chatbot, sessions, metrics=metrics_registry, profiler=create_profiler())
+
+# Model work leaves the event loop; the pool size bounds concurrent inference
+model_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("ASGI_MODEL_THREADS", "4")),
+    thread_name_prefix="model"
+)
+
+# SQLite / Redis lookups block, the in-memory store does not
+SESSION_IO_ON_LOOP = isinstance(sessions, MemorySessionStore)
+
+CORS_HEADERS = [
+    (b"access-control-allow-origin", b"*"),
+]
+
+
+# -----------------------------
+# HTTP helpers
+# -----------------------------
+async def read_body(receive):
+    """
+    Read the full request body (None if it exceeds MAX_BODY_BYTES or the
+    client went away)
+    """
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        if message["type"] == "http.disconnect":
+            return None
+        body += message.get("body", b"")
+        if len(body) > MAX_BODY_BYTES:
+            return None
+        more_body = message.get("more_body", False)
+    return body
+
+
+async def send_json(send, payload, status=200, headers=()):
+    """
+    Send a complete JSON response
+    """
+    body = json.dumps(payload).encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode("ascii")),
+            *CORS_HEADERS,
+            *headers,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def send_text(send, text, content_type, status=200):
+    """
+    Send a complete plain-text response
+    """
+    body = text.encode("utf-8")
+    await send({
+        "type": "http.response.start",
+        "status": status,
+        "headers": [
+            (b"content-type", content_type.encode("ascii")),
+            (b"content-length", str(len(body)).encode("ascii")),
+            *CORS_HEADERS,
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
+
+
+async def send_preflight(send, scope):
+    """
+    Answer a CORS preflight request (what flask-cors does for the Flask app)
+    """
+    request_headers = dict(scope["headers"])
+    await send({
+        "type": "http.response.start",
+        "status": 200,
+        "headers": [
+            (b"content-length", b"0"),
+            (b"access-control-allow-methods", b"GET, HEAD, POST, OPTIONS"),
+            (b"access-control-allow-headers",
+             request_headers.get(b"access-control-request-headers", b"content-type")),
+            *CORS_HEADERS,
+        ],
+    })
+    await send({"type": "http.response.body", "body": b""})
+
+
+def profile_requested(scope, path):
+    """
+    X-Profile header / ?profile= flag (or sampling) for /chat requests
+    """
+    if path != "/chat" or chat_service.profiler is None:
+        return False
+    header = dict(scope["headers"]).get(b"x-profile")
+    query = parse_qs(scope.get("query_string", b"").decode("latin-1")).get("profile")
+    return chat_service.should_profile(
+        header.decode("latin-1") if header is not None else None,
+        query[0] if query else None
+    )
+
+
+def parse_json(body):
+    """
+    Decode a JSON request body (None if malformed, like get_json(silent=True))
+    """
+    try:
+        return json.loads(body)
+    except ValueError:
+        return None
+
+
+# -----------------------------
+# Routes
+# -----------------------------
+async def index():
+    return {
+        "app": "Stress2Health",
+        "status": "ok",
+        "message": "API is running. Use POST /chat to interact.",
+        "health": "/health"
+    }, 200
+
+
+async def health():
+    return {"status": "ok"}, 200
+
+
+async def session_stats():
+    if SESSION_IO_ON_LOOP:
+        return sessions.stats(), 200
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(model_executor, sessions.stats), 200
+
+
+async def metrics():
+    return chat_service.metrics.render(), 200
+
+
+async def chat_draft(data, profile=False):
+    # O(delta) per call, so it stays on the loop unless the store blocks
+    if SESSION_IO_ON_LOOP:
+        return chat_service.handle_draft(data)
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(model_executor, chat_service.handle_draft, data)
+
+
+async def chat(data, profile=False):
+    if chatbot is None:
+        return {
+            "error": "Chatbot not initialized. Please check backend logs."
+        }, 503
+
+    loop = asyncio.get_running_loop()
+    try:
+        step = (profile, "chat_step", chat_service.advance_session, data)
+        # The step-one answer runs NLTK (and may load its corpora on a lazy
+        # start), so only the other steps stay on the loop
+        if SESSION_IO_ON_LOOP and not chat_service.answers_text_step(data):
+            reply, collected = chat_service.call_profiled(*step)
+        else:
+            reply, collected = await loop.run_in_executor(
+                model_executor, chat_service.call_profiled, *step
+            )
+        if reply is not None:
+            return reply, 200
+
+        # ALL DATA COLLECTED → RUN ANALYSIS off the event loop
+        payload = await loop.run_in_executor(
+            model_executor, chat_service.call_profiled,
+            profile, "chat_analysis", chat_service.complete_session, *collected
+        )
+        return payload, 200
+
+    except ChatError as e:
+        return {"error": e.message}, e.status
+    except Exception as e:
+        import traceback
+        error_trace = traceback.format_exc()
+        print(f"❌ Error in chat endpoint: {error_trace}")
+        return {
+            "error": f"An error occurred: {str(e)}"
+        }, 500
+
+
+POST_ROUTES = {
+    "/chat": chat,
+    "/chat/draft": chat_draft,
+}
+
+GET_ROUTES = {
+    "/": index,
+    "/health": health,
+    "/sessions/stats": session_stats,
+    "/metrics": metrics,
+}
+
+
+# -----------------------------
+# ASGI entry point
+# -----------------------------
+async def lifespan(receive, send):
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            model_executor.shutdown(wait=False)
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def dispatch(scope, receive, send, path):
+    """
+    Route one HTTP request and send the response
+
+    Returns:
+        tuple: (route label for metrics, HTTP status); like the Flask
+            backend, unmatched paths and methods are labelled "other"
+    """
+    method = scope["method"]
+
+    if method == "OPTIONS":
+        await send_preflight(send, scope)
+        known = path in POST_ROUTES or path in GET_ROUTES
+        return (path if known else "other"), 200
+
+    post_route = POST_ROUTES.get(path)
+    if post_route is not None:
+        if method != "POST":
+            await send_json(send, {"error": "Method not allowed"}, 405,
+                            [(b"allow", b"POST, OPTIONS")])
+            return "other", 405
+        body = await read_body(receive)
+        if body is None:
+            await send_json(send, {"error": "Request body too large"}, 413)
+            return path, 413
+        payload, status = await post_route(parse_json(body), profile_requested(scope, path))
+        await send_json(send, payload, status)
+        return path, status
+
+    route = GET_ROUTES.get(path)
+    if route is None:
+        await send_json(send, {"error": "Not found"}, 404)
+        return "other", 404
+    if method not in ("GET", "HEAD"):
+        await send_json(send, {"error": "Method not allowed"}, 405,
+                        [(b"allow", b"GET, HEAD, OPTIONS")])
+        return "other", 405
+
+    payload, status = await route()
+    if isinstance(payload, str):
+        await send_text(send, payload, METRICS_CONTENT_TYPE, status)
+    else:
+        await send_json(send, payload, status)
+    return path, status
+
+
+async def app(scope, receive, send):
+    if scope["type"] == "lifespan":
+        await lifespan(receive, send)
+        return
+    if scope["type"] != "http":
+        return
+
+    path = scope["path"].rstrip("/") or "/"
+    start = time.perf_counter()
+    route, status = await dispatch(scope, receive, send, path)
+    # Every route but the scrape itself, as the Flask backend records them
+    if route != "/metrics":
+        chat_service.observe_request(route, status, time.perf_counter() - start)
+
+
+if __name__ == "__main__":
+    import uvicorn
+
+    print("🚀 ASGI backend running on http://localhost:5001")
+    uvicorn.run(app, host="0.0.0.0", port=5001)
@@ -0,0 +1,11 @@
+"""
+Benchmarks Package
+Micro and end-to-end benchmarks for the predictors, text processing, risk
+rules, guidance and the /chat conversation. Inputs are synthetic, drawn
+from the data/stress_dataset.csv schema.
+
+Run from the project root:
+    python -m benchmarks.run                   # all suites
+    python -m benchmarks.run --only text       # names containing "text"
+    python -m benchmarks.run --update-baseline # record the reference run
+"""
@@ -0,0 +1,166 @@
+"""
+Benchmark Harness
+Times benchmark cases with warmup and repeated samples, summarizes them,
+saves results as JSON and compares a run against a baseline run.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from collections import namedtuple
+
+
+# name: unique id; function: zero-argument callable; items: units of work
+# per call (rows, messages, conversations) for throughput
+Case = namedtuple('Case', ['name', 'function', 'items'])
+
+
+def measure(function, items=1, warmup=0.2, repeat=15, min_time=0.02):
+    """
+    Time a zero-argument callable
+
+    Calls run untimed for `warmup` seconds (at least once) to fill caches
+    and calibrate how many calls make up one sample of at least `min_time`
+    seconds.
+
+    Args:
+        function (callable): Code under test
+        items (int): Units of work per call
+        warmup (float): Warmup seconds
+        repeat (int): Timed samples
+        min_time (float): Minimum seconds per sample
+
+    Returns:
+        dict: Per-call seconds (median, mean, stdev, min, max, p95) and
+            items per second at the median
+    """
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + warmup
+    while True:
+        function()
+        calls += 1
+        now = time.perf_counter()
+        if now >= deadline:
+            break
+    number = max(1, int(min_time / ((now - start) / calls)))
+
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(number):
+            function()
+        samples.append((time.perf_counter() - t0) / number)
+
+    return summarize(samples, number, items)
+
+
+def summarize(samples, number=1, items=1):
+    """
+    Summary statistics of per-call sample times (seconds)
+    """
+    ordered = sorted(samples)
+    median = statistics.median(ordered)
+    return {
+        'samples': len(ordered),
+        'calls_per_sample': number,
+        'items': items,
+        'median_s': median,
+        'mean_s': statistics.fmean(ordered),
+        'stdev_s': statistics.stdev(ordered) if len(ordered) > 1 else 0.0,
+        'min_s': ordered[0],
+        'max_s': ordered[-1],
+        'p95_s': ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))],
+        'items_per_s': items / median if median else 0.0,
+    }
+
+
+def environment():
+    """
+    What the numbers were measured on (baselines from another machine or
+    library version are not comparable)
+    """
+    versions = {}
+    for module in ('numpy', 'pandas', 'sklearn', 'flask', 'tensorflow'):
+        loaded = sys.modules.get(module)
+        if loaded is not None:
+            versions[module] = getattr(loaded, '__version__', 'unknown')
+
+    try:
+        commit = subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], capture_output=True, text=True,
+            timeout=5, cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        ).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+
+    return {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'cpus': os.cpu_count(),
+        'libraries': versions,
+        'commit': commit,
+        'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+    }
+
+
+def save_results(path, results, env):
+    """
+    Write a run as JSON
+
+    Args:
+        path (str): Output file (parent directories are created)
+        results (dict): Benchmark name -> summary
+        env (dict): environment()
+    """
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'environment': env, 'results': results}, f, indent=2, sort_keys=True)
+
+
+def load_results(path):
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def compare(results, baseline, threshold=0.15):
+    """
+    Compare median times with a baseline run
+
+    Args:
+        results (dict): Benchmark name -> summary (this run)
+        baseline (dict): Benchmark name -> summary (reference run)
+        threshold (float): Relative slowdown that counts as a regression
+
+    Returns:
+        list: (name, baseline median, current median, ratio, verdict) for
+            benchmarks in both runs; verdict is 'regression', 'improvement'
+            or 'ok'
+    """
+    rows = []
+    for name, current in results.items():
+        reference = baseline.get(name)
+        if reference is None or not reference['median_s']:
+            continue
+        ratio = current['median_s'] / reference['median_s']
+        if ratio > 1 + threshold:
+            verdict = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            verdict = 'improvement'
+        else:
+            verdict = 'ok'
+        rows.append((name, reference['median_s'], current['median_s'], ratio, verdict))
+    return rows
+
+
+def format_seconds(seconds):
+    if seconds >= 1:
+        return f"{seconds:.2f} s"
+    if seconds >= 1e-3:
+        return f"{seconds * 1e3:.2f} ms"
+    return f"{seconds * 1e6:.1f} us"
@@ -0,0 +1,144 @@
+"""
+Benchmark Runner
+Runs the benchmark suites, prints a table, saves the run as JSON and
+compares it with a baseline run; exits with status 1 on a regression.
+
+    python -m benchmarks.run [--only NAME ...] [--quick]
+        [--output PATH] [--baseline PATH] [--update-baseline] [--threshold 0.15]
+"""
+
+import argparse
+import os
+import sys
+import warnings
+
+# allow imports from project root
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# Suppress sklearn version mismatch and feature-name warnings (model works correctly)
+warnings.filterwarnings("ignore", message="Trying to unpickle estimator")
+warnings.filterwarnings("ignore", message="X does not have valid feature names")
+
+from benchmarks.harness import (
+    compare, environment, format_seconds, load_results, measure, save_results
+)
+from benchmarks.suites import PROJECT_ROOT, SUITES
+from benchmarks.synthetic import DEFAULT_SCHEMA_PATH, SyntheticData
+
+
+RESULTS_DIR = os.path.join(PROJECT_ROOT, 'benchmarks', 'results')
+
+
+def _names_suite(term, suite_name):
+    return term in suite_name or term.startswith(suite_name + '.')
+
+
+def selected_suites(only):
+    """
+    Suites to set up for --only terms: a term naming a suite ('risk') or a
+    case in it ('predictor.random_forest') selects just that suite; any
+    other term ('batch') is a case substring, so every suite is set up
+
+    Returns:
+        list: Suite names
+    """
+    if not only:
+        return list(SUITES)
+    selected = set()
+    for term in only:
+        named = [name for name in SUITES if _names_suite(term, name)]
+        selected.update(named or SUITES)
+    return [name for name in SUITES if name in selected]
+
+
+def run(only=None, quick=False, batch_size=1000, seed=42, schema_path=DEFAULT_SCHEMA_PATH):
+    """
+    Run every selected benchmark
+
+    Args:
+        only (list): Substrings; a benchmark runs if its name contains one
+            (suites no term can match are not set up)
+        quick (bool): Shorter warmup and fewer samples (smoke test)
+        batch_size (int): Rows per batched call
+        seed (int): Synthetic data seed
+
+    Returns:
+        dict: Benchmark name -> summary
+    """
+    settings = dict(warmup=0.05, repeat=5, min_time=0.005) if quick else {}
+    results = {}
+
+    for suite_name in selected_suites(only):
+        data = SyntheticData(schema_path, seed=seed)
+        for case in SUITES[suite_name](data, batch_size):
+            if only and not any(term in case.name for term in only):
+                continue
+            summary = measure(case.function, items=case.items, **settings)
+            results[case.name] = summary
+            print(f"⏱️  {case.name:<38} {format_seconds(summary['median_s']):>10}"
+                  f"  ±{summary['stdev_s'] / summary['median_s'] * 100:4.1f}%"
+                  f"  {summary['items_per_s']:>12,.0f} items/s")
+
+    return results
+
+
+def print_comparison(rows, baseline_path):
+    print(f"\n📊 Compared with {baseline_path}")
+    print(f"{'benchmark':<40}{'baseline':>12}{'current':>12}{'ratio':>8}  verdict")
+    for name, before, after, ratio, verdict in rows:
+        marker = {'regression': '❌', 'improvement': '✅'}.get(verdict, '  ')
+        print(f"{name:<40}{format_seconds(before):>12}{format_seconds(after):>12}"
+              f"{ratio:>8.2f}  {marker} {verdict}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run Stress2Health benchmarks")
+    parser.add_argument("--only", nargs="+", help="Run benchmarks whose name contains one of these")
+    parser.add_argument("--quick", action="store_true", help="Short run (smoke test)")
+    parser.add_argument("--batch-size", type=int, default=1000, help="Rows per batched call")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--schema", default=DEFAULT_SCHEMA_PATH,
+                        help="CSV whose schema the synthetic data follows")
+    parser.add_argument("--output", default=os.path.join(RESULTS_DIR, 'latest.json'))
+    parser.add_argument("--baseline", default=os.path.join(RESULTS_DIR, 'baseline.json'))
+    parser.add_argument("--update-baseline", action="store_true",
+                        help="Save this run as the baseline")
+    parser.add_argument("--threshold", type=float, default=0.15,
+                        help="Relative slowdown reported as a regression")
+    args = parser.parse_args()
+
+    # Model paths are relative to the project root
+    os.chdir(PROJECT_ROOT)
+
+    results = run(args.only, args.quick, args.batch_size, args.seed, args.schema)
+    env = environment()
+    save_results(args.output, results, env)
+    print(f"\n💾 Results saved to {args.output}")
+
+    if args.update_baseline:
+        save_results(args.baseline, results, env)
+        print(f"💾 Baseline saved to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print("ℹ️  No baseline yet (run with --update-baseline to record one)")
+        return
+
+    baseline = load_results(args.baseline)
+    for key in ('python', 'machine', 'cpus', 'libraries'):
+        if baseline['environment'].get(key) != env.get(key):
+            print(f"⚠️  Baseline {key} differs ({baseline['environment'].get(key)} vs "
+                  f"{env.get(key)}), timings may not be comparable")
+
+    rows = compare(results, baseline['results'], args.threshold)
+    print_comparison(rows, args.baseline)
+
+    regressions = [row for row in rows if row[4] == 'regression']
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s) above {args.threshold:.0%}")
+        sys.exit(1)
+    print("\n✅ No regressions")
+
+
+if __name__ == "__main__":
+    main()
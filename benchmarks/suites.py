@@ -0,0 +1,198 @@
+"""
+Benchmark Suites
+Each suite builds its components once and yields Cases; components whose
+model artifacts or optional dependencies are missing are skipped.
+"""
+
+import itertools
+import os
+
+from benchmarks.harness import Case
+from nlp.features import FEATURE_COLUMNS
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+MODELS_DIR = os.path.join(PROJECT_ROOT, 'models')
+
+MODEL_TYPES = ['logistic', 'decision_tree', 'random_forest']
+
+RISK_COLUMNS = ['stress_level', 'bmi', 'physical_activity', 'sleep_hours']
+
+# Inputs cycled through by single-call benchmarks
+POOL_SIZE = 1000
+
+
+def skip(name, reason):
+    print(f"⏭️  {name}: skipped ({reason})")
+
+
+def _predictor_cases(prefix, predictor, rows, batch, batch_size):
+    profiles = itertools.cycle(rows)
+
+    def single():
+        predictor.predict(*next(profiles))
+
+    yield Case(f"{prefix}.single", single, 1)
+    yield Case(f"{prefix}.batch_{batch_size}", lambda: predictor.predict_batch(batch), batch_size)
+
+
+def predictor_cases(data, batch_size):
+    """
+    StressPredictor per model type, plus the compiled predictors loaded from
+    the model bundles
+    """
+    from nlp.ml_predictor import StressPredictor
+    from nlp.model_bundle import load_bundle_model
+
+    rows = data.rows(POOL_SIZE, FEATURE_COLUMNS)
+    batch = data.profiles(batch_size)
+
+    for model_type in MODEL_TYPES:
+        name = f"predictor.{model_type}"
+        if not os.path.isdir(os.path.join(MODELS_DIR, model_type)):
+            skip(name, "model not trained, run train_models.py")
+            continue
+        predictor = StressPredictor(model_type=model_type)
+        predictor.load_model(f"models/{model_type}")
+        yield from _predictor_cases(name, predictor, rows, batch, batch_size)
+
+    for model_type in MODEL_TYPES:
+        name = f"predictor.{model_type}_compiled"
+        try:
+            compiled = load_bundle_model(f"models/{model_type}")
+        except (OSError, ValueError) as e:
+            skip(name, e)
+            continue
+        yield from _predictor_cases(name, compiled, rows, batch, batch_size)
+
+
+def deep_cases(data, batch_size):
+    """
+    DeepStressPredictor (needs TensorFlow and a trained model)
+    """
+    from nlp import deep_predictor
+
+    if not deep_predictor.TENSORFLOW_AVAILABLE:
+        skip("deep", "TensorFlow not installed")
+        return
+    if not os.path.isdir(os.path.join(MODELS_DIR, 'deep_learning')):
+        skip("deep", "model not trained, run train_models.py")
+        return
+
+    predictor = deep_predictor.DeepStressPredictor()
+    predictor.load_model("models/deep_learning")
+    yield from _predictor_cases(
+        "deep", predictor, data.rows(POOL_SIZE, FEATURE_COLUMNS), data.profiles(batch_size), batch_size
+    )
+
+
+def text_cases(data, batch_size):
+    """
+    TextProcessor preprocessing and feature extraction, short and long input
+    """
+    from nlp.text_processor import TextProcessor
+
+    processor = TextProcessor(use_spacy=False)
+    try:
+        processor.warm_up()
+    except LookupError:
+        skip("text", "NLTK data not installed, see Step 5 of the Readme")
+        return
+
+    inputs = {
+        'short': data.messages(POOL_SIZE),
+        'long': data.messages(50, words=400),
+    }
+    for length, messages in inputs.items():
+        for label, method in (('preprocess', processor.preprocess_text),
+                              ('features', processor.extract_stress_features)):
+            pool = itertools.cycle(messages)
+            yield Case(f"text.{label}.{length}",
+                       lambda method=method, pool=pool: method(next(pool)), 1)
+
+
+def risk_cases(data, batch_size):
+    """
+    DiseaseRiskAssessor: rule evaluation, summary, table lookup and batch
+    """
+    from rules.disease_risk import DiseaseRiskAssessor
+
+    assessor = DiseaseRiskAssessor()
+    rows = data.rows(POOL_SIZE, RISK_COLUMNS)
+    assessments = [assessor.get_comprehensive_assessment(*row) for row in rows]
+    batch = data.profiles(batch_size)
+
+    pool = itertools.cycle(rows)
+    yield Case("risk.assess", lambda: assessor.get_comprehensive_assessment(*next(pool)), 1)
+
+    summaries = itertools.cycle(assessments)
+    yield Case("risk.summary", lambda: assessor.get_risk_summary(next(summaries)), 1)
+
+    lookups = itertools.cycle(rows)
+    yield Case("risk.lookup", lambda: assessor.lookup_assessment(*next(lookups)), 1)
+
+    yield Case(f"risk.batch_{batch_size}",
+               lambda: assessor.assess_batch(*(batch[c] for c in RISK_COLUMNS)), batch_size)
+
+
+def guidance_cases(data, batch_size):
+    """
+    HealthGuidanceGenerator with a warm cache (as served) and without cache
+    """
+    from rules.disease_risk import DiseaseRiskAssessor
+    from rules.health_guidance import HealthGuidanceGenerator
+
+    assessor = DiseaseRiskAssessor()
+    assessments = [assessor.get_comprehensive_assessment(*row)
+                   for row in data.rows(POOL_SIZE, RISK_COLUMNS)]
+
+    for label, generator in (('cached', HealthGuidanceGenerator()),
+                             ('uncached', HealthGuidanceGenerator(cache_size=0))):
+        pool = itertools.cycle(assessments)
+        yield Case(f"guidance.{label}",
+                   lambda generator=generator, pool=pool:
+                   generator.generate_comprehensive_guidance(next(pool)), 1)
+
+
+def chat_cases(data, batch_size):
+    """
+    One full /chat conversation (greeting plus six answers) through the
+    Flask test client
+    """
+    os.environ.setdefault("VERIFY_MODEL", "0")
+    try:
+        from backend.app import app, chatbot
+    except LookupError:
+        skip("chat", "NLTK data not installed, see Step 5 of the Readme")
+        return
+    if chatbot is None:
+        skip("chat", "chatbot failed to initialize (see the error above)")
+        return
+
+    client = app.test_client()
+    profiles = itertools.cycle(data.rows(
+        POOL_SIZE, ['sleep_hours', 'bmi', 'physical_activity', 'work_hours', 'social_interaction']
+    ))
+    messages = itertools.cycle(data.messages(POOL_SIZE))
+
+    def conversation():
+        answers = [next(messages), *(str(value) for value in next(profiles))]
+        reply = client.post("/chat", json={"message": "hi"}).get_json()
+        for answer in answers:
+            response = client.post("/chat", json={"message": answer,
+                                                  "session_id": reply["session_id"]})
+            reply = response.get_json()
+            if response.status_code != 200:
+                raise RuntimeError(f"/chat returned {response.status_code}: {reply}")
+
+    yield Case("chat.session", conversation, 1)
+
+
+SUITES = {
+    'predictor': predictor_cases,
+    'deep': deep_cases,
+    'text': text_cases,
+    'risk': risk_cases,
+    'guidance': guidance_cases,
+    'chat': chat_cases,
+}
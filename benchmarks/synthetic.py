@@ -0,0 +1,101 @@
+"""
+Synthetic Benchmark Data
+Generates lifestyle profiles and messages shaped like data/stress_dataset.csv:
+numeric columns are drawn uniformly from the observed range, categorical
+columns from the observed values and messages from the observed vocabulary,
+so benchmark inputs follow the schema without reusing the rows themselves.
+"""
+
+import csv
+import os
+import random
+
+import numpy as np
+
+
+DEFAULT_SCHEMA_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'stress_dataset.csv'
+)
+
+# Not in the stress dataset; used by the risk rules
+BMI_RANGE = (15.0, 42.0)
+
+
+class SyntheticData:
+    """
+    Random inputs following the stress dataset schema
+    """
+
+    def __init__(self, schema_path=DEFAULT_SCHEMA_PATH, seed=42):
+        """
+        Args:
+            schema_path (str): CSV whose columns and value ranges are mimicked
+            seed (int): Random seed (same seed, same data)
+        """
+        with open(schema_path, newline='', encoding='utf-8') as f:
+            rows = list(csv.DictReader(f))
+        if not rows:
+            raise ValueError(f"{schema_path} has no rows to infer a schema from")
+
+        self.columns = list(rows[0])
+        self.numeric = {}       # column -> (min, max)
+        self.categorical = {}   # column -> sorted values
+        self.vocabulary = []
+        self.message_lengths = []
+
+        for column in self.columns:
+            values = [row[column] for row in rows]
+            if column == 'text':
+                words = [value.split() for value in values]
+                self.vocabulary = sorted({w for sentence in words for w in sentence})
+                self.message_lengths = [len(sentence) for sentence in words]
+                continue
+            try:
+                numbers = [float(v) for v in values]
+                self.numeric[column] = (min(numbers), max(numbers))
+            except ValueError:
+                self.categorical[column] = sorted(set(values))
+
+        self.seed = seed
+        self.rng = np.random.default_rng(seed)
+        self.text_rng = random.Random(seed)
+
+    def profiles(self, n):
+        """
+        Lifestyle profiles in the columnar form predict_batch() takes
+
+        Args:
+            n (int): Number of profiles
+
+        Returns:
+            dict: Column -> ndarray (float64 for numeric, str for categorical),
+                plus 'bmi'
+        """
+        columns = {}
+        for column, (low, high) in self.numeric.items():
+            columns[column] = np.round(self.rng.uniform(low, high, n), 1)
+        for column, values in self.categorical.items():
+            columns[column] = self.rng.choice(values, n)
+        columns['bmi'] = np.round(self.rng.uniform(*BMI_RANGE, n), 1)
+        return columns
+
+    def rows(self, n, columns):
+        """
+        Profiles as a list of tuples of plain Python values (single calls)
+        """
+        profiles = self.profiles(n)
+        return list(zip(*(profiles[column].tolist() for column in columns)))
+
+    def message(self, words=None):
+        """
+        One message built from the dataset vocabulary
+
+        Args:
+            words (int): Length in words (default: a length seen in the data)
+        """
+        if words is None:
+            words = self.text_rng.choice(self.message_lengths)
+        return ' '.join(self.text_rng.choice(self.vocabulary) for _ in range(words)).capitalize()
+
+    def messages(self, n, words=None):
+        return [self.message(words) for _ in range(n)]
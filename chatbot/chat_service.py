@@ -0,0 +1,699 @@
+"""
+Chat Service Module
+Framework-independent /chat conversation flow shared by the Flask backend
+(backend/app.py) and the ASGI backend (backend/asgi_app.py).
+"""
+
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+
+from chatbot.health_bot import HealthChatbot
+from chatbot.metrics import MetricsRegistry
+from chatbot.session_store import ChatSession, create_session_store
+from nlp.lemma_cache import get_shared_cache
+from nlp.micro_batcher import MicroBatchPredictor
+
+
+QUESTIONS = [
+    ("text", "How are you feeling today? (Describe your stress, mood, or concerns)"),
+    ("sleep_hours", "How many hours do you sleep on average per night?"),
+    ("bmi", "What is your Body Mass Index (BMI)?"),
+    ("physical_activity", "What is your physical activity level? (low / medium / high)"),
+    ("work_hours", "How many hours do you work per day on average?"),
+    ("social_interaction", "What is your social interaction level? (low / medium / high)")
+]
+
+DISCLAIMER = "⚠️ This is educational only, not medical advice."
+
+# Step-one drafts kept per worker (oldest dropped beyond this)
+MAX_DRAFTS = 10000
+
+# Timed parts of the final (step-6) analysis; 'assess' covers the risk
+# assessment and its summary (one table lookup)
+ANALYSIS_STAGES = ("predict_stress", "assess", "guidance", "total")
+
+# Micro-batch sizes (requests per model call)
+BATCH_SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256)
+
+
+def create_chatbot(metrics=None):
+    """
+    Initialize the chatbot from environment settings (see Readme)
+
+    Args:
+        metrics (MetricsRegistry): Records micro-batch sizes (pass the
+            ChatService's registry; None: not recorded)
+
+    Returns:
+        HealthChatbot: Ready chatbot, or None if initialization failed
+    """
+    try:
+        print("🔄 Initializing AI Health Chatbot...")
+        start = time.perf_counter()
+
+        wrap_predictor = None
+        # Batch concurrent predictions into one model call (needs concurrent requests)
+        if os.environ.get("MICRO_BATCH") == "1":
+            def wrap_predictor(predictor):
+                print("⚡ Micro-batching enabled for stress predictions")
+                on_batch = None
+                if metrics is not None:
+                    on_batch = metrics.histogram("micro_batch_size", buckets=BATCH_SIZE_BUCKETS).observe
+                return MicroBatchPredictor(
+                    predictor,
+                    max_batch_size=int(os.environ.get("MICRO_BATCH_MAX_SIZE", "64")),
+                    max_wait_ms=float(os.environ.get("MICRO_BATCH_WAIT_MS", "2")),
+                    on_batch=on_batch
+                )
+
+        chatbot = HealthChatbot(
+            model_type=os.environ.get("MODEL_TYPE", "logistic"),
+            use_deep_learning=os.environ.get("USE_DEEP_LEARNING") == "1",
+            # NumPy-only inference from the memory-mapped model bundle
+            # (no pandas / sklearn / unpickling on the request path)
+            compiled=os.environ.get("COMPILED_INFERENCE", "1") != "0",
+            use_spacy=os.environ.get("USE_SPACY") == "1",
+            wrap_predictor=wrap_predictor,
+            # Score the step-one message together with the lifestyle answers
+            use_fused=os.environ.get("FUSED_PREDICTOR") == "1"
+        )
+
+        # eager: load before serving, background: load while serving, lazy: on first use
+        prewarm = os.environ.get("CHATBOT_PREWARM", "eager")
+        if prewarm == "eager":
+            chatbot.prewarm()
+        elif prewarm == "background":
+            chatbot.prewarm(background=True)
+            print("🔄 Loading models in the background")
+
+        # Verify model is working by testing predict method
+        if prewarm == "eager" and os.environ.get("VERIFY_MODEL", "1") != "0":
+            verify_chatbot(chatbot)
+
+        for name, seconds in chatbot.startup_report().items():
+            print(f"⏱️  {name}: {seconds * 1000:.0f} ms")
+        print(f"✅ Chatbot initialized successfully! ({(time.perf_counter() - start) * 1000:.0f} ms)")
+        return chatbot
+    except Exception as e:
+        print(f"❌ Error initializing chatbot: {e}")
+        import traceback
+        traceback.print_exc()
+        return None
+
+
+def verify_chatbot(chatbot):
+    """
+    Run one test prediction and report whether the model works
+    """
+    print("🔍 Verifying model...")
+    if hasattr(chatbot.stress_predictor, 'predict'):
+        # Test prediction to ensure model works
+        try:
+            test_prediction = chatbot.stress_predictor.predict(
+                sleep_hours=7.0,
+                physical_activity='medium',
+                work_hours=8.0,
+                social_interaction='medium'
+            )
+            print(f"✅ Model verification successful! Test prediction: {test_prediction}")
+        except Exception as test_error:
+            print(f"⚠️  Model verification failed: {test_error}")
+            print("   The model may still work, but there might be issues.")
+    else:
+        print("⚠️  Warning: predict method not found on stress_predictor")
+
+
+def create_sessions():
+    """
+    Build the conversation store from environment settings
+
+    memory:// (single worker), sqlite:///path.db (workers on one host)
+    or redis://host:6379/0
+    """
+    return create_session_store(
+        os.environ.get("SESSION_STORE_URL", "memory://"),
+        ttl_seconds=float(os.environ.get("SESSION_TTL_SECONDS", "1800")),
+        max_sessions=int(os.environ.get("SESSION_MAX_ENTRIES", "10000"))
+    )
+
+
+class ChatError(Exception):
+    """
+    Error reply for /chat: {"error": message} with an HTTP status
+    """
+
+    def __init__(self, message, status=400):
+        super().__init__(message)
+        self.message = message
+        self.status = status
+
+
+class TextDraft:
+    """
+    Step-one message being typed: incremental features plus the raw chunks
+    """
+
+    __slots__ = ('session', 'chunks')
+
+    def __init__(self, session):
+        self.session = session
+        self.chunks = []
+
+    def feed(self, delta):
+        self.chunks.append(delta)
+        self.session.feed(delta)
+
+    def text(self):
+        return ''.join(self.chunks)
+
+
+class ChatService:
+    """
+    Step-based /chat conversation over a session store
+    """
+
+    def __init__(self, chatbot, sessions, metrics=None, profiler=None):
+        """
+        Args:
+            chatbot (HealthChatbot): Initialized chatbot (None if startup failed)
+            sessions (SessionStore): Conversation store
+            metrics (MetricsRegistry): Where timings go (default: a new registry)
+            profiler (RequestProfiler): Opt-in request profiling (None: off)
+        """
+        self.chatbot = chatbot
+        self.sessions = sessions
+        self.profiler = profiler
+
+        self.metrics = metrics if metrics is not None else MetricsRegistry()
+        self._register_metrics()
+
+        # In-process only: a draft on another worker just means the
+        # submitted message is processed from scratch
+        self._drafts = OrderedDict()
+        self._drafts_lock = threading.Lock()
+
+    def answers_text_step(self, data):
+        """
+        Whether this /chat request answers the free-text question, whose
+        reply runs the TextProcessor (a cheap session lookup, so async
+        backends can decide where to run the step; not counted in the
+        session hit / miss stats, advance_session does the real get)
+        """
+        session_id = data.get("session_id") if isinstance(data, dict) else None
+        session = self.sessions.peek(session_id) if session_id else None
+        return (session is not None and session.step < len(QUESTIONS)
+                and QUESTIONS[session.step][0] == "text")
+
+    def advance_session(self, data):
+        """
+        Validate one answer and move the conversation forward
+
+        Returns:
+            tuple: (reply payload, None) while questions remain, or
+                (None, (session_id, answers)) once every answer is collected
+        """
+        if not data:
+            raise ChatError("No data provided")
+
+        user_message = data.get("message", "").strip()
+        if not user_message:
+            raise ChatError("Message cannot be empty")
+
+        session_id = data.get("session_id")
+        session = self.sessions.get(session_id) if session_id else None
+
+        # create new session
+        if session is None:
+            session_id = str(uuid.uuid4())
+            self.sessions.save(session_id, ChatSession())
+            return {
+                "reply": QUESTIONS[0][1],
+                "session_id": session_id
+            }, None
+
+        step = session.step
+
+        if step >= len(QUESTIONS):
+            raise ChatError("Session already completed. Please start a new conversation.")
+
+        # Validate input based on question type
+        key, question_text = QUESTIONS[step]
+
+        # Validate numeric inputs
+        if key in ["sleep_hours", "bmi", "work_hours"]:
+            try:
+                value = float(user_message)
+            except ValueError:
+                raise ChatError(f"Please enter a valid number for {key.replace('_', ' ')}")
+            if key == "sleep_hours" and (value < 0 or value > 24):
+                raise ChatError("Please enter a valid number of sleep hours (0-24)")
+            elif key == "bmi" and (value < 10 or value > 50):
+                raise ChatError("Please enter a valid BMI (typically 10-50)")
+            elif key == "work_hours" and (value < 0 or value > 24):
+                raise ChatError("Please enter a valid number of work hours (0-24)")
+
+        # Validate categorical inputs
+        elif key in ["physical_activity", "social_interaction"]:
+            value = user_message.lower().strip()
+            if value not in ['low', 'medium', 'high']:
+                raise ChatError(f"Please enter 'low', 'medium', or 'high' for {key.replace('_', ' ')}")
+
+        # save answer
+        session.answers[step] = user_message
+        session.step += 1
+        self.sessions.save(session_id, session)
+
+        # ask next question
+        if session.step < len(QUESTIONS):
+            next_question = QUESTIONS[session.step][1]
+            reply = {
+                "reply": next_question,
+                "session_id": session_id
+            }
+            if key == "text":
+                reply["text_stress_level"] = self.text_stress_level(session_id, user_message)
+            return reply, None
+
+        return None, (session_id, dict(zip((key for key, _ in QUESTIONS), session.answers)))
+
+    # -----------------------------
+    # METRICS
+    # -----------------------------
+    def _register_metrics(self):
+        metrics = self.metrics
+        metrics.describe("analysis_stage_seconds", "histogram",
+                         "Time per stage of the final /chat analysis")
+        metrics.describe("model_inference_seconds", "histogram",
+                         "Stress model prediction time per model")
+        metrics.describe("text_processing_seconds", "histogram",
+                         "TextProcessor time per call (step-one message and drafts)")
+        metrics.describe("http_request_duration_seconds", "histogram",
+                         "Request handling time per route")
+        metrics.describe("http_requests_total", "counter",
+                         "Requests per route and HTTP status")
+        metrics.describe("sessions_active", "gauge", "Conversations in the session store")
+        metrics.describe("sessions_created_total", "counter", "Conversations started")
+        metrics.describe("sessions_completed_total", "counter", "Conversations finished")
+        metrics.describe("sessions_abandoned_total", "counter",
+                         "Unfinished conversations dropped (expired or evicted)")
+        metrics.describe("session_completion_ratio", "gauge",
+                         "Finished / started conversations")
+        metrics.describe("session_abandonment_ratio", "gauge",
+                         "Abandoned / started conversations")
+        metrics.describe("component_load_seconds", "gauge", "Chatbot component load time")
+        metrics.describe("lemma_cache_entries", "gauge", "Words in the shared lemma cache")
+        metrics.describe("lemma_cache_max_entries", "gauge", "Lemma cache capacity (LEMMA_CACHE_SIZE)")
+        metrics.describe("lemma_cache_hits_total", "counter", "Lemma cache hits")
+        metrics.describe("lemma_cache_misses_total", "counter", "Lemma cache misses (WordNet lookups)")
+        metrics.describe("lemma_cache_evictions_total", "counter",
+                         "Words evicted from the full lemma cache")
+        metrics.describe("guidance_cache_entries", "gauge", "Rendered guidance texts in the cache")
+        metrics.describe("guidance_cache_hits_total", "counter", "Guidance served from the cache")
+        metrics.describe("guidance_cache_misses_total", "counter", "Guidance rendered on request")
+        metrics.describe("micro_batch_size", "histogram", "Predictions per micro-batched model call")
+        metrics.describe("micro_batch_queue_depth", "gauge", "Predictions waiting for the micro-batcher")
+        metrics.describe("micro_batch_max_queue_depth", "gauge",
+                         "Most predictions ever queued for the micro-batcher")
+        metrics.describe("micro_batch_errors_total", "counter", "Micro-batches whose model call failed")
+
+        # Bound once so the request path skips the label lookup
+        self._stage_timers = {
+            stage: metrics.histogram("analysis_stage_seconds", stage=stage)
+            for stage in ANALYSIS_STAGES
+        }
+        self._text_timers = {
+            call: metrics.histogram("text_processing_seconds", call=call)
+            for call in ("message", "draft")
+        }
+        metrics.add_collector(self._collect_metrics)
+
+    def _collect_metrics(self):
+        """
+        Gauges read at scrape time (session counters are per worker)
+        """
+        stats = self.sessions.stats()
+        created = stats.get("created", 0)
+        yield "sessions_active", {}, stats.get("active")
+        yield "sessions_created_total", {}, created
+        yield "sessions_completed_total", {}, stats.get("completed", 0)
+        if created:
+            yield "session_completion_ratio", {}, stats.get("completed", 0) / created
+
+        # Redis cannot see expiry, so abandonment is left out rather than reported as 0
+        if "expired" in stats:
+            abandoned = stats["expired"] + stats.get("evicted", 0)
+            yield "sessions_abandoned_total", {}, abandoned
+            if created:
+                yield "session_abandonment_ratio", {}, abandoned / created
+
+        # Process-wide; evictions climbing with a low hit rate mean
+        # LEMMA_CACHE_SIZE is too small
+        lemmas = get_shared_cache().stats()
+        yield "lemma_cache_entries", {}, lemmas["size"]
+        yield "lemma_cache_max_entries", {}, lemmas["maxsize"]
+        yield "lemma_cache_hits_total", {}, lemmas["hits"]
+        yield "lemma_cache_misses_total", {}, lemmas["misses"]
+        yield "lemma_cache_evictions_total", {}, lemmas["evictions"]
+
+        if self.chatbot is None:
+            return
+
+        for component, seconds in self.chatbot.startup_report().items():
+            yield "component_load_seconds", {"component": component}, seconds
+
+        # Only once loaded: a scrape must not load components. Prewarming
+        # renders every reachable assessment, so guidance misses mean the
+        # cache is too small
+        generator = self.chatbot.loaded_component("guidance_generator")
+        if generator is not None:
+            guidance = generator.cache_info()
+            yield "guidance_cache_entries", {}, guidance["size"]
+            yield "guidance_cache_hits_total", {}, guidance["hits"]
+            yield "guidance_cache_misses_total", {}, guidance["misses"]
+
+        batcher = self.chatbot.loaded_component("stress_predictor")
+        if isinstance(batcher, MicroBatchPredictor):
+            batching = batcher.stats()
+            yield "micro_batch_queue_depth", {}, batching["queue_depth"]
+            yield "micro_batch_max_queue_depth", {}, batching["max_queue_depth"]
+            yield "micro_batch_errors_total", {}, batching["errors"]
+
+    def model_label(self, text=None):
+        """
+        Name of the model that scores a prediction (metrics label)
+        """
+        chatbot = self.chatbot
+        if chatbot.use_fused and text is not None:
+            return "fused"
+        if chatbot.use_deep_learning:
+            return "deep_learning"
+        if chatbot.compiled:
+            return f"{chatbot.model_type}_compiled"
+        return chatbot.model_type
+
+    def observe_request(self, route, status, seconds):
+        """
+        Record one handled request (called by the backends)
+        """
+        self.metrics.counter("http_requests_total", route=route, status=str(status)).inc()
+        self.metrics.histogram("http_request_duration_seconds", route=route).observe(seconds)
+
+    # -----------------------------
+    # PROFILING
+    # -----------------------------
+    def should_profile(self, header=None, query=None):
+        """
+        Whether to profile a request (X-Profile header / ?profile= value)
+        """
+        return self.profiler is not None and self.profiler.select(header, query)
+
+    def call_profiled(self, profile, label, function, *args):
+        """
+        Call function(*args), under the profiler if profile is set
+        """
+        if not profile or self.profiler is None:
+            return function(*args)
+        with self.profiler.profile(label):
+            return function(*args)
+
+    # -----------------------------
+    # STEP-ONE DRAFTS
+    # -----------------------------
+    def update_draft(self, data):
+        """
+        Feed the step-one message while it is being typed
+
+        Args:
+            data (dict): {"session_id": ..., "delta": new characters} or
+                {"session_id": ..., "text": whole message} to restart
+                (e.g. after the user deleted something)
+
+        Returns:
+            dict: Current text features and rule-based text stress level
+        """
+        if not data:
+            raise ChatError("No data provided")
+
+        session_id = data.get("session_id")
+        session = self.sessions.get(session_id) if session_id else None
+        if session is None:
+            raise ChatError("Unknown session. Send a first message to /chat to start one.", 404)
+        if session.step >= len(QUESTIONS) or QUESTIONS[session.step][0] != "text":
+            raise ChatError("Drafts are only accepted for the first question", 409)
+
+        with self._drafts_lock:
+            draft = self._drafts.get(session_id)
+            if draft is None or "text" in data:
+                draft = TextDraft(self.chatbot.text_processor.session())
+                self._drafts[session_id] = draft
+                while len(self._drafts) > MAX_DRAFTS:
+                    self._drafts.popitem(last=False)
+            else:
+                self._drafts.move_to_end(session_id)
+
+        delta = data.get("text", data.get("delta", ""))
+        if not isinstance(delta, str):
+            raise ChatError("delta must be a string")
+
+        with self._text_timers["draft"].time():
+            draft.feed(delta)
+            return {
+                "session_id": session_id,
+                "features": draft.session.features(),
+                "text_stress_level": draft.session.predict_stress()
+            }
+
+    def text_stress_level(self, session_id, message):
+        """
+        Rule-based text stress level of the submitted step-one message,
+        reusing the draft state when it covers exactly this message
+        """
+        with self._drafts_lock:
+            draft = self._drafts.pop(session_id, None)
+
+        with self._text_timers["message"].time():
+            if draft is not None and draft.text().strip() == message:
+                return draft.session.predict_stress()
+            return self.chatbot.text_processor.predict_stress_from_text(message)
+
+    def handle_draft(self, data):
+        """
+        Handle one /chat/draft request
+
+        Returns:
+            tuple: (response payload, HTTP status)
+        """
+        if self.chatbot is None:
+            return {
+                "error": "Chatbot not initialized. Please check backend logs."
+            }, 503
+
+        try:
+            return self.update_draft(data), 200
+        except ChatError as e:
+            return {"error": e.message}, e.status
+
+    @staticmethod
+    def parse_answers(answers):
+        """
+        Convert the collected answers into model inputs
+
+        Returns:
+            tuple: (sleep_hours, bmi, physical_activity, work_hours, social_interaction)
+        """
+        # Validate and convert inputs
+        try:
+            sleep_hours = float(answers["sleep_hours"])
+            bmi = float(answers["bmi"])
+            work_hours = float(answers["work_hours"])
+        except (ValueError, KeyError) as e:
+            raise ChatError(f"Invalid input: {str(e)}. Please provide valid numbers.")
+
+        # Validate activity and social interaction
+        physical_activity = answers["physical_activity"].lower().strip()
+        social_interaction = answers["social_interaction"].lower().strip()
+
+        if physical_activity not in ['low', 'medium', 'high']:
+            raise ChatError("Physical activity must be 'low', 'medium', or 'high'")
+
+        if social_interaction not in ['low', 'medium', 'high']:
+            raise ChatError("Social interaction must be 'low', 'medium', or 'high'")
+
+        return sleep_hours, bmi, physical_activity, work_hours, social_interaction
+
+    def predict_stress(self, sleep_hours, physical_activity, work_hours, social_interaction,
+                       text=None):
+        """
+        Run the stress predictor, turning failures into ChatError replies
+
+        With the fused model enabled, the step-one message is scored together
+        with the lifestyle answers.
+        """
+        try:
+            if not self.chatbot.use_fused:
+                stress_predictor = self.chatbot.stress_predictor
+
+                # Verify model is loaded
+                if stress_predictor.model is None:
+                    raise ChatError("Model not loaded. Please ensure models are trained and available.", 500)
+
+                # Check if predict method exists
+                if not hasattr(stress_predictor, 'predict'):
+                    raise ChatError("Predict method not found. Model may not be initialized correctly.", 500)
+
+            # Make prediction
+            with self.metrics.histogram("model_inference_seconds",
+                                        model=self.model_label(text)).time():
+                stress_level = self.chatbot.predict_stress(
+                    sleep_hours=sleep_hours,
+                    physical_activity=physical_activity,
+                    work_hours=work_hours,
+                    social_interaction=social_interaction,
+                    text=text
+                )
+
+            # Validate prediction result
+            if stress_level is None:
+                raise ChatError("Prediction returned None. Model may not be working correctly.", 500)
+
+        except ChatError:
+            raise
+        except AttributeError as e:
+            import traceback
+            traceback.print_exc()
+            raise ChatError(f"Model attribute error: {str(e)}. Please ensure models are trained.", 500)
+        except ValueError as e:
+            raise ChatError(f"Invalid input for prediction: {str(e)}")
+        except Exception as e:
+            import traceback
+            error_trace = traceback.format_exc()
+            print(f"❌ Prediction error details: {error_trace}")
+            raise ChatError(f"Prediction error: {str(e)}", 500)
+
+        return stress_level
+
+    def assess(self, stress_level, bmi, physical_activity, sleep_hours):
+        """
+        Get comprehensive assessment (precomputed table lookup)
+
+        Returns:
+            tuple: (Assessment, summary text)
+        """
+        return self.chatbot.risk_assessor.lookup_assessment(
+            stress_level=stress_level,
+            bmi=bmi,
+            physical_activity=physical_activity,
+            sleep_hours=sleep_hours
+        )
+
+    @staticmethod
+    def build_health_data(stress_level, sleep_hours, bmi, physical_activity, summary,
+                          assessment=None):
+        """
+        Structured health data for Supabase (frontend saves when user is logged in)
+
+        With the Assessment, the per-disease levels and BMI category are
+        included as well (the frontend stores the fields it knows)
+        """
+        health_data = {
+            "stress_level": stress_level,
+            "sleep_hours": int(sleep_hours),
+            "bmi": round(bmi, 2),
+            "activity_level": physical_activity,
+            "health_risks": summary,
+        }
+        if assessment is not None:
+            health_data["risk_levels"] = assessment.risk_levels()
+            health_data["bmi_category"] = assessment.bmi_category
+        return health_data
+
+    def complete_session(self, session_id, answers):
+        """
+        Run the analysis once every answer is collected (CPU-bound part)
+
+        Args:
+            session_id (str): Finished session, removed from the store
+            answers (dict): Answers keyed by question
+
+        Returns:
+            dict: Final /chat payload
+        """
+        timers = self._stage_timers
+        start = time.perf_counter()
+
+        sleep_hours, bmi, physical_activity, work_hours, social_interaction = \
+            self.parse_answers(answers)
+
+        # Predict stress level
+        with timers["predict_stress"].time():
+            stress_level = self.predict_stress(
+                sleep_hours, physical_activity, work_hours, social_interaction, answers.get("text")
+            )
+
+        with timers["assess"].time():
+            assessment, summary = self.assess(stress_level, bmi, physical_activity, sleep_hours)
+
+        # Generate guidance
+        with timers["guidance"].time():
+            guidance = self.chatbot.guidance_generator.generate_comprehensive_guidance(assessment)
+
+        # Format final response
+        final_reply = (
+            f"🧠 **Stress Level:** {stress_level.upper()}\n\n"
+            f"{summary}\n\n"
+            f"{guidance}\n\n"
+            f"{DISCLAIMER}"
+        )
+
+        health_data = self.build_health_data(
+            stress_level, sleep_hours, bmi, physical_activity, summary, assessment
+        )
+
+        # cleanup session
+        self.sessions.delete(session_id)
+        timers["total"].observe(time.perf_counter() - start)
+
+        return {
+            "reply": final_reply,
+            "session_id": None,
+            "health_data": health_data,
+        }
+
+    def handle_chat(self, data, profile=False):
+        """
+        Handle one /chat request
+
+        Args:
+            data (dict): Request JSON ({"message": ..., "session_id": ...})
+            profile (bool): Profile the step and, on the last answer, the
+                analysis (see should_profile)
+
+        Returns:
+            tuple: (response payload, HTTP status)
+        """
+        if self.chatbot is None:
+            return {
+                "error": "Chatbot not initialized. Please check backend logs."
+            }, 503
+
+        try:
+            reply, collected = self.call_profiled(profile, "chat_step", self.advance_session, data)
+            if reply is not None:
+                return reply, 200
+
+            return self.call_profiled(
+                profile, "chat_analysis", self.complete_session, *collected
+            ), 200
+
+        except ChatError as e:
+            return {"error": e.message}, e.status
+        except Exception as e:
+            import traceback
+            error_trace = traceback.format_exc()
+            print(f"❌ Error in chat endpoint: {error_trace}")
+            return {
+                "error": f"An error occurred: {str(e)}"
+            }, 500
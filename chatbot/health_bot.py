@@ -5,6 +5,8 @@ Combines NLP, ML, and rule-based systems for health analysis
 
 import sys
 import os
+import threading
+import time
 
 # Add project root to path for imports
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
@@ -12,7 +14,6 @@ if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
 from nlp.text_processor import TextProcessor
-from nlp.ml_predictor import StressPredictor
 from rules.disease_risk import DiseaseRiskAssessor
 from rules.health_guidance import HealthGuidanceGenerator
 
@@ -21,21 +22,186 @@ class HealthChatbot:
     """
     Web-compatible AI Health Chatbot
     Uses step-based conversation instead of input()/print()
+
+    Components (text processor, risk assessor, guidance generator, stress
+    predictor) are built on first use; prewarm() loads them up front,
+    optionally from a background thread.
     """
 
-    def __init__(self, model_type="logistic", use_deep_learning=False):
-        self.text_processor = TextProcessor()
-        self.risk_assessor = DiseaseRiskAssessor()
-        self.guidance_generator = HealthGuidanceGenerator()
+    COMPONENTS = ('stress_predictor', 'risk_assessor', 'guidance_generator', 'text_processor')
 
+    def __init__(self, model_type="logistic", use_deep_learning=False, compiled=False,
+                 use_spacy=False, wrap_predictor=None, use_fused=False):
+        """
+        Args:
+            model_type (str): 'logistic', 'decision_tree' or 'random_forest'
+            use_deep_learning (bool): Use the TensorFlow model instead
+            compiled (bool): NumPy-only predictor loaded from the
+                memory-mapped model bundle
+            use_spacy (bool): Let the text processor load SpaCy (unused by
+                the stress features)
+            wrap_predictor (callable): Applied to the stress predictor once
+                loaded (e.g. MicroBatchPredictor)
+            use_fused (bool): Score the final step with the fused text +
+                lifestyle model from models/fused
+        """
+        self.model_type = model_type
         self.use_deep_learning = use_deep_learning
-        if use_deep_learning:
+        self.compiled = compiled
+        self.use_spacy = use_spacy
+        self.wrap_predictor = wrap_predictor
+        self.use_fused = use_fused
+
+        self._components = {}
+        self._load_times = {}
+        self._load_lock = threading.RLock()
+        self._prewarm_thread = None
+
+    # -----------------------------
+    # LAZY COMPONENTS
+    # -----------------------------
+    def _component(self, name, factory):
+        component = self._components.get(name)
+        if component is None:
+            with self._load_lock:
+                component = self._components.get(name)
+                if component is None:
+                    start = time.perf_counter()
+                    component = factory()
+                    self._load_times[name] = time.perf_counter() - start
+                    self._components[name] = component
+        return component
+
+    def loaded_component(self, name):
+        """
+        Get a component without loading it
+
+        Returns:
+            object: The component, or None if it has not been loaded yet
+        """
+        return self._components.get(name)
+
+    @property
+    def text_processor(self):
+        return self._component('text_processor', lambda: TextProcessor(use_spacy=self.use_spacy))
+
+    @property
+    def risk_assessor(self):
+        return self._component('risk_assessor', DiseaseRiskAssessor)
+
+    @property
+    def guidance_generator(self):
+        return self._component('guidance_generator', self._build_guidance_generator)
+
+    @property
+    def stress_predictor(self):
+        return self._component('stress_predictor', self._build_stress_predictor)
+
+    @stress_predictor.setter
+    def stress_predictor(self, predictor):
+        with self._load_lock:
+            self._components['stress_predictor'] = predictor
+
+    @property
+    def fused_predictor(self):
+        return self._component('fused_predictor', self._build_fused_predictor)
+
+    def _build_guidance_generator(self):
+        generator = HealthGuidanceGenerator()
+        generator.prewarm(self.risk_assessor.reachable_assessments())
+        return generator
+
+    def _build_fused_predictor(self):
+        from nlp.fused_predictor import FusedStressPredictor
+        predictor = FusedStressPredictor(text_processor=self.text_processor)
+        predictor.load_model("models/fused")
+        return predictor
+
+    def _build_stress_predictor(self):
+        model_type = self.model_type
+        if self.use_deep_learning:
             from nlp.deep_predictor import DeepStressPredictor
-            self.stress_predictor = DeepStressPredictor()
-            self.stress_predictor.load_model("models/deep_learning")
+            predictor = DeepStressPredictor()
+            predictor.load_model("models/deep_learning")
+        elif self.compiled:
+            predictor = self._load_compiled_predictor(f"models/{model_type}")
         else:
-            self.stress_predictor = StressPredictor(model_type=model_type)
-            self.stress_predictor.load_model(f"models/{model_type}")
+            from nlp.ml_predictor import StressPredictor
+            predictor = StressPredictor(model_type=model_type)
+            predictor.load_model(f"models/{model_type}")
+
+        if self.wrap_predictor is not None:
+            predictor = self.wrap_predictor(predictor)
+        return predictor
+
+    def _load_compiled_predictor(self, model_dir):
+        """
+        NumPy-only predictor memory-mapped from the model bundle; pandas /
+        sklearn are only imported when the bundle is missing and the joblib
+        artifacts have to be compiled at startup
+        """
+        from nlp.model_bundle import load_bundle_model
+        try:
+            return load_bundle_model(model_dir)
+        except FileNotFoundError:
+            pass
+
+        if self.model_type == "logistic":
+            from nlp.compiled_predictor import load_compiled_model
+            try:
+                return load_compiled_model(model_dir)
+            except FileNotFoundError:
+                pass
+
+        print(f"⚠️  No model bundle in {model_dir}, compiling the joblib artifacts "
+              f"(run python -m nlp.model_bundle {self.model_type} to build it once)")
+        from nlp.ml_predictor import StressPredictor
+        predictor = StressPredictor(model_type=self.model_type)
+        predictor.load_model(model_dir)
+        return predictor.compile()
+
+    def prewarm(self, components=None, background=False):
+        """
+        Load components now instead of on first use
+
+        Args:
+            components (iterable): Component names (default: all)
+            background (bool): Load in a daemon thread and return immediately
+
+        Returns:
+            threading.Thread: The loader thread if background, else None
+        """
+        if components is None:
+            components = self.COMPONENTS + (('fused_predictor',) if self.use_fused else ())
+        names = tuple(components)
+
+        def load():
+            for name in names:
+                component = getattr(self, name)
+                if name == 'text_processor' and 'nlp_data' not in self._load_times:
+                    # NLTK data / SpaCy load separately from the processor itself
+                    start = time.perf_counter()
+                    component.warm_up()
+                    with self._load_lock:
+                        self._load_times['nlp_data'] = time.perf_counter() - start
+
+        if not background:
+            load()
+            return None
+
+        self._prewarm_thread = threading.Thread(target=load, name='chatbot-prewarm', daemon=True)
+        self._prewarm_thread.start()
+        return self._prewarm_thread
+
+    def startup_report(self):
+        """
+        Get load time per component, in load order
+
+        Returns:
+            dict: Component name -> seconds (only components loaded so far)
+        """
+        with self._load_lock:
+            return dict(self._load_times)
 
     # -----------------------------
     # SESSION HANDLING
@@ -46,6 +212,33 @@ class HealthChatbot:
             "data": {}
         }
 
+    # -----------------------------
+    # SCORING
+    # -----------------------------
+    def predict_stress(self, sleep_hours, physical_activity, work_hours, social_interaction,
+                       text=None):
+        """
+        Predict stress level; with use_fused the message is scored together
+        with the lifestyle answers in one model call
+        """
+        if self.use_fused and text is not None:
+            return self.fused_predictor.predict(
+                text, sleep_hours, physical_activity, work_hours, social_interaction
+            )
+        return self.stress_predictor.predict(
+            sleep_hours=sleep_hours,
+            physical_activity=physical_activity,
+            work_hours=work_hours,
+            social_interaction=social_interaction
+        )
+
+    def predict_stress_batch(self, profiles):
+        """
+        Score many stored lifestyle profiles in one vectorized pass
+        (columnar dict or NumPy structured array, see nlp/features.py)
+        """
+        return self.stress_predictor.predict_batch(profiles)
+
     # -----------------------------
     # MAIN CONVERSATION ENGINE
     # -----------------------------
@@ -122,14 +315,15 @@ class HealthChatbot:
             data["social_interaction"] = social
 
             # ---- ANALYSIS PHASE ----
-            stress_level = self.stress_predictor.predict(
+            stress_level = self.predict_stress(
                 sleep_hours=data["sleep_hours"],
                 physical_activity=data["physical_activity"],
                 work_hours=data["work_hours"],
-                social_interaction=data["social_interaction"]
+                social_interaction=data["social_interaction"],
+                text=data.get("text_input")
             )
 
-            assessment = self.risk_assessor.get_comprehensive_assessment(
+            assessment, summary = self.risk_assessor.lookup_assessment(
                 stress_level=stress_level,
                 bmi=data["bmi"],
                 physical_activity=data["physical_activity"],
@@ -137,7 +331,6 @@ class HealthChatbot:
             )
 
             guidance = self.guidance_generator.generate_comprehensive_guidance(assessment)
-            summary = self.risk_assessor.get_risk_summary(assessment)
 
             final_reply = (
                 f"🧠 **Stress Level:** {stress_level.upper()}\n\n"
@@ -0,0 +1,222 @@
+"""
+Metrics Module
+In-process latency histograms and counters for the chat backends, rendered
+in the Prometheus text exposition format (GET /metrics). Each worker keeps
+its own numbers; Prometheus adds them up across workers.
+"""
+
+import math
+import threading
+import time
+from bisect import bisect_left
+
+
+# Upper bounds in seconds, 50 us .. 10 s
+DEFAULT_BUCKETS = (
+    0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01,
+    0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0
+)
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class Histogram:
+    """
+    Fixed-bucket latency histogram (one lock round-trip per observation)
+    """
+
+    __slots__ = ('buckets', 'counts', 'sum', 'count', '_lock')
+
+    def __init__(self, buckets=DEFAULT_BUCKETS):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * (len(self.buckets) + 1)  # last slot: +Inf
+        self.sum = 0.0
+        self.count = 0
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        """
+        Record one value (seconds)
+        """
+        i = bisect_left(self.buckets, value)
+        with self._lock:
+            self.counts[i] += 1
+            self.sum += value
+            self.count += 1
+
+    def time(self):
+        """
+        Context manager that observes the time spent in its block
+        """
+        return _Timer(self)
+
+    def snapshot(self):
+        """
+        Returns:
+            tuple: (cumulative count per bucket incl. +Inf, sum, count)
+        """
+        with self._lock:
+            counts, total, count = list(self.counts), self.sum, self.count
+        cumulative = []
+        running = 0
+        for n in counts:
+            running += n
+            cumulative.append(running)
+        return cumulative, total, count
+
+
+class _Timer:
+    __slots__ = ('histogram', 'start')
+
+    def __init__(self, histogram):
+        self.histogram = histogram
+
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        self.histogram.observe(time.perf_counter() - self.start)
+        return False
+
+
+class Counter:
+    """
+    Monotonic counter
+    """
+
+    __slots__ = ('value', '_lock')
+
+    def __init__(self):
+        self.value = 0
+        self._lock = threading.Lock()
+
+    def inc(self, n=1):
+        with self._lock:
+            self.value += n
+
+
+class MetricsRegistry:
+    """
+    Named, labelled histograms and counters plus gauges computed at scrape
+    time by collector callbacks
+    """
+
+    def __init__(self, prefix='s2h_'):
+        """
+        Args:
+            prefix (str): Prepended to every metric name
+        """
+        self.prefix = prefix
+        self._metrics = {}      # (name, labels) -> Histogram / Counter
+        self._families = {}     # name -> (type, help), in registration order
+        self._collectors = []
+        self._lock = threading.Lock()
+
+    def describe(self, name, kind, help_text):
+        """
+        Register a metric family ('histogram', 'counter' or 'gauge')
+        """
+        self._families.setdefault(name, (kind, help_text))
+
+    def _get(self, name, factory, labels):
+        key = (name, tuple(sorted(labels.items())))
+        metric = self._metrics.get(key)
+        if metric is None:
+            with self._lock:
+                metric = self._metrics.get(key)
+                if metric is None:
+                    metric = factory()
+                    self._metrics[key] = metric
+        return metric
+
+    def histogram(self, name, buckets=DEFAULT_BUCKETS, **labels):
+        """
+        Get (or create) the histogram for a label set; hold on to it on hot
+        paths to skip the lookup
+        """
+        return self._get(name, lambda: Histogram(buckets), labels)
+
+    def counter(self, name, **labels):
+        """
+        Get (or create) the counter for a label set
+        """
+        return self._get(name, Counter, labels)
+
+    def add_collector(self, collector):
+        """
+        Register a callable run at scrape time
+
+        Args:
+            collector (callable): Returns an iterable of
+                (name, labels dict, value) gauge samples
+        """
+        self._collectors.append(collector)
+
+    # ===================== EXPOSITION =====================
+
+    def render(self):
+        """
+        Render every metric in the Prometheus text format
+
+        Returns:
+            str: Exposition text (serve with CONTENT_TYPE)
+        """
+        samples = {}
+        with self._lock:
+            items = list(self._metrics.items())
+        for (name, labels), metric in items:
+            samples.setdefault(name, []).append((dict(labels), metric))
+
+        for collector in self._collectors:
+            try:
+                for name, labels, value in collector():
+                    if value is not None:
+                        samples.setdefault(name, []).append((labels, value))
+            except Exception as e:
+                print(f"⚠️ Metrics collector failed: {e}")
+
+        lines = []
+        for name in list(self._families) + [n for n in samples if n not in self._families]:
+            if name not in samples:
+                continue
+            kind, help_text = self._families.get(name, ('untyped', ''))
+            full_name = self.prefix + name
+            lines.append(f"# HELP {full_name} {help_text}")
+            lines.append(f"# TYPE {full_name} {kind}")
+
+            for labels, metric in samples[name]:
+                if isinstance(metric, Histogram):
+                    cumulative, total, count = metric.snapshot()
+                    bounds = [_format_value(b) for b in metric.buckets] + ['+Inf']
+                    for bound, n in zip(bounds, cumulative):
+                        lines.append(
+                            f"{full_name}_bucket{_format_labels(labels, le=bound)} {n}"
+                        )
+                    lines.append(f"{full_name}_sum{_format_labels(labels)} {_format_value(total)}")
+                    lines.append(f"{full_name}_count{_format_labels(labels)} {count}")
+                elif isinstance(metric, Counter):
+                    lines.append(f"{full_name}{_format_labels(labels)} {metric.value}")
+                else:
+                    lines.append(f"{full_name}{_format_labels(labels)} {_format_value(metric)}")
+
+        return '\n'.join(lines) + '\n'
+
+
+def _format_value(value):
+    if isinstance(value, float):
+        if math.isinf(value):
+            return '+Inf' if value > 0 else '-Inf'
+        return repr(value)
+    return str(value)
+
+
+def _format_labels(labels, **extra):
+    labels = dict(labels, **extra)
+    if not labels:
+        return ''
+    parts = []
+    for key, value in labels.items():
+        value = str(value).replace('\\', '\\\\').replace('\n', '\\n').replace('"', '\\"')
+        parts.append(f'{key}="{value}"')
+    return '{' + ','.join(parts) + '}'
@@ -0,0 +1,137 @@
+"""
+Profiling Module
+Opt-in cProfile runs of live /chat requests. A request is profiled when it
+carries the admin token (X-Profile header or ?profile= query flag) or falls
+in the sampled fraction; each run is dumped as a pstats file into a local
+directory that keeps only the newest files.
+
+Read a dump with `python -m pstats profiles/<file>.prof` (or snakeviz).
+"""
+
+import cProfile
+import hmac
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+
+
+DEFAULT_PROFILE_DIR = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'profiles'
+)
+
+
+class RequestProfiler:
+    """
+    Decides which requests to profile and stores the dumps
+    """
+
+    def __init__(self, directory=DEFAULT_PROFILE_DIR, sample_rate=0.0, token=None,
+                 max_files=100):
+        """
+        Args:
+            directory (str): Where .prof files are written
+            sample_rate (float): Fraction of requests profiled without asking
+            token (str): Admin token that opts a request in (None: only sampling)
+            max_files (int): Dumps kept; older ones are deleted
+        """
+        self.directory = directory
+        self.sample_rate = sample_rate
+        self.token = token
+        self.max_files = max_files
+
+        # One run at a time bounds the overhead; overlapping requests
+        # simply go unprofiled
+        self._lock = threading.Lock()
+
+    def select(self, header=None, query=None):
+        """
+        Should this request be profiled?
+
+        Args:
+            header (str): X-Profile header value
+            query (str): ?profile= query value
+
+        Returns:
+            bool: True for a valid admin token or a sampled request
+        """
+        if self.token:
+            for value in (header, query):
+                if value and hmac.compare_digest(value.encode(), self.token.encode()):
+                    return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    @contextmanager
+    def profile(self, label):
+        """
+        Profile the calling thread for the duration of the block and dump
+        the result (skipped if another run is in progress)
+
+        Args:
+            label (str): Part of the file name (e.g. chat_analysis)
+        """
+        if not self._lock.acquire(blocking=False):
+            yield None
+            return
+
+        try:
+            profiler = cProfile.Profile()
+            profiler.enable()
+            try:
+                yield profiler
+            finally:
+                profiler.disable()
+                self._save(profiler, label)
+        finally:
+            self._lock.release()
+
+    def _save(self, profiler, label):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            now = time.time()
+            name = (f"{time.strftime('%Y%m%d-%H%M%S', time.localtime(now))}"
+                    f"-{int(now * 1000) % 1000:03d}-{os.getpid()}-{label}.prof")
+            path = os.path.join(self.directory, name)
+            profiler.dump_stats(path)
+            self._rotate()
+            print(f"🔬 Profile saved: {path}")
+        except OSError as e:
+            print(f"⚠️ Could not save profile: {e}")
+
+    def _rotate(self):
+        """
+        Delete the oldest dumps beyond max_files
+        """
+        dumps = sorted(
+            (entry for entry in os.scandir(self.directory) if entry.name.endswith('.prof')),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in dumps[:max(len(dumps) - self.max_files, 0)]:
+            try:
+                os.remove(entry.path)
+            except FileNotFoundError:  # another worker got there first
+                pass
+
+
+def create_profiler():
+    """
+    Build the request profiler from environment settings (see Readme)
+
+    Returns:
+        RequestProfiler: Profiler, or None when neither PROFILE_TOKEN nor
+            PROFILE_SAMPLE_RATE is set
+    """
+    token = os.environ.get("PROFILE_TOKEN") or None
+    sample_rate = float(os.environ.get("PROFILE_SAMPLE_RATE", "0"))
+    if token is None and sample_rate <= 0:
+        return None
+
+    profiler = RequestProfiler(
+        directory=os.environ.get("PROFILE_DIR", DEFAULT_PROFILE_DIR),
+        sample_rate=sample_rate,
+        token=token,
+        max_files=int(os.environ.get("PROFILE_MAX_FILES", "100"))
+    )
+    print(f"🔬 Request profiling enabled ({profiler.directory}, sample rate {sample_rate:g})")
+    return profiler
@@ -0,0 +1,409 @@
+"""
+Chat Session Store Module
+This module provides pluggable storage backends for the /chat conversation
+state, so sessions survive across gunicorn workers and abandoned sessions
+expire instead of piling up in memory.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlparse
+
+
+DEFAULT_TTL_SECONDS = 30 * 60
+
+# One answer slot per /chat question
+N_ANSWERS = 6
+
+
+class ChatSession:
+    """
+    Compact per-session state: current step plus a fixed array of answers
+    """
+
+    __slots__ = ('step', 'answers', 'expires_at')
+
+    def __init__(self, step=0, answers=None):
+        self.step = step
+        self.answers = answers if answers is not None else [None] * N_ANSWERS
+        self.expires_at = 0.0
+
+    def to_json(self):
+        return json.dumps([self.step, self.answers], separators=(',', ':'))
+
+    @classmethod
+    def from_json(cls, data):
+        step, answers = json.loads(data)
+        return cls(step, answers)
+
+
+class SessionStore:
+    """
+    Base interface for chat session backends
+
+    Sessions are ChatSession objects. Callers must save() a session after
+    changing it.
+    """
+
+    def __init__(self):
+        self._counters = {
+            'created': 0,
+            'completed': 0,
+            'expired': 0,
+            'evicted': 0,
+            'hits': 0,
+            'misses': 0
+        }
+        self._counter_lock = threading.Lock()
+
+    def _count(self, name, n=1):
+        with self._counter_lock:
+            self._counters[name] += n
+
+    def get(self, session_id):
+        """
+        Get a session
+
+        Args:
+            session_id (str): Session identifier
+
+        Returns:
+            ChatSession: Session state, or None if unknown or expired
+        """
+        raise NotImplementedError
+
+    def peek(self, session_id):
+        """
+        Get a session without counting a hit or miss (for routing checks
+        made before the request's real get())
+
+        Args:
+            session_id (str): Session identifier
+
+        Returns:
+            ChatSession: Session state, or None if unknown or expired
+        """
+        raise NotImplementedError
+
+    def save(self, session_id, session):
+        """
+        Create or update a session and refresh its TTL
+
+        Args:
+            session_id (str): Session identifier
+            session (ChatSession): Session state
+        """
+        raise NotImplementedError
+
+    def delete(self, session_id):
+        """
+        Remove a finished session (no error if it does not exist)
+
+        Args:
+            session_id (str): Session identifier
+        """
+        raise NotImplementedError
+
+    def __contains__(self, session_id):
+        return self.get(session_id) is not None
+
+    def stats(self):
+        """
+        Get session counters for this worker
+
+        Returns:
+            dict: Active sessions plus created / completed / expired /
+                evicted / hit / miss counters (backends that cannot see
+                expiry leave out expired and evicted)
+        """
+        with self._counter_lock:
+            counters = dict(self._counters)
+        try:
+            counters['active'] = len(self)
+        except TypeError:  # backend cannot count cheaply
+            counters['active'] = None
+        return counters
+
+
+class MemorySessionStore(SessionStore):
+    """
+    In-process store with idle TTL and oldest-first eviction (single worker only)
+
+    Sessions are kept in last-save order, which is also expiry order (like
+    the other stores, only save() renews the TTL), so expired ones always
+    sit at the front; every save() sweeps them off in amortized O(1).
+    """
+
+    def __init__(self, ttl_seconds=DEFAULT_TTL_SECONDS, max_sessions=10000):
+        """
+        Initialize in-memory session store
+
+        Args:
+            ttl_seconds (float): Idle time after which a session expires
+            max_sessions (int): Memory cap; least recently saved sessions are
+                evicted beyond this
+        """
+        super().__init__()
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._sessions = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, session_id):
+        with self._lock:
+            session = self._sessions.get(session_id)
+            if session is None:
+                self._count('misses')
+                return None
+
+            if session.expires_at <= time.monotonic():
+                del self._sessions[session_id]
+                self._count('expired')
+                self._count('misses')
+                return None
+
+            # No reordering here: get() doesn't renew expires_at, and _sweep
+            # relies on the order matching expiry
+            self._count('hits')
+            return session
+
+    def peek(self, session_id):
+        with self._lock:
+            session = self._sessions.get(session_id)
+        if session is None or session.expires_at <= time.monotonic():
+            return None
+        return session
+
+    def save(self, session_id, session):
+        now = time.monotonic()
+
+        with self._lock:
+            if session_id not in self._sessions:
+                self._count('created')
+            session.expires_at = now + self.ttl_seconds
+            self._sessions[session_id] = session
+            self._sessions.move_to_end(session_id)
+
+            self._sweep(now)
+
+            while len(self._sessions) > self.max_sessions:
+                self._sessions.popitem(last=False)
+                self._count('evicted')
+
+    def _sweep(self, now):
+        # Oldest access first, so stop at the first live session
+        while self._sessions:
+            session = next(iter(self._sessions.values()))
+            if session.expires_at > now:
+                break
+            self._sessions.popitem(last=False)
+            self._count('expired')
+
+    def delete(self, session_id):
+        with self._lock:
+            if self._sessions.pop(session_id, None) is not None:
+                self._count('completed')
+
+    def __len__(self):
+        return len(self._sessions)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    SQLite-backed store shared by all workers on one host
+
+    The entry cap is checked whenever a session is created: expired rows go
+    first, then the sessions closest to expiry (the least recently saved).
+    """
+
+    PURGE_EVERY = 256
+
+    def __init__(self, path, ttl_seconds=DEFAULT_TTL_SECONDS, max_sessions=10000):
+        """
+        Initialize SQLite session store
+
+        Args:
+            path (str): Database file (created if missing)
+            ttl_seconds (float): Idle time after which a session expires
+            max_sessions (int): Size cap shared by all workers; least recently
+                saved sessions are evicted beyond this
+        """
+        super().__init__()
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_sessions = max_sessions
+        self._local = threading.local()
+        self._writes = 0
+        self._lock = threading.Lock()
+
+        conn = self._connect()
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS sessions ("
+            "  session_id TEXT PRIMARY KEY,"
+            "  data TEXT NOT NULL,"
+            "  expires_at REAL NOT NULL"
+            ")"
+        )
+        conn.execute("CREATE INDEX IF NOT EXISTS sessions_expires_at ON sessions (expires_at)")
+
+    def _connect(self):
+        # One connection per thread and per process (connections must not cross a fork)
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, session_id):
+        session = self.peek(session_id)
+        self._count('misses' if session is None else 'hits')
+        return session
+
+    def peek(self, session_id):
+        row = self._connect().execute(
+            "SELECT data FROM sessions WHERE session_id = ? AND expires_at > ?",
+            (session_id, time.time())
+        ).fetchone()
+        return ChatSession.from_json(row[0]) if row is not None else None
+
+    def save(self, session_id, session):
+        conn = self._connect()
+        conn.execute(
+            "INSERT OR REPLACE INTO sessions (session_id, data, expires_at) VALUES (?, ?, ?)",
+            (session_id, session.to_json(), time.time() + self.ttl_seconds)
+        )
+        if session.step == 0:
+            self._count('created')
+            self._enforce_cap(conn)
+
+        # Amortized cleanup of abandoned sessions
+        with self._lock:
+            self._writes += 1
+            purge = self._writes % self.PURGE_EVERY == 0
+        if purge:
+            purged = conn.execute(
+                "DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+            self._count('expired', purged)
+
+    def _enforce_cap(self, conn):
+        # IMMEDIATE: workers creating sessions at once don't both evict
+        conn.execute("BEGIN IMMEDIATE")
+        with conn:
+            excess = conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0] - self.max_sessions
+            if excess <= 0:
+                return
+
+            expired = conn.execute(
+                "DELETE FROM sessions WHERE expires_at <= ?", (time.time(),)
+            ).rowcount
+            self._count('expired', expired)
+            excess -= expired
+            if excess > 0:
+                evicted = conn.execute(
+                    "DELETE FROM sessions WHERE session_id IN "
+                    "(SELECT session_id FROM sessions ORDER BY expires_at LIMIT ?)",
+                    (excess,)
+                ).rowcount
+                self._count('evicted', evicted)
+
+    def delete(self, session_id):
+        deleted = self._connect().execute(
+            "DELETE FROM sessions WHERE session_id = ?", (session_id,)
+        ).rowcount
+        self._count('completed', deleted)
+
+    def __len__(self):
+        return self._connect().execute(
+            "SELECT COUNT(*) FROM sessions WHERE expires_at > ?", (time.time(),)
+        ).fetchone()[0]
+
+
+class RedisSessionStore(SessionStore):
+    """
+    Redis-backed store shared by workers on any number of hosts
+
+    The client only needs redis-py's get / set(ex=...) / delete, so a local
+    stand-in (e.g. fakeredis) can replace a real server in tests.
+
+    Expiry happens inside the Redis server and an expired key reads like one
+    that never existed, so stats() has no 'expired' or 'evicted' counter
+    (abandoned sessions show up only as misses).
+    """
+
+    def __init__(self, client, ttl_seconds=DEFAULT_TTL_SECONDS, prefix='s2h:session:'):
+        """
+        Initialize Redis session store
+
+        Args:
+            client: redis.Redis-compatible client
+            ttl_seconds (int): Idle time after which a session expires
+            prefix (str): Key prefix for session entries
+        """
+        super().__init__()
+        self.client = client
+        self.ttl_seconds = int(ttl_seconds)
+        self.prefix = prefix
+
+    @classmethod
+    def from_url(cls, url, **kwargs):
+        """
+        Connect with redis-py (optional dependency)
+        """
+        import redis
+        return cls(redis.Redis.from_url(url), **kwargs)
+
+    def get(self, session_id):
+        session = self.peek(session_id)
+        self._count('misses' if session is None else 'hits')
+        return session
+
+    def peek(self, session_id):
+        data = self.client.get(self.prefix + session_id)
+        return ChatSession.from_json(data) if data is not None else None
+
+    def save(self, session_id, session):
+        if session.step == 0:
+            self._count('created')
+        self.client.set(self.prefix + session_id, session.to_json(), ex=self.ttl_seconds)
+
+    def delete(self, session_id):
+        self._count('completed', self.client.delete(self.prefix + session_id))
+
+    def stats(self):
+        counters = super().stats()
+        # Not observable from the client (see the class docstring)
+        del counters['expired'], counters['evicted']
+        return counters
+
+
+def create_session_store(url, ttl_seconds=DEFAULT_TTL_SECONDS, max_sessions=10000):
+    """
+    Build a session store from a URL
+
+    Args:
+        url (str): 'memory://', 'sqlite:///path/to/sessions.db' or 'redis://host:6379/0'
+        ttl_seconds (float): Idle time after which a session expires
+        max_sessions (int): Entry cap (memory and SQLite stores)
+
+    Returns:
+        SessionStore: Configured store
+    """
+    scheme = urlparse(url).scheme
+
+    if scheme == 'memory':
+        return MemorySessionStore(ttl_seconds=ttl_seconds, max_sessions=max_sessions)
+    if scheme == 'sqlite':
+        return SQLiteSessionStore(url[len('sqlite:///'):], ttl_seconds=ttl_seconds,
+                                  max_sessions=max_sessions)
+    if scheme in ('redis', 'rediss', 'unix'):
+        return RedisSessionStore.from_url(url, ttl_seconds=ttl_seconds)
+
+    raise ValueError(f"Unknown session store URL: {url}")
@@ -0,0 +1,173 @@
+"""
+Backend Load Comparison
+Drives full /chat conversations against one or more running backends and
+reports throughput and latency side by side, e.g. the Flask app under
+gunicorn versus the ASGI app under uvicorn.
+
+Start both backends (from backend/), then run from the project root:
+    gunicorn app:app --bind 127.0.0.1:5001 --workers 1 --threads 8
+    uvicorn asgi_app:app --host 127.0.0.1 --port 5002 --workers 1
+    python loadtest/compare_backends.py \
+        flask=http://127.0.0.1:5001 asgi=http://127.0.0.1:5002 \
+        --users 500 --concurrency 200 --think-ms 200
+
+Every simulated user walks the seven-message conversation, pausing
+--think-ms between answers, so at any time most sessions are idle and
+waiting on the user, which is the case the ASGI worker is meant for.
+Standard library only (asyncio streams), so the client is never the bottleneck
+being measured.
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.parse import urlparse
+
+
+ACTIVITY_LEVELS = ['low', 'medium', 'high']
+
+
+def conversation_messages(rng):
+    """
+    One random but valid set of answers, in question order
+    """
+    return [
+        "hi",
+        rng.choice([
+            "I feel stressed about deadlines",
+            "Pretty calm this week",
+            "Anxious and tired, not sleeping well"
+        ]),
+        f"{rng.uniform(4, 10):.1f}",
+        f"{rng.uniform(16, 38):.1f}",
+        rng.choice(ACTIVITY_LEVELS),
+        f"{rng.uniform(4, 12):.1f}",
+        rng.choice(ACTIVITY_LEVELS),
+    ]
+
+
+async def post_json(host, port, path, payload, timeout):
+    """
+    Minimal HTTP/1.1 POST (one connection per request)
+
+    Returns:
+        tuple: (status code, decoded JSON body)
+    """
+    body = json.dumps(payload).encode("utf-8")
+    reader, writer = await asyncio.wait_for(asyncio.open_connection(host, port), timeout)
+    try:
+        writer.write(
+            f"POST {path} HTTP/1.1\r\n"
+            f"Host: {host}:{port}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            "Connection: close\r\n\r\n".encode("ascii") + body
+        )
+        await writer.drain()
+        raw = await asyncio.wait_for(reader.read(), timeout)
+    finally:
+        writer.close()
+
+    head, _, payload = raw.partition(b"\r\n\r\n")
+    status = int(head.split(b" ", 2)[1])
+    return status, json.loads(payload) if payload else None
+
+
+async def run_user(target, rng, think, timeout, latencies, errors):
+    host, port, path = target
+    session_id = None
+
+    for i, message in enumerate(conversation_messages(rng)):
+        if i:
+            await asyncio.sleep(rng.uniform(0.5, 1.5) * think)
+
+        start = time.perf_counter()
+        try:
+            status, reply = await post_json(
+                host, port, path, {"message": message, "session_id": session_id}, timeout
+            )
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+            errors.append("connection")
+            return
+        latencies.append(time.perf_counter() - start)
+
+        if status != 200:
+            errors.append(status)
+            return
+        session_id = reply.get("session_id")
+
+
+def percentile(sorted_values, q):
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))
+    return sorted_values[index]
+
+
+async def run_backend(url, users, concurrency, think, timeout, seed):
+    """
+    Run `users` conversations with at most `concurrency` in flight
+
+    Returns:
+        dict: Throughput, latency percentiles and error count
+    """
+    parsed = urlparse(url)
+    target = (parsed.hostname, parsed.port or 80, parsed.path.rstrip("/") + "/chat")
+
+    latencies, errors = [], []
+    limit = asyncio.Semaphore(concurrency)
+
+    async def limited(user_index):
+        async with limit:
+            await run_user(target, random.Random(seed + user_index), think, timeout,
+                           latencies, errors)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(limited(i) for i in range(users)))
+    elapsed = time.perf_counter() - start
+
+    latencies.sort()
+    return {
+        'requests': len(latencies),
+        'errors': len(errors),
+        'elapsed_s': elapsed,
+        'requests_per_s': len(latencies) / elapsed if elapsed else 0.0,
+        'p50_ms': percentile(latencies, 0.50) * 1000,
+        'p95_ms': percentile(latencies, 0.95) * 1000,
+        'p99_ms': percentile(latencies, 0.99) * 1000,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare /chat backends under load")
+    parser.add_argument("targets", nargs="+", help="label=http://host:port (or a bare URL)")
+    parser.add_argument("--users", type=int, default=200, help="Conversations per backend")
+    parser.add_argument("--concurrency", type=int, default=100, help="Conversations in flight")
+    parser.add_argument("--think-ms", type=float, default=100.0, help="Mean pause between answers")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (s)")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    results = []
+    for target in args.targets:
+        label, _, url = target.rpartition("=")
+        label = label or url
+        print(f"🔄 {label}: {args.users} users, {args.concurrency} concurrent ...")
+        stats = asyncio.run(run_backend(
+            url, args.users, args.concurrency, args.think_ms / 1000.0, args.timeout, args.seed
+        ))
+        results.append((label, stats))
+
+    print("\n" + "=" * 78)
+    print(f"{'backend':<12}{'requests':>10}{'errors':>8}{'req/s':>10}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'time s':>8}")
+    print("=" * 78)
+    for label, s in results:
+        print(f"{label:<12}{s['requests']:>10}{s['errors']:>8}{s['requests_per_s']:>10.1f}"
+              f"{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['elapsed_s']:>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+"""
+User Population Simulator
+Simulates a population of users walking the /chat questions against a
+running backend: users arrive at random, think between answers (log-normal
+pauses, longest for the free-text first answer), sometimes give an invalid
+answer (the validation 400s) and retry, and sometimes abandon the
+conversation. Reports throughput, per-step latency percentiles, error
+rates, lost sessions and the server's memory growth.
+
+Start the backend (from backend/), then run from the project root:
+    gunicorn app:app --bind 127.0.0.1:5001 --workers 2 --threads 8 --pid /tmp/s2h.pid
+    python loadtest/simulate_users.py http://127.0.0.1:5001 \
+        --users 2000 --arrival-rate 50 --think-scale 0.1 \
+        --server-pid $(cat /tmp/s2h.pid) --json outputs/loadtest.json
+
+--think-scale 1 uses human think times (minutes per conversation), so a few
+hundred arrivals keep thousands of conversations open; smaller values
+compress the same population into a shorter run. Memory is read from /proc
+for --server-pid and its child processes (gunicorn workers), Linux only.
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import random
+import time
+from collections import Counter, defaultdict
+from urllib.parse import urlparse
+
+from compare_backends import conversation_messages, percentile, post_json
+
+
+# One request per step: the greeting, then one answer per question
+# (chatbot/chat_service.py QUESTIONS order)
+STEPS = ["start", "text", "sleep_hours", "bmi", "physical_activity", "work_hours",
+         "social_interaction"]
+
+# Median seconds a user needs before sending each answer
+THINK_MEDIAN_S = {
+    "text": 20.0,
+    "sleep_hours": 4.0,
+    "bmi": 8.0,
+    "physical_activity": 3.0,
+    "work_hours": 4.0,
+    "social_interaction": 3.0,
+}
+THINK_SIGMA = 0.8
+
+# Answers the backend rejects with 400
+INVALID_ANSWERS = {
+    "text": ["   "],
+    "sleep_hours": ["lots", "30", "seven"],
+    "bmi": ["5", "normal", "70"],
+    "physical_activity": ["sometimes", "2"],
+    "work_hours": ["-3", "full time", "25"],
+    "social_interaction": ["rarely", "yes"],
+}
+
+
+class LoadStats:
+    """
+    Counters and latencies collected by all simulated users
+    """
+
+    def __init__(self):
+        self.latencies = defaultdict(list)   # step -> seconds (200 replies)
+        self.statuses = defaultdict(Counter)  # step -> status / error kind -> count
+        self.started = 0
+        self.completed = 0
+        self.abandoned = Counter()           # step the user never answered -> count
+        self.failed = 0
+        self.lost_sessions = 0
+        self.invalid_sent = 0
+        self.active = 0
+        self.peak_active = 0
+
+    def record(self, step, status, seconds=None):
+        self.statuses[step][status] += 1
+        if status == 200 and seconds is not None:
+            self.latencies[step].append(seconds)
+
+
+async def send(target, step, message, session_id, timeout, stats):
+    """
+    Post one message and record it
+
+    Returns:
+        tuple: (status, reply JSON); status is an error kind string when no
+            HTTP response arrived
+    """
+    host, port, path = target
+    start = time.perf_counter()
+    try:
+        status, reply = await post_json(
+            host, port, path, {"message": message, "session_id": session_id}, timeout
+        )
+    except asyncio.TimeoutError:
+        stats.record(step, "timeout")
+        return "timeout", None
+    except (OSError, ValueError, IndexError):
+        stats.record(step, "connection")
+        return "connection", None
+
+    stats.record(step, status, time.perf_counter() - start)
+    return status, reply
+
+
+async def run_user(target, rng, args, stats):
+    """
+    One user: the full conversation, with think time, invalid answers and
+    possibly abandonment
+    """
+    messages = conversation_messages(rng)
+    session_id = None
+
+    stats.started += 1
+    stats.active += 1
+    stats.peak_active = max(stats.peak_active, stats.active)
+    try:
+        for i, step in enumerate(STEPS):
+            if i:
+                if rng.random() < args.abandon_rate:
+                    stats.abandoned[step] += 1
+                    return
+                median = THINK_MEDIAN_S[step] * args.think_scale
+                if median > 0:
+                    await asyncio.sleep(rng.lognormvariate(math.log(median), THINK_SIGMA))
+
+                # A rejected answer, then a second try after a short pause
+                if rng.random() < args.invalid_rate:
+                    stats.invalid_sent += 1
+                    status, _ = await send(target, step, rng.choice(INVALID_ANSWERS[step]),
+                                           session_id, args.timeout, stats)
+                    if status != 400:
+                        stats.statuses[step]["unexpected_invalid_reply"] += 1
+                    if median > 0:
+                        await asyncio.sleep(rng.lognormvariate(math.log(median / 2), THINK_SIGMA))
+
+            status, reply = await send(target, step, messages[i], session_id, args.timeout, stats)
+            if status != 200:
+                stats.failed += 1
+                return
+
+            # An unknown session_id silently starts a new conversation
+            if 0 < i < len(STEPS) - 1 and reply.get("session_id") != session_id:
+                stats.lost_sessions += 1
+                stats.failed += 1
+                return
+            session_id = reply.get("session_id")
+
+        stats.completed += 1
+    finally:
+        stats.active -= 1
+
+
+# -----------------------------
+# Server memory
+# -----------------------------
+def process_tree_rss(pid):
+    """
+    Resident memory (bytes) of a process and all its descendants, from /proc
+
+    Returns:
+        int: RSS in bytes, or None if the process is gone
+    """
+    children = defaultdict(list)
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat", "rb") as f:
+                # the command name may contain spaces; fields after it are fixed
+                ppid = int(f.read().rsplit(b")", 1)[1].split()[1])
+        except (OSError, IndexError, ValueError):
+            continue
+        children[ppid].append(int(entry))
+
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    total = 0
+    pending = [pid]
+    seen = False
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f"/proc/{current}/statm", "rb") as f:
+                total += int(f.read().split()[1]) * page_size
+            seen = True
+        except (OSError, IndexError, ValueError):
+            continue
+        pending.extend(children.get(current, ()))
+    return total if seen else None
+
+
+async def sample_memory(pid, interval, samples, stop):
+    while True:
+        rss = process_tree_rss(pid)
+        if rss is not None:
+            samples.append((time.perf_counter(), rss))
+        try:
+            await asyncio.wait_for(stop.wait(), interval)
+            return
+        except asyncio.TimeoutError:
+            pass
+
+
+# -----------------------------
+# Run and report
+# -----------------------------
+async def simulate(args):
+    parsed = urlparse(args.url)
+    target = (parsed.hostname, parsed.port or 80, parsed.path.rstrip("/") + "/chat")
+    stats = LoadStats()
+    rng = random.Random(args.seed)
+    limit = asyncio.Semaphore(args.max_active) if args.max_active else None
+
+    memory, stop = [], asyncio.Event()
+    sampler = None
+    if args.server_pid:
+        sampler = asyncio.create_task(sample_memory(args.server_pid, args.memory_interval,
+                                                    memory, stop))
+
+    async def user(seed):
+        if limit is None:
+            await run_user(target, random.Random(seed), args, stats)
+            return
+        async with limit:
+            await run_user(target, random.Random(seed), args, stats)
+
+    start = time.perf_counter()
+    tasks = []
+    for i in range(args.users):
+        if args.arrival_rate > 0 and i:
+            await asyncio.sleep(rng.expovariate(args.arrival_rate))
+        tasks.append(asyncio.create_task(user(args.seed + i)))
+    await asyncio.gather(*tasks)
+    elapsed = time.perf_counter() - start
+
+    if sampler is not None:
+        stop.set()
+        await sampler
+        rss = process_tree_rss(args.server_pid)
+        if rss is not None:
+            memory.append((time.perf_counter(), rss))
+
+    return report(stats, elapsed, memory)
+
+
+def report(stats, elapsed, memory):
+    """
+    Summarize a run
+
+    Returns:
+        dict: Users, throughput, per-step latency / status counts, errors
+            and memory
+    """
+    steps = {}
+    requests = errors = invalid_replies = 0
+    for step in STEPS:
+        latencies = sorted(stats.latencies[step])
+        statuses = stats.statuses[step]
+        count = sum(statuses.values())
+        step_errors = sum(n for status, n in statuses.items()
+                          if status not in (200, 400) and status != "unexpected_invalid_reply")
+        requests += count
+        errors += step_errors
+        invalid_replies += statuses.get(400, 0)
+        steps[step] = {
+            "requests": count,
+            "ok": statuses.get(200, 0),
+            "validation_400": statuses.get(400, 0),
+            "errors": step_errors,
+            "error_rate": step_errors / count if count else 0.0,
+            "statuses": {str(status): n for status, n in sorted(statuses.items(), key=str)},
+            "p50_ms": percentile(latencies, 0.50) * 1000,
+            "p95_ms": percentile(latencies, 0.95) * 1000,
+            "p99_ms": percentile(latencies, 0.99) * 1000,
+            "max_ms": latencies[-1] * 1000 if latencies else 0.0,
+        }
+
+    result = {
+        "users": stats.started,
+        "completed": stats.completed,
+        "abandoned": sum(stats.abandoned.values()),
+        "abandoned_before": dict(stats.abandoned),
+        "failed": stats.failed,
+        "lost_sessions": stats.lost_sessions,
+        "peak_active_users": stats.peak_active,
+        "elapsed_s": elapsed,
+        "requests": requests,
+        "requests_per_s": requests / elapsed if elapsed else 0.0,
+        "conversations_per_s": stats.completed / elapsed if elapsed else 0.0,
+        "invalid_answers_sent": stats.invalid_sent,
+        "validation_400s": invalid_replies,
+        "errors": errors,
+        "error_rate": errors / requests if requests else 0.0,
+        "steps": steps,
+    }
+    if memory:
+        values = [rss for _, rss in memory]
+        result["memory"] = {
+            "start_mb": values[0] / 2**20,
+            "peak_mb": max(values) / 2**20,
+            "end_mb": values[-1] / 2**20,
+            "growth_mb": (values[-1] - values[0]) / 2**20,
+            "samples": len(values),
+        }
+    return result
+
+
+def print_report(result):
+    print("\n" + "=" * 84)
+    print(f"👥 {result['users']} users: {result['completed']} completed, "
+          f"{result['abandoned']} abandoned, {result['failed']} failed "
+          f"(peak {result['peak_active_users']} active)")
+    print(f"⚡ {result['requests']} requests in {result['elapsed_s']:.1f} s: "
+          f"{result['requests_per_s']:.1f} req/s, "
+          f"{result['conversations_per_s']:.2f} conversations/s")
+    print(f"📝 {result['invalid_answers_sent']} invalid answers sent, "
+          f"{result['validation_400s']} validation 400s")
+    print(f"❌ {result['errors']} errors ({result['error_rate']:.2%}), "
+          f"{result['lost_sessions']} lost sessions")
+    if "memory" in result:
+        m = result["memory"]
+        print(f"🧠 Server RSS {m['start_mb']:.1f} MB → {m['end_mb']:.1f} MB "
+              f"(peak {m['peak_mb']:.1f} MB, growth {m['growth_mb']:+.1f} MB)")
+
+    print("=" * 84)
+    print(f"{'step':<20}{'requests':>9}{'400s':>7}{'errors':>8}"
+          f"{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}")
+    print("=" * 84)
+    for step, s in result["steps"].items():
+        print(f"{step:<20}{s['requests']:>9}{s['validation_400']:>7}{s['errors']:>8}"
+              f"{s['p50_ms']:>10.1f}{s['p95_ms']:>10.1f}{s['p99_ms']:>10.1f}{s['max_ms']:>10.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Simulate a user population on /chat")
+    parser.add_argument("url", help="Backend base URL, e.g. http://127.0.0.1:5001")
+    parser.add_argument("--users", type=int, default=1000, help="Users who start a conversation")
+    parser.add_argument("--arrival-rate", type=float, default=50.0,
+                        help="Mean new users per second (Poisson); 0 starts all at once")
+    parser.add_argument("--max-active", type=int, default=0,
+                        help="Cap on conversations in progress (0: no cap)")
+    parser.add_argument("--think-scale", type=float, default=1.0,
+                        help="Multiplier on the human think times (0: no pauses)")
+    parser.add_argument("--abandon-rate", type=float, default=0.05,
+                        help="Chance to leave before each answer")
+    parser.add_argument("--invalid-rate", type=float, default=0.05,
+                        help="Chance to first send an invalid answer")
+    parser.add_argument("--timeout", type=float, default=30.0, help="Per-request timeout (s)")
+    parser.add_argument("--server-pid", type=int, help="Backend PID for memory sampling")
+    parser.add_argument("--memory-interval", type=float, default=1.0,
+                        help="Seconds between memory samples")
+    parser.add_argument("--json", help="Also write the report to this file")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+
+    print(f"🔄 {args.users} users at {args.arrival_rate:g}/s against {args.url} ...")
+    result = asyncio.run(simulate(args))
+    print_report(result)
+
+    if args.json:
+        os.makedirs(os.path.dirname(os.path.abspath(args.json)), exist_ok=True)
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+        print(f"\n💾 Report saved to {args.json}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,562 @@
+"""
+Compiled Stress Predictor Module
+This module compiles a trained StandardScaler + model + LabelEncoder stack
+(logistic regression, decision tree or random forest) into plain NumPy
+arrays. The compiled predictors score requests without importing pandas or
+scikit-learn and reproduce sklearn's results bit for bit.
+"""
+
+import os
+import warnings
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from nlp.features import encode_profile, encode_profiles
+except ImportError:  # running as a script from inside nlp/
+    from features import encode_profile, encode_profiles
+
+
+COMPILED_MODEL_FILE = 'logistic_compiled.npz'
+
+# Rows walked through the trees at once; bounds the (rows x trees) index
+# temporaries so a large batch costs O(rows x classes) extra memory
+WALK_BLOCK_ROWS = 4096
+SMALL_BLOCK_ROWS = 64
+
+
+def _verification_grid():
+    """
+    Profiles covering the valid input range (0-24 hours of sleep and work,
+    every activity / social level), already encoded
+    """
+    return np.stack(np.meshgrid(
+        np.arange(0, 24.5, 0.5), np.arange(3), np.arange(0, 24.5, 0.5), np.arange(3),
+        indexing='ij'
+    ), axis=-1).reshape(-1, 4).astype(np.float64)
+
+
+def _scale_for_sklearn(scaler, grid):
+    with warnings.catch_warnings():
+        # scaler was fitted on a DataFrame; the grid is a plain array
+        warnings.simplefilter('ignore', UserWarning)
+        return scaler.transform(grid.copy())
+
+
+class CompiledLogisticPredictor:
+    """
+    NumPy-only logistic stress predictor
+
+    The scaler is applied as a separate subtract / divide step instead of being
+    folded into the coefficients: folding changes floating point rounding, and
+    the scores would no longer match sklearn exactly.
+    """
+
+    def __init__(self, mean, scale, coef, intercept, model_classes, label_classes):
+        """
+        Initialize compiled predictor from raw arrays
+
+        Args:
+            mean (ndarray): Scaler mean per feature (None if not centered)
+            scale (ndarray): Scaler scale per feature (None if not scaled)
+            coef (ndarray): Logistic regression coefficient matrix
+            intercept (ndarray): Logistic regression intercepts
+            model_classes (ndarray): Encoded class ids known to the model
+            label_classes (sequence): Stress level for each encoded class id
+        """
+        self.model_type = 'logistic'
+        self.mean = mean
+        self.scale = scale
+        self.coef = coef
+        self.intercept = intercept
+        self.model_classes = model_classes
+        self.label_classes = np.array([str(level) for level in label_classes], dtype=object)
+
+    @property
+    def model(self):
+        """
+        Compiled coefficient matrix (same attribute the backend checks)
+        """
+        return self.coef
+
+    @classmethod
+    def from_estimators(cls, scaler, model, label_encoder):
+        """
+        Compile fitted sklearn estimators
+
+        Args:
+            scaler (StandardScaler): Fitted scaler
+            model (LogisticRegression): Fitted logistic regression
+            label_encoder (LabelEncoder): Fitted label encoder
+
+        Returns:
+            CompiledLogisticPredictor: Compiled predictor
+        """
+        return cls(
+            mean=np.array(scaler.mean_, dtype=np.float64) if scaler.with_mean else None,
+            scale=np.array(scaler.scale_, dtype=np.float64) if scaler.with_std else None,
+            coef=np.array(model.coef_, dtype=np.float64),
+            intercept=np.array(model.intercept_, dtype=np.float64),
+            model_classes=np.array(model.classes_),
+            label_classes=label_encoder.classes_
+        )
+
+    # ===================== SCORING =====================
+
+    def decision_function(self, X):
+        """
+        Compute raw class scores, in the same operation order as sklearn
+
+        Args:
+            X (ndarray): Float feature matrix (modified in place)
+
+        Returns:
+            ndarray: Class scores
+        """
+        if self.mean is not None:
+            X -= self.mean
+        if self.scale is not None:
+            X /= self.scale
+
+        scores = X @ self.coef.T + self.intercept
+        if scores.shape[1] == 1:
+            return scores.reshape(-1)
+        return scores
+
+    def _labels(self, scores):
+        if scores.ndim == 1:
+            indices = (scores > 0).astype(np.intp)
+        else:
+            indices = scores.argmax(axis=1)
+        return self.label_classes[self.model_classes[indices]]
+
+    def _probabilities(self, scores):
+        if scores.ndim == 1:
+            prob = 1.0 / (1.0 + np.exp(-scores))
+            return np.vstack([1 - prob, prob]).T
+
+        # Softmax, as in sklearn.utils.extmath.softmax
+        scores -= scores.max(axis=1).reshape((-1, 1))
+        np.exp(scores, out=scores)
+        scores /= scores.sum(axis=1).reshape((-1, 1))
+        return scores
+
+    def predict(self, sleep_hours, physical_activity, work_hours, social_interaction):
+        """
+        Predict stress level for given inputs
+        """
+        X = np.array([encode_profile(
+            sleep_hours, physical_activity, work_hours, social_interaction
+        )], dtype=np.float64)
+
+        return self._labels(self.decision_function(X))[0]
+
+    def get_prediction_probability(self, sleep_hours, physical_activity,
+                                   work_hours, social_interaction):
+        """
+        Get prediction probabilities for all classes
+        """
+        X = np.array([encode_profile(
+            sleep_hours, physical_activity, work_hours, social_interaction
+        )], dtype=np.float64)
+
+        probabilities = self._probabilities(self.decision_function(X))[0]
+
+        return {
+            level: prob for level, prob in
+            zip(self.label_classes[self.model_classes], probabilities)
+        }
+
+    def predict_batch(self, profiles):
+        """
+        Predict stress levels for many profiles in one vectorized pass
+        (see StressPredictor.predict_batch)
+        """
+        return self._labels(self.decision_function(encode_profiles(profiles)))
+
+    def predict_proba_batch(self, profiles):
+        """
+        Get prediction probabilities for many profiles in one vectorized pass
+        (see StressPredictor.predict_proba_batch)
+        """
+        probabilities = self._probabilities(self.decision_function(encode_profiles(profiles)))
+
+        return {
+            level: probabilities[:, i] for i, level in
+            enumerate(self.label_classes[self.model_classes])
+        }
+
+    # ===================== VERIFICATION =====================
+
+    def verify(self, scaler, model, label_encoder):
+        """
+        Check that compiled scores match the sklearn stack exactly
+
+        The check runs over a grid covering the valid input range
+        (0-24 hours of sleep and work, every activity / social level).
+
+        Raises:
+            ValueError: If any score, label or probability differs
+        """
+        grid = _verification_grid()
+        expected_scaled = _scale_for_sklearn(scaler, grid)
+        expected_scores = model.decision_function(expected_scaled)
+        expected_labels = label_encoder.inverse_transform(model.predict(expected_scaled))
+        expected_proba = model.predict_proba(expected_scaled)
+
+        scores = self.decision_function(grid.copy())
+        checks = {
+            'scores': np.array_equal(scores, expected_scores),
+            'labels': np.array_equal(self._labels(scores), expected_labels),
+            'probabilities': np.array_equal(self._probabilities(scores.copy()), expected_proba)
+        }
+
+        failed = [name for name, ok in checks.items() if not ok]
+        if failed:
+            raise ValueError(f"Compiled logistic model does not match sklearn: {', '.join(failed)}")
+
+    # ===================== PERSISTENCE =====================
+
+    def to_arrays(self):
+        """
+        Compiled arrays by name (see from_arrays)
+        """
+        arrays = {
+            'coef': self.coef,
+            'intercept': self.intercept,
+            'model_classes': self.model_classes,
+            'label_classes': np.array(self.label_classes, dtype=str)
+        }
+        if self.mean is not None:
+            arrays['mean'] = self.mean
+        if self.scale is not None:
+            arrays['scale'] = self.scale
+        return arrays
+
+    def params(self):
+        """
+        Scalar settings stored next to the arrays
+        """
+        return {'model_type': self.model_type}
+
+    @classmethod
+    def from_arrays(cls, arrays, params=None):
+        """
+        Rebuild from to_arrays() output (arrays are used as given, so
+        memory-mapped arrays stay memory-mapped)
+        """
+        return cls(
+            mean=arrays.get('mean'),
+            scale=arrays.get('scale'),
+            coef=arrays['coef'],
+            intercept=arrays['intercept'],
+            model_classes=arrays['model_classes'],
+            label_classes=arrays['label_classes']
+        )
+
+    def save(self, path):
+        """
+        Save compiled arrays to a single .npz file
+        """
+        np.savez(path, **self.to_arrays())
+
+    @classmethod
+    def load(cls, path):
+        """
+        Load compiled arrays saved with save()
+        """
+        with np.load(path, allow_pickle=False) as data:
+            return cls.from_arrays({name: data[name] for name in data.files})
+
+
+class CompiledTreePredictor:
+    """
+    NumPy-only decision tree / random forest stress predictor
+
+    Every tree's nodes live in shared flat arrays, so all trees are walked
+    together, one level per step. Leaves point to themselves, which keeps
+    finished trees in place while deeper ones continue. Scaled features are
+    cast to float32 before the threshold comparisons, as sklearn does.
+    Forest probabilities are summed tree by tree in estimator order.
+    """
+
+    def __init__(self, mean, scale, left, right, feature, threshold, proba, roots,
+                 max_depth, model_classes, label_classes, model_type='random_forest'):
+        """
+        Initialize compiled predictor from raw arrays
+
+        Args:
+            mean (ndarray): Scaler mean per feature (None if not centered)
+            scale (ndarray): Scaler scale per feature (None if not scaled)
+            left (ndarray): Left child per node (leaves: the node itself)
+            right (ndarray): Right child per node (leaves: the node itself)
+            feature (ndarray): Split feature per node
+            threshold (ndarray): Split threshold per node (go left if <=)
+            proba (ndarray): Class probabilities per node (n_nodes, n_classes)
+            roots (ndarray): Root node of each tree
+            max_depth (int): Deepest tree
+            model_classes (ndarray): Encoded class ids known to the model
+            label_classes (sequence): Stress level for each encoded class id
+            model_type (str): 'decision_tree' or 'random_forest'
+        """
+        self.model_type = model_type
+        self.mean = mean
+        self.scale = scale
+        self.left = left
+        self.right = right
+        self.feature = feature
+        self.threshold = threshold
+        self.proba = proba
+        self.roots = roots
+        self.max_depth = int(max_depth)
+        self.model_classes = model_classes
+        self.label_classes = np.array([str(level) for level in label_classes], dtype=object)
+
+    @property
+    def model(self):
+        """
+        Compiled node probabilities (same attribute the backend checks)
+        """
+        return self.proba
+
+    @classmethod
+    def from_estimators(cls, scaler, model, label_encoder):
+        """
+        Compile fitted sklearn estimators
+
+        Args:
+            scaler (StandardScaler): Fitted scaler
+            model (DecisionTreeClassifier or RandomForestClassifier): Fitted model
+            label_encoder (LabelEncoder): Fitted label encoder
+
+        Returns:
+            CompiledTreePredictor: Compiled predictor
+        """
+        estimators = getattr(model, 'estimators_', [model])
+
+        left, right, feature, threshold, proba, roots = [], [], [], [], [], []
+        offset = 0
+        for estimator in estimators:
+            tree = estimator.tree_
+            nodes = np.arange(tree.node_count)
+            leaf = tree.children_left == -1
+
+            left.append(np.where(leaf, nodes, tree.children_left) + offset)
+            right.append(np.where(leaf, nodes, tree.children_right) + offset)
+            feature.append(np.where(leaf, 0, tree.feature))
+            threshold.append(np.where(leaf, 0.0, tree.threshold))
+
+            # Per-node normalization, as DecisionTreeClassifier.predict_proba
+            value = np.array(tree.value[:, 0, :], dtype=np.float64)
+            normalizer = value.sum(axis=1)[:, np.newaxis]
+            normalizer[normalizer == 0.0] = 1.0
+            proba.append(value / normalizer)
+
+            roots.append(offset)
+            offset += tree.node_count
+
+        return cls(
+            mean=np.array(scaler.mean_, dtype=np.float64) if scaler.with_mean else None,
+            scale=np.array(scaler.scale_, dtype=np.float64) if scaler.with_std else None,
+            left=np.concatenate(left).astype(np.int32),
+            right=np.concatenate(right).astype(np.int32),
+            feature=np.concatenate(feature).astype(np.int32),
+            threshold=np.concatenate(threshold).astype(np.float64),
+            proba=np.concatenate(proba),
+            roots=np.array(roots, dtype=np.int32),
+            max_depth=max(estimator.tree_.max_depth for estimator in estimators),
+            model_classes=np.array(model.classes_),
+            label_classes=label_encoder.classes_,
+            model_type='random_forest' if hasattr(model, 'estimators_') else 'decision_tree'
+        )
+
+    # ===================== SCORING =====================
+
+    def predict_proba_matrix(self, X):
+        """
+        Class probabilities, in the same operation order as sklearn
+
+        Args:
+            X (ndarray): Float feature matrix (modified in place)
+
+        Returns:
+            ndarray: Probabilities (n_profiles, n_classes)
+        """
+        if self.mean is not None:
+            X -= self.mean
+        if self.scale is not None:
+            X /= self.scale
+        X = X.astype(np.float32)
+
+        total = np.empty((X.shape[0], self.proba.shape[1]), dtype=self.proba.dtype)
+        for start in range(0, X.shape[0], WALK_BLOCK_ROWS):
+            block = X[start:start + WALK_BLOCK_ROWS]
+            nodes = self._leaves(block)
+
+            # Added tree by tree, in the forest's running-total order; a few
+            # rows gather every tree at once (cumsum keeps the same order)
+            out = total[start:start + len(block)]
+            if len(block) < SMALL_BLOCK_ROWS:
+                out[:] = np.cumsum(self.proba[nodes], axis=1)[:, -1]
+                continue
+            out[:] = self.proba[nodes[:, 0]]
+            for tree in range(1, nodes.shape[1]):
+                out += self.proba[nodes[:, tree]]
+
+        total /= len(self.roots)
+        return total
+
+    def _leaves(self, X):
+        """
+        Leaf node of every tree for each row (n_rows, n_trees)
+        """
+        rows = np.arange(X.shape[0])[:, np.newaxis]
+        nodes = np.repeat(self.roots[np.newaxis, :], X.shape[0], axis=0)
+        for _ in range(self.max_depth):
+            go_left = X[rows, self.feature[nodes]] <= self.threshold[nodes]
+            nodes = np.where(go_left, self.left[nodes], self.right[nodes])
+        return nodes
+
+    def _labels(self, proba):
+        return self.label_classes[self.model_classes[proba.argmax(axis=1)]]
+
+    def predict(self, sleep_hours, physical_activity, work_hours, social_interaction):
+        """
+        Predict stress level for given inputs
+        """
+        X = np.array([encode_profile(
+            sleep_hours, physical_activity, work_hours, social_interaction
+        )], dtype=np.float64)
+
+        return self._labels(self.predict_proba_matrix(X))[0]
+
+    def get_prediction_probability(self, sleep_hours, physical_activity,
+                                   work_hours, social_interaction):
+        """
+        Get prediction probabilities for all classes
+        """
+        X = np.array([encode_profile(
+            sleep_hours, physical_activity, work_hours, social_interaction
+        )], dtype=np.float64)
+
+        probabilities = self.predict_proba_matrix(X)[0]
+
+        return {
+            level: prob for level, prob in
+            zip(self.label_classes[self.model_classes], probabilities)
+        }
+
+    def predict_batch(self, profiles):
+        """
+        Predict stress levels for many profiles in one vectorized pass
+        (see StressPredictor.predict_batch)
+        """
+        return self._labels(self.predict_proba_matrix(encode_profiles(profiles)))
+
+    def predict_proba_batch(self, profiles):
+        """
+        Get prediction probabilities for many profiles in one vectorized pass
+        (see StressPredictor.predict_proba_batch)
+        """
+        probabilities = self.predict_proba_matrix(encode_profiles(profiles))
+
+        return {
+            level: probabilities[:, i] for i, level in
+            enumerate(self.label_classes[self.model_classes])
+        }
+
+    # ===================== VERIFICATION =====================
+
+    def verify(self, scaler, model, label_encoder):
+        """
+        Check that compiled predictions match the sklearn stack exactly
+        (same grid as CompiledLogisticPredictor.verify)
+
+        Raises:
+            ValueError: If any label or probability differs
+        """
+        grid = _verification_grid()
+        expected_scaled = _scale_for_sklearn(scaler, grid)
+        expected_labels = label_encoder.inverse_transform(model.predict(expected_scaled))
+        expected_proba = model.predict_proba(expected_scaled)
+
+        proba = self.predict_proba_matrix(grid.copy())
+        checks = {
+            'labels': np.array_equal(self._labels(proba), expected_labels),
+            'probabilities': np.array_equal(proba, expected_proba)
+        }
+
+        failed = [name for name, ok in checks.items() if not ok]
+        if failed:
+            raise ValueError(
+                f"Compiled {self.model_type} model does not match sklearn: {', '.join(failed)}"
+            )
+
+    # ===================== PERSISTENCE =====================
+
+    def to_arrays(self):
+        """
+        Compiled arrays by name (see from_arrays)
+        """
+        arrays = {
+            'left': self.left,
+            'right': self.right,
+            'feature': self.feature,
+            'threshold': self.threshold,
+            'proba': self.proba,
+            'roots': self.roots,
+            'model_classes': self.model_classes,
+            'label_classes': np.array(self.label_classes, dtype=str)
+        }
+        if self.mean is not None:
+            arrays['mean'] = self.mean
+        if self.scale is not None:
+            arrays['scale'] = self.scale
+        return arrays
+
+    def params(self):
+        """
+        Scalar settings stored next to the arrays
+        """
+        return {'max_depth': self.max_depth, 'model_type': self.model_type}
+
+    @classmethod
+    def from_arrays(cls, arrays, params):
+        """
+        Rebuild from to_arrays() / params() output (arrays are used as
+        given, so memory-mapped arrays stay memory-mapped)
+        """
+        return cls(
+            mean=arrays.get('mean'),
+            scale=arrays.get('scale'),
+            left=arrays['left'],
+            right=arrays['right'],
+            feature=arrays['feature'],
+            threshold=arrays['threshold'],
+            proba=arrays['proba'],
+            roots=arrays['roots'],
+            max_depth=params['max_depth'],
+            model_classes=arrays['model_classes'],
+            label_classes=arrays['label_classes'],
+            model_type=params['model_type']
+        )
+
+
+def load_compiled_model(model_dir):
+    """
+    Load the compiled logistic model saved next to the joblib artifacts
+
+    Args:
+        model_dir (str): Model directory relative to the project root
+
+    Returns:
+        CompiledLogisticPredictor: Compiled predictor
+    """
+    BASE_DIR = Path(__file__).resolve().parent.parent  # Stress2Health/
+    path = BASE_DIR / model_dir / COMPILED_MODEL_FILE
+
+    predictor = CompiledLogisticPredictor.load(path)
+    print(f"Compiled model loaded from {os.path.dirname(path)}")
+
+    return predictor
@@ -11,6 +11,11 @@ from sklearn.preprocessing import LabelEncoder, StandardScaler
 import joblib
 import os
 
+try:
+    from nlp.features import encode_profiles
+except ImportError:  # running as a script from inside nlp/
+    from features import encode_profiles
+
 try:
     import tensorflow as tf
     from tensorflow import keras
@@ -231,6 +236,46 @@ class DeepStressPredictor:
         
         return prob_dict
     
+    def predict_batch(self, profiles):
+        """
+        Predict stress levels for many profiles with a single forward pass
+        
+        Args:
+            profiles: Columnar dict or NumPy structured array with
+                'sleep_hours', 'physical_activity', 'work_hours' and
+                'social_interaction' fields
+            
+        Returns:
+            ndarray: Predicted stress level for each profile
+        """
+        X_scaled = self.scaler.transform(encode_profiles(profiles))
+        
+        prediction = self.model.predict(X_scaled, verbose=0)
+        predicted_classes = np.argmax(prediction, axis=1)
+        
+        return self.label_encoder.inverse_transform(predicted_classes)
+    
+    def predict_proba_batch(self, profiles):
+        """
+        Get prediction probabilities for many profiles with a single forward pass
+        
+        Args:
+            profiles: Same as predict_batch
+            
+        Returns:
+            dict: Stress level -> array of probabilities (one per profile)
+        """
+        X_scaled = self.scaler.transform(encode_profiles(profiles))
+        
+        probabilities = self.model.predict(X_scaled, verbose=0)
+        
+        prob_dict = {
+            level: probabilities[:, i] for i, level in 
+            enumerate(self.label_encoder.classes_)
+        }
+        
+        return prob_dict
+    
     def save_model(self, model_dir):
         """
         Save trained model and preprocessing objects
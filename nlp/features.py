@@ -0,0 +1,80 @@
+"""
+Lifestyle Feature Encoding Module
+This module turns lifestyle profiles into the numeric feature matrix used by
+the stress predictors. It only depends on NumPy so it can be used on the
+request path without pulling in pandas or scikit-learn.
+"""
+
+import numpy as np
+
+
+# Order of the model input columns (must match training)
+FEATURE_COLUMNS = ['sleep_hours', 'physical_activity', 'work_hours', 'social_interaction']
+
+# Encoding for the categorical low / medium / high answers
+ACTIVITY_MAPPING = {'low': 0, 'medium': 1, 'high': 2}
+
+
+def encode_profile(sleep_hours, physical_activity, work_hours, social_interaction):
+    """
+    Encode a single profile into a feature row
+
+    Args:
+        sleep_hours (float): Hours of sleep
+        physical_activity (str): Activity level ('low', 'medium', 'high')
+        work_hours (float): Hours of work
+        social_interaction (str): Social interaction level
+
+    Returns:
+        list: Feature values in FEATURE_COLUMNS order
+    """
+    return [
+        sleep_hours,
+        ACTIVITY_MAPPING[physical_activity.lower()],
+        work_hours,
+        ACTIVITY_MAPPING[social_interaction.lower()]
+    ]
+
+
+def encode_levels(values):
+    """
+    Vectorized low / medium / high encoding
+
+    Args:
+        values (array-like): Level strings (any case)
+
+    Returns:
+        ndarray: Integer codes
+    """
+    levels = np.char.lower(np.asarray(values, dtype=str))
+    codes = np.full(levels.shape, -1, dtype=np.int64)
+    for level, code in ACTIVITY_MAPPING.items():
+        codes[levels == level] = code
+
+    if (codes < 0).any():
+        # Same failure mode as the single-row dictionary lookup
+        raise KeyError(str(levels[codes < 0][0]))
+
+    return codes
+
+
+def encode_profiles(profiles):
+    """
+    Encode many profiles into a feature matrix in one pass
+
+    Args:
+        profiles: Columnar dict (column name -> sequence) or NumPy
+            structured array with the FEATURE_COLUMNS fields
+
+    Returns:
+        ndarray: Float matrix of shape (n_profiles, 4)
+    """
+    sleep_hours = np.asarray(profiles['sleep_hours'], dtype=np.float64)
+
+    X = np.empty((sleep_hours.shape[0], len(FEATURE_COLUMNS)), dtype=np.float64)
+    X[:, 0] = sleep_hours
+    X[:, 1] = encode_levels(profiles['physical_activity'])
+    X[:, 2] = np.asarray(profiles['work_hours'], dtype=np.float64)
+    X[:, 3] = encode_levels(profiles['social_interaction'])
+
+    return X
@@ -0,0 +1,240 @@
+"""
+Fused Stress Predictor Module
+This module trains and uses one model over the text-derived stress features
+(keyword counts and word count from TextProcessor) together with the four
+lifestyle features, so each user is scored with a single model call.
+"""
+
+import os
+from pathlib import Path
+
+import joblib
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.metrics import accuracy_score, classification_report
+from sklearn.model_selection import train_test_split
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+try:
+    from nlp.features import FEATURE_COLUMNS, encode_profile, encode_profiles
+    from nlp.text_processor import TextProcessor
+except ImportError:  # running as a script from inside nlp/
+    from features import FEATURE_COLUMNS, encode_profile, encode_profiles
+    from text_processor import TextProcessor
+
+
+# Text features from TextProcessor.extract_stress_features (sentiment_score is
+# low - high, so it would only duplicate the two counts)
+TEXT_FEATURE_COLUMNS = ['high_stress_keywords', 'low_stress_keywords', 'word_count']
+
+# Order of the model input columns (must match training)
+FUSED_FEATURE_COLUMNS = TEXT_FEATURE_COLUMNS + FEATURE_COLUMNS
+
+
+class FusedStressPredictor:
+    """
+    Text + lifestyle stress prediction (StandardScaler + LogisticRegression)
+    """
+
+    def __init__(self, text_processor=None):
+        """
+        Initialize fused predictor
+
+        Args:
+            text_processor (TextProcessor): Feature extractor for the message
+                (default: a new processor without SpaCy)
+        """
+        self.model_type = 'fused'
+        self.text_processor = text_processor or TextProcessor(use_spacy=False)
+        self.model = LogisticRegression(random_state=42, max_iter=1000)
+        self.scaler = StandardScaler()
+        self.label_encoder = LabelEncoder()
+
+    # ===================== FEATURES =====================
+
+    def encode(self, texts, profiles):
+        """
+        Build the fused feature matrix for many users in one pass
+
+        Args:
+            texts (list): Free-text message per user
+            profiles: Columnar dict or NumPy structured array with the
+                lifestyle fields (see nlp/features.py)
+
+        Returns:
+            DataFrame: FUSED_FEATURE_COLUMNS features
+        """
+        text_features = self.text_processor.extract_stress_features_batch(texts)
+
+        X = np.empty((len(text_features['word_count']), len(FUSED_FEATURE_COLUMNS)))
+        for i, column in enumerate(TEXT_FEATURE_COLUMNS):
+            X[:, i] = text_features[column]
+        X[:, len(TEXT_FEATURE_COLUMNS):] = encode_profiles(profiles)
+
+        return pd.DataFrame(X, columns=FUSED_FEATURE_COLUMNS)
+
+    def encode_one(self, text, sleep_hours, physical_activity, work_hours, social_interaction):
+        """
+        Build the fused feature row for one user
+        """
+        features = self.text_processor.extract_stress_features(text)
+        row = [features[column] for column in TEXT_FEATURE_COLUMNS] + encode_profile(
+            sleep_hours, physical_activity, work_hours, social_interaction
+        )
+        return pd.DataFrame([row], columns=FUSED_FEATURE_COLUMNS, dtype=np.float64)
+
+    # ===================== TRAINING =====================
+
+    def train(self, data_path, text_column='text'):
+        """
+        Train the fused model
+
+        Args:
+            data_path (str): Training CSV with the text, lifestyle and
+                stress_level columns
+            text_column (str): Free-text column
+
+        Returns:
+            dict: Training metrics
+        """
+        print("Training fused text + lifestyle model...")
+
+        df = pd.read_csv(data_path)
+        df[text_column] = df[text_column].fillna('').astype(str)
+
+        # All text features in one batched preprocessing pass
+        X = self.encode(df[text_column].tolist(), {
+            column: df[column].to_numpy() for column in FEATURE_COLUMNS
+        })
+        y_encoded = self.label_encoder.fit_transform(df['stress_level'])
+
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y_encoded, test_size=0.2, random_state=42,
+        )
+
+        X_train_scaled = self.scaler.fit_transform(X_train)
+        X_test_scaled = self.scaler.transform(X_test)
+
+        self.model.fit(X_train_scaled, y_train)
+
+        y_pred = self.model.predict(X_test_scaled)
+        accuracy = accuracy_score(y_test, y_pred)
+
+        print(f"\n{'='*50}")
+        print(f"Model: {self.model_type}")
+        print(f"Accuracy: {accuracy:.2%}")
+        print(f"\nClassification Report:")
+        print(classification_report(
+            y_test,
+            y_pred,
+            zero_division=0
+        ))
+        print(f"{'='*50}\n")
+
+        metrics = {
+            'accuracy': accuracy,
+            'model_type': self.model_type,
+            'n_samples': len(df)
+        }
+
+        return metrics
+
+    # ===================== SCORING =====================
+
+    def predict(self, text, sleep_hours, physical_activity, work_hours, social_interaction):
+        """
+        Predict stress level from the message and lifestyle answers
+        """
+        X = self.encode_one(text, sleep_hours, physical_activity, work_hours, social_interaction)
+
+        X_scaled = self.scaler.transform(X)
+        prediction = self.model.predict(X_scaled)
+
+        return self.label_encoder.inverse_transform(prediction)[0]
+
+    def get_prediction_probability(self, text, sleep_hours, physical_activity,
+                                   work_hours, social_interaction):
+        """
+        Get prediction probabilities for all classes
+        """
+        X = self.encode_one(text, sleep_hours, physical_activity, work_hours, social_interaction)
+
+        X_scaled = self.scaler.transform(X)
+        probabilities = self.model.predict_proba(X_scaled)[0]
+
+        return {
+            level: prob for level, prob in
+            zip(self.label_encoder.classes_, probabilities)
+        }
+
+    def predict_batch(self, texts, profiles):
+        """
+        Predict stress levels for many users in one vectorized pass
+
+        Args:
+            texts (list): Free-text message per user
+            profiles: Lifestyle profiles (see StressPredictor.predict_batch)
+
+        Returns:
+            ndarray: Predicted stress level for each user
+        """
+        X_scaled = self.scaler.transform(self.encode(texts, profiles))
+        return self.label_encoder.inverse_transform(self.model.predict(X_scaled))
+
+    def predict_proba_batch(self, texts, profiles):
+        """
+        Get prediction probabilities for many users in one vectorized pass
+
+        Returns:
+            dict: Stress level -> array of probabilities (one per user)
+        """
+        X_scaled = self.scaler.transform(self.encode(texts, profiles))
+        probabilities = self.model.predict_proba(X_scaled)
+
+        return {
+            level: probabilities[:, i] for i, level in
+            enumerate(self.label_encoder.classes_)
+        }
+
+    # ===================== PERSISTENCE =====================
+
+    def save_model(self, model_dir):
+        """
+        Save trained model and preprocessing objects
+        """
+        BASE_DIR = Path(__file__).resolve().parent.parent  # Stress2Health/
+        model_dir = BASE_DIR / model_dir
+
+        os.makedirs(model_dir, exist_ok=True)
+
+        joblib.dump(self.model, model_dir / 'fused_model.pkl')
+        joblib.dump(self.scaler, model_dir / 'scaler.pkl')
+        joblib.dump(self.label_encoder, model_dir / 'label_encoder.pkl')
+
+        print(f"Model saved to {model_dir}")
+
+    def load_model(self, model_dir):
+        """
+        Load trained model and preprocessing objects
+        """
+        BASE_DIR = Path(__file__).resolve().parent.parent  # Stress2Health/
+        model_dir = BASE_DIR / model_dir
+
+        self.model = joblib.load(model_dir / 'fused_model.pkl')
+        self.scaler = joblib.load(model_dir / 'scaler.pkl')
+        self.label_encoder = joblib.load(model_dir / 'label_encoder.pkl')
+
+        print(f"Model loaded from {model_dir}")
+
+
+# Example usage
+if __name__ == "__main__":
+    predictor = FusedStressPredictor()
+    predictor.train('data/stress_dataset.csv')
+    predictor.save_model('models/fused')
+
+    print(predictor.predict(
+        "I feel anxious and overwhelmed",
+        sleep_hours=5, physical_activity='low', work_hours=11, social_interaction='low'
+    ))
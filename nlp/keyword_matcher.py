@@ -0,0 +1,177 @@
+"""
+Keyword Matcher Module
+This module compiles keyword lists into one character trie so a message is
+scanned in a single pass, whatever the size of the lexicon.
+"""
+
+
+# Trie node key holding the ids of keywords that end at that node
+_END = None
+
+
+class KeywordMatcher:
+    """
+    Multi-pattern keyword matcher over token sequences
+
+    Keywords are matched at token starts with prefix semantics, the way
+    the stress lexicon is written: 'anxiet' matches 'anxiety', but 'tense'
+    no longer matches inside 'intense'. Multi-word keywords ('burnt out')
+    match across consecutive tokens. Each keyword counts once per message.
+    """
+
+    def __init__(self, keyword_groups):
+        """
+        Build the trie
+
+        Args:
+            keyword_groups (dict): Group name -> list of keywords
+        """
+        self.groups = list(keyword_groups)
+        self.keywords = []
+        self._keyword_groups = []
+        self._root = {}
+
+        for group_index, group in enumerate(self.groups):
+            for keyword in keyword_groups[group]:
+                self.add(keyword, group_index)
+
+    def add(self, keyword, group_index):
+        """
+        Add one keyword to the trie
+
+        Args:
+            keyword (str): Keyword or phrase (lowercased, whitespace collapsed)
+            group_index (int): Index into self.groups
+
+        Returns:
+            int: Keyword id
+        """
+        keyword = ' '.join(keyword.lower().split())
+        if not keyword:
+            raise ValueError("Empty keyword")
+
+        keyword_id = len(self.keywords)
+        self.keywords.append(keyword)
+        self._keyword_groups.append(group_index)
+
+        node = self._root
+        for ch in keyword:
+            node = node.setdefault(ch, {})
+        node.setdefault(_END, []).append(keyword_id)
+        return keyword_id
+
+    def match_ids(self, tokens):
+        """
+        Find every keyword that starts at a token start
+
+        Args:
+            tokens (list): Processed tokens
+
+        Returns:
+            set: Matched keyword ids
+        """
+        text = ' '.join(tokens)
+        root = self._root
+        found = set()
+
+        end = len(text)
+        start = 0
+        for token in tokens:
+            node = root
+            # Walk on past the token end so phrases can span tokens
+            i = start
+            while i < end:
+                node = node.get(text[i])
+                if node is None:
+                    break
+                ids = node.get(_END)
+                if ids is not None:
+                    found.update(ids)
+                i += 1
+            start += len(token) + 1
+
+        return found
+
+    # ===================== INCREMENTAL MATCHING =====================
+
+    def start_walk(self):
+        """
+        Trie position for a walk starting at a new token
+        """
+        return self._root
+
+    def advance(self, walks, chunk, found):
+        """
+        Continue trie walks through more text (for incremental matching)
+
+        Feeding a message token by token ('tok', then ' tok' for each later
+        token, with a new walk started at every token) finds exactly the
+        keywords match_ids() finds on the whole message.
+
+        Args:
+            walks (list): Live trie positions
+            chunk (str): Text appended to the message
+            found (set): Keyword ids, updated in place
+
+        Returns:
+            list: Walks still alive (can be extended by the next chunk)
+        """
+        alive = []
+        for node in walks:
+            for ch in chunk:
+                node = node.get(ch)
+                if node is None:
+                    break
+                ids = node.get(_END)
+                if ids is not None:
+                    found.update(ids)
+            else:
+                # A node holding only the end marker cannot match any further
+                if len(node) > (_END in node):
+                    alive.append(node)
+        return alive
+
+    def count_ids(self, keyword_ids):
+        """
+        Count matched keywords per group
+
+        Args:
+            keyword_ids (iterable): Keyword ids from match_ids()
+
+        Returns:
+            dict: Group name -> number of distinct keywords matched
+        """
+        counts = dict.fromkeys(self.groups, 0)
+        for keyword_id in keyword_ids:
+            counts[self.groups[self._keyword_groups[keyword_id]]] += 1
+        return counts
+
+    def group_of(self, keyword_id):
+        """
+        Group name of a keyword id
+        """
+        return self.groups[self._keyword_groups[keyword_id]]
+
+    def count(self, tokens):
+        """
+        Count distinct keywords per group in one pass over the tokens
+
+        Args:
+            tokens (list): Processed tokens
+
+        Returns:
+            dict: Group name -> number of distinct keywords matched
+        """
+        return self.count_ids(self.match_ids(tokens))
+
+    def matches(self, tokens):
+        """
+        Get the matched keywords themselves
+
+        Args:
+            tokens (list): Processed tokens
+
+        Returns:
+            list: Matched keywords, in lexicon order
+        """
+        return [self.keywords[i] for i in sorted(self.match_ids(tokens))]
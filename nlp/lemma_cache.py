@@ -0,0 +1,234 @@
+"""
+Lemma Cache Module
+This module provides a bounded LRU cache of word -> lemma results, shared by
+TextProcessor instances, so WordNet is only consulted once per distinct word.
+The cache can be saved to disk and reloaded so it stays warm across restarts.
+"""
+
+import atexit
+import json
+import os
+import threading
+from collections import OrderedDict
+
+
+DEFAULT_MAXSIZE = 100000
+
+
+class LemmaCache:
+    """
+    Thread-safe LRU cache with hit / miss / eviction counters
+    """
+
+    def __init__(self, maxsize=DEFAULT_MAXSIZE, path=None):
+        """
+        Initialize lemma cache
+
+        Args:
+            maxsize (int): Most words kept; least recently used are evicted
+            path (str): JSON file to load from (if it exists) and save to
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+
+        self.maxsize = maxsize
+        self.path = path
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        # Lemmas added since the last load / save (nothing new, nothing to write)
+        self._unsaved = 0
+
+        if path and os.path.exists(path):
+            self.load(path)
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, word):
+        return word in self._entries
+
+    def get(self, word):
+        """
+        Get a cached lemma
+
+        Returns:
+            str: Lemma, or None if the word is not cached
+        """
+        with self._lock:
+            lemma = self._entries.get(word)
+            if lemma is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(word)
+            self.hits += 1
+            return lemma
+
+    def put(self, word, lemma):
+        """
+        Cache a lemma, evicting the least recently used word if full
+        """
+        with self._lock:
+            self._put(word, lemma)
+
+    def _put(self, word, lemma):
+        self._unsaved += 1
+        self._entries[word] = lemma
+        self._entries.move_to_end(word)
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def lemmatize_many(self, words, lemmatize):
+        """
+        Lemmatize a token list, computing only the cache misses
+
+        Args:
+            words (list): Tokens
+            lemmatize (callable): word -> lemma (e.g. WordNetLemmatizer.lemmatize)
+
+        Returns:
+            list: Lemmas, in token order
+        """
+        entries = self._entries
+        lemmas = []
+        hits = misses = 0
+
+        # One lock round-trip per message; also serializes WordNet, whose
+        # lazy corpus loader is not thread-safe
+        with self._lock:
+            for word in words:
+                lemma = entries.get(word)
+                if lemma is None:
+                    misses += 1
+                    lemma = lemmatize(word)
+                    self._put(word, lemma)
+                else:
+                    hits += 1
+                    entries.move_to_end(word)
+                lemmas.append(lemma)
+
+            self.hits += hits
+            self.misses += misses
+
+        return lemmas
+
+    def clear(self):
+        """
+        Drop all entries and reset counters
+        """
+        with self._lock:
+            self._entries.clear()
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self):
+        """
+        Get cache counters
+
+        Returns:
+            dict: size, maxsize, hits, misses, evictions and hit_rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'size': len(self._entries),
+                'maxsize': self.maxsize,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    # ===================== PERSISTENCE =====================
+
+    def save_if_changed(self):
+        """
+        Save to the init path if lemmas were added since the last load /
+        save (registered at exit for the shared cache)
+
+        Returns:
+            bool: Whether the file was written
+        """
+        if not self.path or not self._unsaved:
+            return False
+        try:
+            self.save()
+        except OSError as e:
+            print(f"⚠️ Could not save lemma cache to {self.path}: {e}")
+            return False
+        return True
+
+    def save(self, path=None):
+        """
+        Write the cache to JSON, least recently used first (atomic replace)
+
+        Args:
+            path (str): Target file (default: the path given at init)
+        """
+        path = path or self.path
+        if not path:
+            raise ValueError("No cache path given")
+
+        with self._lock:
+            items = list(self._entries.items())
+            self._unsaved = 0
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(items, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
+
+    def load(self, path=None):
+        """
+        Merge entries from a JSON file written by save()
+
+        Args:
+            path (str): Source file (default: the path given at init)
+
+        Returns:
+            int: Number of entries loaded
+        """
+        path = path or self.path
+        with open(path, 'r', encoding='utf-8') as f:
+            items = json.load(f)
+
+        with self._lock:
+            # Keep the most recently used entries if the file is larger than maxsize
+            for word, lemma in items[-self.maxsize:]:
+                self._put(word, lemma)
+            self._unsaved = 0
+
+        return len(items[-self.maxsize:])
+
+
+_shared_cache = None
+_shared_lock = threading.Lock()
+
+
+def get_shared_cache():
+    """
+    Process-wide cache used by TextProcessor by default
+
+    Size and persistence file come from LEMMA_CACHE_SIZE / LEMMA_CACHE_PATH;
+    with a path, the cache is saved back when the process exits, so the
+    next start (or worker) begins warm.
+
+    Returns:
+        LemmaCache: Shared instance
+    """
+    global _shared_cache
+    if _shared_cache is None:
+        with _shared_lock:
+            if _shared_cache is None:
+                cache = LemmaCache(
+                    maxsize=int(os.environ.get("LEMMA_CACHE_SIZE", DEFAULT_MAXSIZE)),
+                    path=os.environ.get("LEMMA_CACHE_PATH") or None
+                )
+                if cache.path:
+                    atexit.register(cache.save_if_changed)
+                _shared_cache = cache
+    return _shared_cache
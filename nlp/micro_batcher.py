@@ -0,0 +1,159 @@
+"""
+Micro-Batching Prediction Module
+This module puts a dynamic micro-batching layer in front of a stress predictor.
+Concurrent predict() calls are collected for a short window and scored with one
+predict_batch() call, so the deep learning model runs one forward pass per batch
+instead of one per user.
+"""
+
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
+try:
+    from nlp.features import FEATURE_COLUMNS, encode_profile
+except ImportError:  # running as a script from inside nlp/
+    from features import FEATURE_COLUMNS, encode_profile
+
+
+class MicroBatchPredictor:
+    """
+    Wraps any predictor that implements predict_batch()
+
+    Batches only form when requests arrive concurrently, e.g. with
+    `gunicorn --threads N` (gthread workers). With one sync thread per
+    worker every batch has size 1.
+    """
+
+    def __init__(self, predictor, max_batch_size=64, max_wait_ms=2.0, on_batch=None):
+        """
+        Initialize micro-batching wrapper
+
+        Args:
+            predictor: StressPredictor, DeepStressPredictor or compiled predictor
+            max_batch_size (int): Dispatch as soon as this many requests are queued
+            max_wait_ms (float): Longest time the first request of a batch waits
+            on_batch (callable): Called with the size of every dispatched
+                batch, e.g. a metrics histogram's observe (None: stats() only)
+        """
+        self.predictor = predictor
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000.0
+        self.on_batch = on_batch
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._worker = None
+        self._worker_pid = None
+
+        # Metrics
+        self._requests = 0
+        self._batches = 0
+        self._errors = 0
+        self._max_queue_depth = 0
+        self._batch_sizes = {}
+
+    def __getattr__(self, name):
+        # model, label_encoder, get_prediction_probability, ... come from the wrapped predictor
+        return getattr(self.predictor, name)
+
+    def _ensure_worker(self):
+        # The worker thread does not survive a fork (gunicorn --preload),
+        # so it is started lazily in the process that uses it
+        if self._worker is not None and self._worker_pid == os.getpid():
+            return
+
+        with self._lock:
+            if self._worker is None or self._worker_pid != os.getpid():
+                self._queue = queue.Queue()
+                self._worker = threading.Thread(
+                    target=self._run, name='micro-batcher', daemon=True
+                )
+                self._worker_pid = os.getpid()
+                self._worker.start()
+
+    def predict(self, sleep_hours, physical_activity, work_hours, social_interaction):
+        """
+        Predict stress level for given inputs (batched with concurrent calls)
+        """
+        # Validate in the caller's thread so one bad row cannot fail a whole batch
+        encode_profile(sleep_hours, physical_activity, work_hours, social_interaction)
+
+        self._ensure_worker()
+
+        future = Future()
+        self._queue.put(((sleep_hours, physical_activity, work_hours, social_interaction), future))
+        return future.result()
+
+    def _collect(self):
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self._queue.get(timeout=remaining))
+            except queue.Empty:
+                break
+
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._collect()
+            self._record_batch(len(batch), self._queue.qsize())
+            if self.on_batch is not None:
+                self.on_batch(len(batch))
+
+            columns = {
+                column: [row[i] for row, _ in batch]
+                for i, column in enumerate(FEATURE_COLUMNS)
+            }
+
+            try:
+                stress_levels = self.predictor.predict_batch(columns)
+            except Exception as e:
+                with self._lock:
+                    self._errors += 1
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+
+            for (_, future), stress_level in zip(batch, stress_levels):
+                future.set_result(stress_level)
+
+    # ===================== METRICS =====================
+
+    def _record_batch(self, batch_size, queue_depth):
+        # Power-of-two buckets: 1, 2, 4, 8, ...
+        bucket = 1 << (batch_size - 1).bit_length()
+
+        with self._lock:
+            self._requests += batch_size
+            self._batches += 1
+            self._max_queue_depth = max(self._max_queue_depth, queue_depth + batch_size)
+            self._batch_sizes[bucket] = self._batch_sizes.get(bucket, 0) + 1
+
+    def stats(self):
+        """
+        Get batching metrics
+
+        Returns:
+            dict: Request / batch counters, queue depth and batch size histogram
+        """
+        with self._lock:
+            return {
+                'requests': self._requests,
+                'batches': self._batches,
+                'errors': self._errors,
+                'mean_batch_size': self._requests / self._batches if self._batches else 0.0,
+                'queue_depth': self._queue.qsize(),
+                'max_queue_depth': self._max_queue_depth,
+                'batch_size_histogram': dict(sorted(self._batch_sizes.items())),
+                'max_batch_size': self.max_batch_size,
+                'max_wait_ms': self.max_wait * 1000.0
+            }
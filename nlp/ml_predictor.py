@@ -16,6 +16,19 @@ import joblib
 import os
 from pathlib import Path  # ✅ ADDED (ONLY NEW IMPORT)
 
+try:
+    from nlp.features import FEATURE_COLUMNS, encode_profiles
+    from nlp.compiled_predictor import (
+        CompiledLogisticPredictor, CompiledTreePredictor, COMPILED_MODEL_FILE
+    )
+    from nlp.model_bundle import BUNDLE_FILE, save_bundle
+except ImportError:  # running as a script from inside nlp/
+    from features import FEATURE_COLUMNS, encode_profiles
+    from compiled_predictor import (
+        CompiledLogisticPredictor, CompiledTreePredictor, COMPILED_MODEL_FILE
+    )
+    from model_bundle import BUNDLE_FILE, save_bundle
+
 
 class StressPredictor:
     """
@@ -168,6 +181,67 @@ class StressPredictor:
         
         return prob_dict
     
+    def predict_batch(self, profiles):
+        """
+        Predict stress levels for many profiles in one vectorized pass
+        
+        Args:
+            profiles: Columnar dict or NumPy structured array with
+                'sleep_hours', 'physical_activity', 'work_hours' and
+                'social_interaction' fields
+            
+        Returns:
+            ndarray: Predicted stress level for each profile
+        """
+        X = pd.DataFrame(encode_profiles(profiles), columns=FEATURE_COLUMNS)
+        
+        X_scaled = self.scaler.transform(X)
+        predictions = self.model.predict(X_scaled)
+        
+        return self.label_encoder.inverse_transform(predictions)
+    
+    def predict_proba_batch(self, profiles):
+        """
+        Get prediction probabilities for many profiles in one vectorized pass
+        
+        Args:
+            profiles: Same as predict_batch
+            
+        Returns:
+            dict: Stress level -> array of probabilities (one per profile)
+        """
+        X = pd.DataFrame(encode_profiles(profiles), columns=FEATURE_COLUMNS)
+        
+        X_scaled = self.scaler.transform(X)
+        probabilities = self.model.predict_proba(X_scaled)
+        
+        prob_dict = {
+            level: probabilities[:, i] for i, level in 
+            enumerate(self.label_encoder.classes_)
+        }
+        
+        return prob_dict
+    
+    def compile(self):
+        """
+        Compile the fitted stack into a NumPy-only predictor
+        
+        Returns:
+            CompiledLogisticPredictor or CompiledTreePredictor: Verified
+                compiled predictor
+        """
+        if self.model_type == 'logistic':
+            compiled_class = CompiledLogisticPredictor
+        else:
+            compiled_class = CompiledTreePredictor
+        
+        compiled = compiled_class.from_estimators(
+            self.scaler, self.model, self.label_encoder
+        )
+        compiled.verify(self.scaler, self.model, self.label_encoder)
+        
+        return compiled
+    
     # ===================== FIXED PATH HANDLING =====================
     
     def save_model(self, model_dir):
@@ -183,6 +257,15 @@ class StressPredictor:
         joblib.dump(self.scaler, model_dir / 'scaler.pkl')
         joblib.dump(self.label_encoder, model_dir / 'label_encoder.pkl')
         
+        try:
+            compiled = self.compile()
+            if self.model_type == 'logistic':
+                compiled.save(model_dir / COMPILED_MODEL_FILE)
+            # Single mmap-able artifact the backend loads (see nlp/model_bundle.py)
+            save_bundle(model_dir / BUNDLE_FILE, compiled)
+        except ValueError as e:
+            print(f"Skipping compiled model: {e}")
+        
         print(f"Model saved to {model_dir}")
     
     def load_model(self, model_dir):
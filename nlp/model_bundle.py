@@ -0,0 +1,277 @@
+"""
+Model Bundle Module
+This module stores a compiled stress predictor as one versioned file: a
+JSON manifest (format version, model type, training library versions,
+array layout and a SHA-256 checksum) followed by the raw model arrays at
+aligned offsets. Loading memory-maps the file instead of unpickling, so it
+takes milliseconds even for the random forest, triggers no scikit-learn
+version warnings and lets every worker process share the same read-only
+pages through the page cache.
+
+Build bundles for already trained models (train_models.py writes them
+automatically):
+    python -m nlp.model_bundle                  # logistic, decision_tree, random_forest
+    python -m nlp.model_bundle random_forest
+"""
+
+import hashlib
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+try:
+    from nlp.compiled_predictor import CompiledLogisticPredictor, CompiledTreePredictor
+    from nlp.features import FEATURE_COLUMNS
+except ImportError:  # running as a script from inside nlp/
+    from compiled_predictor import CompiledLogisticPredictor, CompiledTreePredictor
+    from features import FEATURE_COLUMNS
+
+
+BUNDLE_FILE = 'model.bundle'
+BUNDLE_FORMAT = 1
+
+MAGIC = b'S2HBNDL\x00'
+HEADER_BYTES = 16            # magic + manifest length (uint64, little endian)
+ALIGNMENT = 64               # array offsets (cache line / SIMD friendly)
+
+PREDICTOR_CLASSES = {
+    'logistic': CompiledLogisticPredictor,
+    'decision_tree': CompiledTreePredictor,
+    'random_forest': CompiledTreePredictor,
+}
+
+MODEL_TYPES = tuple(PREDICTOR_CLASSES)
+
+
+def _align(offset):
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+def library_versions():
+    """
+    Versions of the libraries the model was trained and compiled with
+    """
+    versions = {'python': platform.python_version(), 'numpy': np.__version__}
+    sklearn = sys.modules.get('sklearn')
+    if sklearn is not None:
+        versions['scikit-learn'] = sklearn.__version__
+    return versions
+
+
+# ===================== FILE FORMAT =====================
+
+def write_bundle(path, arrays, manifest):
+    """
+    Write arrays plus manifest as one bundle file (atomically replaced, so
+    workers still mapping the old file keep a consistent copy)
+
+    Args:
+        path (str): Bundle file
+        arrays (dict): Name -> ndarray (no object arrays)
+        manifest (dict): JSON-serializable metadata; 'arrays', 'data_bytes'
+            and 'checksum' are filled in
+
+    Returns:
+        dict: The manifest as written
+    """
+    layout = {}
+    blocks = []
+    offset = 0
+    for name, array in arrays.items():
+        array = np.asarray(array)
+        if array.dtype.hasobject:
+            raise ValueError(f"Array {name!r} has dtype object and cannot be mapped")
+        # Keep Fortran order (e.g. sklearn's coef_): the memory layout picks
+        # the matmul summation order, and with it the last bits of scores
+        fortran = array.flags.f_contiguous and not array.flags.c_contiguous
+        offset = _align(offset)
+        layout[name] = {'offset': offset, 'dtype': array.dtype.str, 'shape': list(array.shape),
+                        'fortran_order': bool(fortran)}
+        blocks.append((offset, array.tobytes(order='F' if fortran else 'C')))
+        offset += array.nbytes
+
+    data = bytearray(offset)
+    for start, block in blocks:
+        data[start:start + len(block)] = block
+
+    manifest = dict(manifest, arrays=layout, data_bytes=len(data),
+                    checksum='sha256:' + hashlib.sha256(data).hexdigest())
+    header = json.dumps(manifest, indent=2, sort_keys=True).encode('utf-8')
+    data_start = _align(HEADER_BYTES + len(header))
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.bundle-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(MAGIC)
+            f.write(len(header).to_bytes(8, 'little'))
+            f.write(header)
+            f.write(b'\0' * (data_start - HEADER_BYTES - len(header)))
+            f.write(data)
+        os.chmod(tmp_path, 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+    return manifest
+
+
+def read_manifest(path):
+    """
+    Read only the manifest of a bundle
+
+    Returns:
+        tuple: (manifest dict, byte offset where the array data starts)
+    """
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not a model bundle")
+        length = int.from_bytes(f.read(8), 'little')
+        manifest = json.loads(f.read(length))
+
+    if manifest.get('format', 0) > BUNDLE_FORMAT:
+        raise ValueError(
+            f"{path} uses bundle format {manifest['format']}; this code reads up to {BUNDLE_FORMAT}"
+        )
+    return manifest, _align(HEADER_BYTES + length)
+
+
+def read_bundle(path, verify=True):
+    """
+    Memory-map a bundle
+
+    Args:
+        path (str): Bundle file
+        verify (bool): Check the SHA-256 checksum of the array data
+
+    Returns:
+        tuple: (manifest dict, name -> read-only memory-mapped ndarray)
+
+    Raises:
+        ValueError: If the file is not a bundle or the checksum differs
+    """
+    manifest, data_start = read_manifest(path)
+    mapped = np.memmap(path, dtype=np.uint8, mode='r')
+    data = mapped[data_start:data_start + manifest['data_bytes']]
+
+    if verify:
+        digest = 'sha256:' + hashlib.sha256(data).hexdigest()
+        if digest != manifest['checksum']:
+            raise ValueError(f"{path} is corrupted (checksum mismatch)")
+
+    arrays = {}
+    for name, spec in manifest['arrays'].items():
+        arrays[name] = np.ndarray(
+            tuple(spec['shape']), dtype=np.dtype(spec['dtype']),
+            buffer=mapped, offset=data_start + spec['offset'],
+            order='F' if spec.get('fortran_order') else 'C'
+        )
+    return manifest, arrays
+
+
+# ===================== PREDICTORS =====================
+
+def save_bundle(path, predictor, metadata=None):
+    """
+    Save a compiled predictor as a bundle
+
+    Args:
+        path (str): Bundle file
+        predictor (CompiledLogisticPredictor or CompiledTreePredictor):
+            Verified compiled predictor (StressPredictor.compile())
+        metadata (dict): Extra JSON-serializable information to record
+
+    Returns:
+        dict: The manifest as written
+    """
+    manifest = {
+        'format': BUNDLE_FORMAT,
+        'model_type': predictor.model_type,
+        'params': predictor.params(),
+        'feature_columns': FEATURE_COLUMNS,
+        'label_classes': [str(level) for level in predictor.label_classes],
+        'libraries': library_versions(),
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'metadata': metadata or {},
+    }
+    return write_bundle(path, predictor.to_arrays(), manifest)
+
+
+def load_bundle(path, verify=True):
+    """
+    Load a compiled predictor from a bundle file (arrays stay memory-mapped)
+
+    Returns:
+        CompiledLogisticPredictor or CompiledTreePredictor: Predictor, with
+            the manifest as its `manifest` attribute
+    """
+    manifest, arrays = read_bundle(path, verify)
+
+    if manifest['feature_columns'] != FEATURE_COLUMNS:
+        raise ValueError(f"{path} was built for features {manifest['feature_columns']}")
+    predictor_class = PREDICTOR_CLASSES.get(manifest['model_type'])
+    if predictor_class is None:
+        raise ValueError(f"{path} holds an unknown model type {manifest['model_type']!r}")
+
+    predictor = predictor_class.from_arrays(arrays, manifest['params'])
+    predictor.manifest = manifest
+    return predictor
+
+
+def load_bundle_model(model_dir, verify=True):
+    """
+    Load the bundle saved in a model directory
+
+    Args:
+        model_dir (str): Model directory relative to the project root
+        verify (bool): Check the checksum
+
+    Returns:
+        CompiledLogisticPredictor or CompiledTreePredictor: Predictor
+    """
+    BASE_DIR = Path(__file__).resolve().parent.parent  # Stress2Health/
+    path = BASE_DIR / model_dir / BUNDLE_FILE
+
+    predictor = load_bundle(path, verify)
+    libraries = predictor.manifest['libraries']
+    print(f"Model bundle loaded from {os.path.dirname(path)} "
+          f"({predictor.model_type}, scikit-learn {libraries.get('scikit-learn', '?')})")
+
+    return predictor
+
+
+def build_bundle(model_dir, model_type):
+    """
+    Compile the joblib artifacts in a model directory into a bundle (one-off
+    migration for models trained before bundles existed)
+
+    Returns:
+        dict: The manifest as written
+    """
+    from nlp.ml_predictor import StressPredictor
+
+    predictor = StressPredictor(model_type=model_type)
+    predictor.load_model(model_dir)
+
+    BASE_DIR = Path(__file__).resolve().parent.parent  # Stress2Health/
+    return save_bundle(
+        BASE_DIR / model_dir / BUNDLE_FILE, predictor.compile(),
+        metadata={'source': 'joblib artifacts'}
+    )
+
+
+if __name__ == "__main__":
+    sys.path.append(str(Path(__file__).resolve().parent.parent))
+
+    for model_type in sys.argv[1:] or MODEL_TYPES:
+        manifest = build_bundle(f"models/{model_type}", model_type)
+        print(f"✅ {model_type}: {manifest['data_bytes'] / 1024:.1f} KB of arrays, "
+              f"{manifest['checksum'][:19]}...")
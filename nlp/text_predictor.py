@@ -0,0 +1,337 @@
+"""
+Text Stress Predictor Module
+This module trains and uses a learned text classifier for stress levels.
+Messages go through the TextProcessor pipeline, are hashed into a fixed-size
+sparse feature space (no vocabulary kept in memory) and scored with a linear
+model trained incrementally with partial_fit, so corpora of any size are
+streamed through in constant memory.
+"""
+
+import itertools
+import json
+import os
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+from sklearn.feature_extraction.text import HashingVectorizer
+from sklearn.linear_model import SGDClassifier
+from sklearn.model_selection import train_test_split
+
+try:
+    from nlp.text_processor import TextProcessor
+except ImportError:  # running as a script from inside nlp/
+    from text_processor import TextProcessor
+
+
+# Fixed class order, so every partial_fit chunk sees the same label space
+STRESS_LEVELS = np.array(['high', 'low', 'medium'], dtype=object)
+
+TEXT_CONFIG_FILE = 'text_config.json'
+TEXT_WEIGHTS_FILE = 'text_weights.npz'
+
+
+class TextStressPredictor:
+    """
+    Hashing-vectorizer + SGD logistic text classifier
+    """
+
+    FORMAT_VERSION = 1
+
+    def __init__(self, n_features=2 ** 18, ngram_range=(1, 2), alpha=1e-4,
+                 text_processor=None):
+        """
+        Initialize text predictor
+
+        Args:
+            n_features (int): Hashed feature space size
+            ngram_range (tuple): Word n-grams hashed per message
+            alpha (float): L2 regularization strength
+            text_processor (TextProcessor): Preprocessing pipeline
+                (default: a new processor without SpaCy)
+        """
+        self.n_features = n_features
+        self.ngram_range = tuple(ngram_range)
+        self.alpha = alpha
+        self.text_processor = text_processor or TextProcessor(use_spacy=False)
+
+        # Stateless: tokens are already cleaned, lowercased and lemmatized
+        self.vectorizer = HashingVectorizer(
+            n_features=n_features,
+            ngram_range=self.ngram_range,
+            token_pattern=r"(?u)\b\w+\b",
+            lowercase=False,
+            alternate_sign=False,
+            norm='l2'
+        )
+        self.model = SGDClassifier(loss='log_loss', alpha=alpha, random_state=42)
+        self.coef = None
+        self.intercept = None
+
+    # ===================== FEATURES =====================
+
+    def featurize(self, texts):
+        """
+        Hash raw messages into a sparse feature matrix
+
+        Args:
+            texts (iterable): Raw messages
+
+        Returns:
+            scipy.sparse.csr_matrix: (n_messages, n_features) features
+        """
+        documents = (' '.join(tokens) for tokens in self.text_processor.preprocess_stream(texts))
+        return self.vectorizer.transform(documents)
+
+    # ===================== TRAINING =====================
+
+    def partial_fit(self, texts, labels):
+        """
+        Update the model with one chunk of labelled messages
+
+        Args:
+            texts (list): Raw messages
+            labels (list): Stress level per message ('low' / 'medium' / 'high')
+        """
+        if self.model is None:
+            raise ValueError("Loaded text models are scoring-only; retrain from data")
+
+        self.model.partial_fit(self.featurize(texts), np.asarray(labels, dtype=object),
+                               classes=STRESS_LEVELS)
+        self.coef = self.model.coef_
+        self.intercept = self.model.intercept_
+
+    def train(self, data_path, text_column='text', label_column='stress_level',
+              chunk_size=10000, epochs=5):
+        """
+        Train by streaming a CSV in chunks (constant memory)
+
+        During the first epoch each chunk is scored before the model learns
+        from it, so the reported accuracy is a progressive-validation
+        estimate without a held-out copy of the data. Later epochs revisit
+        rows the model has already seen, so they are not scored. A file
+        that fits in one chunk has nothing to score that way, so it is
+        trained on a split with 20% held out instead (as the fused model is).
+
+        Args:
+            data_path (str): Training CSV
+            text_column (str): Message column
+            label_column (str): Stress level column
+            chunk_size (int): Rows read and learned per step
+            epochs (int): Passes over the file
+
+        Returns:
+            dict: Training metrics
+        """
+        if self.model is None:
+            raise ValueError("Loaded text models are scoring-only; retrain from data")
+
+        print(f"Training text model ({self.n_features} hashed features)...")
+
+        chunks = self._read_chunks(data_path, text_column, label_column, chunk_size)
+        first = next(chunks, None)
+        if first is None:
+            raise ValueError(f"No training rows in {data_path}")
+        second = next(chunks, None)
+        if second is None:
+            return self._train_held_out(*first, epochs)
+
+        correct = seen = 0
+        n_samples = 0
+        for epoch in range(epochs):
+            if epoch == 0:
+                chunks = itertools.chain((first, second), chunks)
+            else:
+                chunks = self._read_chunks(data_path, text_column, label_column, chunk_size)
+
+            for texts, labels in chunks:
+                X = self.featurize(texts)
+                if epoch == 0:
+                    n_samples += len(labels)
+                    if self.coef is not None:
+                        correct += int((self._labels(self.decision_function(X)) == labels).sum())
+                        seen += len(labels)
+
+                self.model.partial_fit(X, labels, classes=STRESS_LEVELS)
+                self.coef = self.model.coef_
+                self.intercept = self.model.intercept_
+
+            if epoch == 0 and seen:
+                print(f"Epoch 1/{epochs}: progressive accuracy {correct / seen:.2%}")
+            else:
+                print(f"Epoch {epoch + 1}/{epochs} done")
+
+        metrics = {
+            'accuracy': correct / seen if seen else None,
+            'model_type': 'text_sgd',
+            'n_samples': n_samples
+        }
+
+        return metrics
+
+    @staticmethod
+    def _read_chunks(data_path, text_column, label_column, chunk_size):
+        for chunk in pd.read_csv(data_path, usecols=[text_column, label_column],
+                                 chunksize=chunk_size):
+            chunk = chunk.dropna()
+            texts = chunk[text_column].astype(str).tolist()
+            labels = chunk[label_column].str.lower().str.strip().to_numpy(dtype=object)
+            yield texts, labels
+
+    def _train_held_out(self, texts, labels, epochs):
+        texts_train, texts_test, y_train, y_test = train_test_split(
+            texts, labels, test_size=0.2, random_state=42
+        )
+        X_train = self.featurize(texts_train)
+
+        for _ in range(epochs):
+            self.model.partial_fit(X_train, y_train, classes=STRESS_LEVELS)
+        self.coef = self.model.coef_
+        self.intercept = self.model.intercept_
+
+        accuracy = float((self.predict_batch(texts_test) == y_test).mean())
+        print(f"Held-out accuracy {accuracy:.2%} ({len(y_test)} of {len(labels)} rows, "
+              f"{epochs} epochs)")
+
+        metrics = {
+            'accuracy': accuracy,
+            'model_type': 'text_sgd',
+            'n_samples': len(labels)
+        }
+
+        return metrics
+
+    # ===================== SCORING =====================
+
+    def decision_function(self, X):
+        """
+        Raw class scores for a sparse feature matrix
+        """
+        if self.coef is None:
+            raise ValueError("Text model is not trained or loaded")
+        return np.asarray(X @ self.coef.T) + self.intercept
+
+    @staticmethod
+    def _labels(scores):
+        return STRESS_LEVELS[scores.argmax(axis=1)]
+
+    @staticmethod
+    def _probabilities(scores):
+        # One-vs-rest logistic, normalized as in SGDClassifier.predict_proba
+        prob = 1.0 / (1.0 + np.exp(-scores))
+        prob /= prob.sum(axis=1).reshape((-1, 1))
+        return prob
+
+    def predict(self, text):
+        """
+        Predict stress level for one message
+        """
+        return self.predict_batch([text])[0]
+
+    def get_prediction_probability(self, text):
+        """
+        Get prediction probabilities for all classes for one message
+        """
+        return {level: prob[0] for level, prob in self.predict_proba_batch([text]).items()}
+
+    def predict_batch(self, texts):
+        """
+        Predict stress levels for many messages in one sparse pass
+
+        Args:
+            texts (iterable): Raw messages
+
+        Returns:
+            ndarray: Predicted stress level for each message
+        """
+        return self._labels(self.decision_function(self.featurize(texts)))
+
+    def predict_proba_batch(self, texts):
+        """
+        Get prediction probabilities for many messages in one sparse pass
+
+        Returns:
+            dict: Stress level -> array of probabilities (one per message)
+        """
+        probabilities = self._probabilities(self.decision_function(self.featurize(texts)))
+
+        return {
+            level: probabilities[:, i] for i, level in enumerate(STRESS_LEVELS)
+        }
+
+    # ===================== PERSISTENCE =====================
+
+    def save_model(self, model_dir):
+        """
+        Save hashing config (JSON) and weights (.npz, no pickle)
+        """
+        BASE_DIR = Path(__file__).resolve().parent.parent  # Stress2Health/
+        model_dir = BASE_DIR / model_dir
+
+        if self.coef is None:
+            raise ValueError("Text model is not trained")
+
+        os.makedirs(model_dir, exist_ok=True)
+
+        config = {
+            'format_version': self.FORMAT_VERSION,
+            'n_features': self.n_features,
+            'ngram_range': list(self.ngram_range),
+            'alpha': self.alpha,
+            'classes': STRESS_LEVELS.tolist()
+        }
+        with open(model_dir / TEXT_CONFIG_FILE, 'w') as f:
+            json.dump(config, f, indent=2)
+
+        # Hashed weights are mostly zero on small corpora
+        np.savez_compressed(model_dir / TEXT_WEIGHTS_FILE, coef=self.coef, intercept=self.intercept)
+
+        print(f"Text model saved to {model_dir}")
+
+    @classmethod
+    def load_model(cls, model_dir, text_processor=None):
+        """
+        Load a model saved with save_model() (scoring only)
+
+        Returns:
+            TextStressPredictor: Predictor ready for predict / predict_batch
+        """
+        BASE_DIR = Path(__file__).resolve().parent.parent  # Stress2Health/
+        model_dir = BASE_DIR / model_dir
+
+        with open(model_dir / TEXT_CONFIG_FILE) as f:
+            config = json.load(f)
+
+        if config.get('format_version') != cls.FORMAT_VERSION:
+            raise ValueError(f"Unsupported text model format: {config.get('format_version')}")
+        if config['classes'] != STRESS_LEVELS.tolist():
+            raise ValueError(f"Unexpected text model classes: {config['classes']}")
+
+        predictor = cls(
+            n_features=config['n_features'],
+            ngram_range=config['ngram_range'],
+            alpha=config['alpha'],
+            text_processor=text_processor
+        )
+        predictor.model = None
+
+        with np.load(model_dir / TEXT_WEIGHTS_FILE, allow_pickle=False) as data:
+            predictor.coef = data['coef']
+            predictor.intercept = data['intercept']
+
+        if predictor.coef.shape != (len(STRESS_LEVELS), predictor.n_features):
+            raise ValueError(f"Text weights have shape {predictor.coef.shape}")
+
+        print(f"Text model loaded from {model_dir}")
+        return predictor
+
+
+# Example usage
+if __name__ == "__main__":
+    predictor = TextStressPredictor()
+    predictor.train('data/stress_dataset.csv')
+    predictor.save_model('models/text')
+
+    for text in ["I feel extremely stressed and anxious about work",
+                 "I'm feeling great and relaxed today"]:
+        print(f"{text!r}: {predictor.predict(text)}")
@@ -5,47 +5,67 @@ using NLTK and SpaCy for stress detection from user messages.
 """
 
 import re
-import nltk
-from nltk.corpus import stopwords
-from nltk.tokenize import word_tokenize
-from nltk.stem import WordNetLemmatizer
-import spacy
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+try:
+    from nlp.keyword_matcher import KeywordMatcher
+    from nlp.lemma_cache import get_shared_cache
+except ImportError:  # running as a script from inside nlp/
+    from keyword_matcher import KeywordMatcher
+    from lemma_cache import get_shared_cache
+
+# NLTK data needed by the preprocessing pipeline
+NLTK_RESOURCES = [
+    ('tokenizers/punkt', 'punkt'),
+    ('corpora/stopwords', 'stopwords'),
+    ('corpora/wordnet', 'wordnet'),
+]
+
+_NON_ALPHA = re.compile(r'[^a-zA-Z\s]')
+_WHITESPACE = re.compile(r'\s+')
+
+# On cleaned text (lowercase letters and single spaces) word_tokenize only
+# differs from str.split() by splitting these Treebank contractions
+_TREEBANK_SPLITS = {
+    'cannot': ('can', 'not'),
+    'gimme': ('gim', 'me'),
+    'gonna': ('gon', 'na'),
+    'gotta': ('got', 'ta'),
+    'lemme': ('lem', 'me'),
+    'wanna': ('wan', 'na'),
+}
+
 
 class TextProcessor:
     """
     Text processing class for NLP operations
+
+    NLTK data and the SpaCy model are loaded on first use, so constructing
+    a processor is cheap.
     """
     
-    def __init__(self):
+    def __init__(self, use_spacy=True, lemma_cache=None):
         """
-        Initialize NLP tools and download necessary NLTK data
-        """
-        # Download required NLTK data
-        try:
-            nltk.data.find('tokenizers/punkt')
-        except LookupError:
-            nltk.download('punkt', quiet=True)
+        Initialize NLP tools (loaded lazily)
         
-        try:
-            nltk.data.find('corpora/stopwords')
-        except LookupError:
-            nltk.download('stopwords', quiet=True)
-        
-        try:
-            nltk.data.find('corpora/wordnet')
-        except LookupError:
-            nltk.download('wordnet', quiet=True)
-        
-        # Initialize lemmatizer and stopwords
-        self.lemmatizer = WordNetLemmatizer()
-        self.stop_words = set(stopwords.words('english'))
-        
-        # Try to load SpaCy model
-        try:
-            self.nlp = spacy.load('en_core_web_sm')
-        except OSError:
-            print("SpaCy model not found. Run: python -m spacy download en_core_web_sm")
-            self.nlp = None
+        Args:
+            use_spacy (bool): Allow loading the SpaCy model through `nlp`.
+                Feature extraction does not need it, so False skips the
+                SpaCy import entirely.
+            lemma_cache (LemmaCache): Lemma cache (default: the process-wide
+                shared cache, see nlp/lemma_cache.py)
+        """
+        self.use_spacy = use_spacy
+        self._lock = threading.Lock()
+        self._lemmatizer = None
+        self._stop_words = None
+        self._word_tokenize = None
+        self._nlp = None
+        self._nlp_loaded = False
+        self.lemma_cache = lemma_cache if lemma_cache is not None else get_shared_cache()
         
         # Stress-related keywords for feature extraction
         self.stress_keywords = {
@@ -55,6 +75,85 @@ class TextProcessor:
             'low_stress': ['relaxed', 'calm', 'peaceful', 'happy', 'great', 
                           'wonderful', 'balanced', 'content', 'motivated', 'harmony']
         }
+        
+        # Compiled once; rebuild with set_stress_keywords() after changing the lists
+        self.keyword_matcher = KeywordMatcher(self.stress_keywords)
+    
+    def set_stress_keywords(self, stress_keywords):
+        """
+        Replace the stress lexicon and recompile the matcher
+        
+        Args:
+            stress_keywords (dict): 'high_stress' / 'low_stress' -> keyword lists
+        """
+        self.keyword_matcher = KeywordMatcher(stress_keywords)
+        self.stress_keywords = stress_keywords
+    
+    # ===================== LAZY LOADING =====================
+    
+    def _load_nltk(self):
+        """
+        Import NLTK, download missing data and build lemmatizer / stopwords
+        """
+        with self._lock:
+            if self._lemmatizer is not None:
+                return
+            
+            import nltk
+            from nltk.corpus import stopwords
+            from nltk.tokenize import word_tokenize
+            from nltk.stem import WordNetLemmatizer
+            
+            # Download required NLTK data
+            for path, package in NLTK_RESOURCES:
+                try:
+                    nltk.data.find(path)
+                except LookupError:
+                    nltk.download(package, quiet=True)
+            
+            self._stop_words = set(stopwords.words('english'))
+            self._word_tokenize = word_tokenize
+            self._lemmatizer = WordNetLemmatizer()
+    
+    @property
+    def lemmatizer(self):
+        if self._lemmatizer is None:
+            self._load_nltk()
+        return self._lemmatizer
+    
+    @property
+    def stop_words(self):
+        if self._lemmatizer is None:
+            self._load_nltk()
+        return self._stop_words
+    
+    @property
+    def nlp(self):
+        """
+        SpaCy pipeline (None if disabled or the model is not installed)
+        """
+        if not self._nlp_loaded:
+            with self._lock:
+                if not self._nlp_loaded:
+                    self._nlp = self._load_spacy() if self.use_spacy else None
+                    self._nlp_loaded = True
+        return self._nlp
+    
+    @staticmethod
+    def _load_spacy():
+        try:
+            import spacy
+            return spacy.load('en_core_web_sm')
+        except (ImportError, OSError):
+            print("SpaCy model not found. Run: python -m spacy download en_core_web_sm")
+            return None
+    
+    def warm_up(self):
+        """
+        Load everything up front (e.g. from a background thread)
+        """
+        self._load_nltk()
+        self.nlp
     
     def clean_text(self, text):
         """
@@ -70,10 +169,10 @@ class TextProcessor:
         text = text.lower()
         
         # Remove special characters and digits
-        text = re.sub(r'[^a-zA-Z\s]', '', text)
+        text = _NON_ALPHA.sub('', text)
         
         # Remove extra whitespaces
-        text = re.sub(r'\s+', ' ', text).strip()
+        text = _WHITESPACE.sub(' ', text).strip()
         
         return text
     
@@ -87,7 +186,9 @@ class TextProcessor:
         Returns:
             list: List of tokens
         """
-        return word_tokenize(text)
+        if self._word_tokenize is None:
+            self._load_nltk()
+        return self._word_tokenize(text)
     
     def remove_stopwords(self, tokens):
         """
@@ -111,7 +212,7 @@ class TextProcessor:
         Returns:
             list: Lemmatized tokens
         """
-        return [self.lemmatizer.lemmatize(token) for token in tokens]
+        return self.lemma_cache.lemmatize_many(tokens, self.lemmatizer.lemmatize)
     
     def preprocess_text(self, text):
         """
@@ -137,6 +238,99 @@ class TextProcessor:
         
         return tokens
     
+    # ===================== BATCH / STREAMING =====================
+    
+    def _preprocess_fast(self, text):
+        """
+        preprocess_text() without per-call overhead (same tokens)
+        """
+        stop_words = self.stop_words
+        tokens = []
+        for word in _WHITESPACE.sub(' ', _NON_ALPHA.sub('', text.lower())).split():
+            split = _TREEBANK_SPLITS.get(word)
+            for token in (split or (word,)):
+                if token not in stop_words:
+                    tokens.append(token)
+        return self.lemma_cache.lemmatize_many(tokens, self.lemmatizer.lemmatize)
+    
+    def preprocess_stream(self, texts, workers=0, chunk_size=256, max_in_flight=None):
+        """
+        Preprocess many messages lazily, in input order
+        
+        Args:
+            texts (iterable): Raw messages (any iterable, consumed lazily)
+            workers (int): Worker processes (0 = this process)
+            chunk_size (int): Messages per worker task
+            max_in_flight (int): Chunks queued or running at once
+                (default 2 x workers), bounding memory on huge inputs
+            
+        Yields:
+            list: Processed tokens per message
+        """
+        if not workers:
+            preprocess = self._preprocess_fast
+            for text in texts:
+                yield preprocess(text)
+            return
+        
+        max_in_flight = max_in_flight or 2 * workers
+        texts = iter(texts)
+        pending = deque()
+        
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            while True:
+                while len(pending) < max_in_flight:
+                    chunk = list(islice(texts, chunk_size))
+                    if not chunk:
+                        break
+                    pending.append(pool.submit(_preprocess_chunk, chunk))
+                
+                if not pending:
+                    return
+                yield from pending.popleft().result()
+    
+    def preprocess_batch(self, texts, workers=0, chunk_size=256):
+        """
+        Preprocess a list of messages
+        
+        Args:
+            texts (list): Raw messages
+            workers (int): Worker processes (0 = this process)
+            chunk_size (int): Messages per worker task
+            
+        Returns:
+            list: Processed tokens per message
+        """
+        return list(self.preprocess_stream(texts, workers=workers, chunk_size=chunk_size))
+    
+    def extract_stress_features_batch(self, texts, workers=0):
+        """
+        Numeric stress features for many messages (columnar)
+        
+        Args:
+            texts (iterable): Raw messages
+            workers (int): Worker processes for preprocessing (0 = this process)
+            
+        Returns:
+            dict: 'high_stress_keywords', 'low_stress_keywords', 'word_count'
+                and 'sentiment_score' -> list (one value per message)
+        """
+        high, low, word_count = [], [], []
+        match_ids = self.keyword_matcher.match_ids
+        count_ids = self.keyword_matcher.count_ids
+        for tokens in self.preprocess_stream(texts, workers=workers):
+            counts = count_ids(match_ids(tokens))
+            high.append(counts['high_stress'])
+            low.append(counts['low_stress'])
+            word_count.append(len(tokens))
+        
+        return {
+            'high_stress_keywords': high,
+            'low_stress_keywords': low,
+            'word_count': word_count,
+            'sentiment_score': [l - h for h, l in zip(high, low)]
+        }
+    
     def extract_stress_features(self, text):
         """
         Extract stress-related features from text
@@ -151,18 +345,13 @@ class TextProcessor:
         tokens = self.preprocess_text(text)
         processed_text = ' '.join(tokens)
         
-        # Count stress keywords
-        high_stress_count = sum(1 for keyword in self.stress_keywords['high_stress'] 
-                               if keyword in processed_text)
-        low_stress_count = sum(1 for keyword in self.stress_keywords['low_stress'] 
-                              if keyword in processed_text)
+        # Count stress keywords (one pass, matched at token starts)
+        counts = self.keyword_matcher.count(tokens)
+        high_stress_count = counts['high_stress']
+        low_stress_count = counts['low_stress']
         
-        # SpaCy features (if available)
-        sentiment_score = 0
-        if self.nlp:
-            doc = self.nlp(text)
-            # Simple sentiment based on word polarity
-            sentiment_score = low_stress_count - high_stress_count
+        # Simple sentiment based on word polarity
+        sentiment_score = low_stress_count - high_stress_count
         
         features = {
             'high_stress_keywords': high_stress_count,
@@ -186,16 +375,168 @@ class TextProcessor:
         """
         features = self.extract_stress_features(text)
         
-        high_count = features['high_stress_keywords']
-        low_count = features['low_stress_keywords']
-        
         # Simple rule-based classification
-        if high_count >= 2 or (high_count > 0 and low_count == 0):
-            return 'high'
-        elif low_count >= 2 or (low_count > 0 and high_count == 0):
-            return 'low'
+        return classify_stress_counts(**features)
+    
+    def session(self):
+        """
+        Start an incremental feature session for a message being typed
+        
+        Returns:
+            TextSession: Session fed with TextSession.feed(delta)
+        """
+        return TextSession(self)
+
+
+class TextSession:
+    """
+    Incremental stress features for a message that is still being typed
+    
+    Text arrives in arbitrary chunks through feed(). Completed words are
+    cleaned, lemmatized and matched once, so each update costs O(delta);
+    only the unfinished last word is re-examined by features(). The result
+    always equals extract_stress_features() on the text fed so far.
+    """
+    
+    def __init__(self, processor):
+        """
+        Args:
+            processor (TextProcessor): Supplies stopwords, lemmas and keywords
+        """
+        self.processor = processor
+        self.matcher = processor.keyword_matcher
+        self.length = 0
+        self._pending = ''
+        self._tokens = []
+        self._walks = []
+        self._found = set()
+        self._counts = dict.fromkeys(self.matcher.groups, 0)
+    
+    def feed(self, delta):
+        """
+        Append typed text
+        
+        Args:
+            delta (str): New characters (any split, even mid-word)
+        """
+        self.length += len(delta)
+        words = (self._pending + delta).split()
+        
+        # The last word may continue in the next delta unless whitespace follows
+        if words and not delta[-1:].isspace():
+            self._pending = words.pop()
         else:
-            return 'medium'
+            self._pending = ''
+        
+        tokens = self._word_tokens(words)
+        if tokens:
+            self._walks = self._push(tokens, self._walks, self._found, self._counts)
+            self._tokens.extend(tokens)
+    
+    def _word_tokens(self, words):
+        # Same steps as preprocess_text, one completed word at a time
+        stop_words = self.processor.stop_words
+        tokens = []
+        for word in words:
+            word = _NON_ALPHA.sub('', word.lower())
+            if not word:
+                continue
+            for token in _TREEBANK_SPLITS.get(word) or (word,):
+                if token not in stop_words:
+                    tokens.append(token)
+        return self.processor.lemma_cache.lemmatize_many(
+            tokens, self.processor.lemmatizer.lemmatize
+        )
+    
+    def _push(self, tokens, walks, found, counts):
+        matcher = self.matcher
+        new_ids = set()
+        first = not self._tokens
+        for token in tokens:
+            chunk = token if first else ' ' + token
+            walks = matcher.advance(walks, chunk, new_ids)
+            walks += matcher.advance([matcher.start_walk()], token, new_ids)
+            first = False
+        
+        for keyword_id in new_ids - found:
+            found.add(keyword_id)
+            counts[matcher.group_of(keyword_id)] += 1
+        return walks
+    
+    def features(self):
+        """
+        Stress features of everything fed so far (unfinished word included)
+        
+        Returns:
+            dict: high_stress_keywords, low_stress_keywords, word_count,
+                sentiment_score (as extract_stress_features, without
+                processed_text)
+        """
+        counts = self._counts
+        word_count = len(self._tokens)
+        
+        tail = self._word_tokens([self._pending]) if self._pending else []
+        if tail:
+            # Tentative: match the last word without committing it
+            counts = dict(counts)
+            found = set(self._found)
+            self._push(tail, self._walks, found, counts)
+            word_count += len(tail)
+        
+        high = counts['high_stress']
+        low = counts['low_stress']
+        return {
+            'high_stress_keywords': high,
+            'low_stress_keywords': low,
+            'word_count': word_count,
+            'sentiment_score': low - high
+        }
+    
+    def processed_text(self):
+        """
+        Processed tokens joined by spaces (O(message), unlike features())
+        """
+        tail = self._word_tokens([self._pending]) if self._pending else []
+        return ' '.join(self._tokens + tail)
+    
+    def predict_stress(self):
+        """
+        Rule-based stress level, as TextProcessor.predict_stress_from_text
+        """
+        return classify_stress_counts(**self.features())
+
+
+def classify_stress_counts(high_stress_keywords, low_stress_keywords, **_):
+    """
+    Simple rule-based classification from keyword counts
+    
+    Returns:
+        str: 'low', 'medium' or 'high'
+    """
+    high_count = high_stress_keywords
+    low_count = low_stress_keywords
+    
+    if high_count >= 2 or (high_count > 0 and low_count == 0):
+        return 'high'
+    elif low_count >= 2 or (low_count > 0 and high_count == 0):
+        return 'low'
+    else:
+        return 'medium'
+
+
+# ===================== PROCESS POOL WORKERS =====================
+
+_worker_processor = None
+
+
+def _init_worker():
+    global _worker_processor
+    _worker_processor = TextProcessor(use_spacy=False)
+
+
+def _preprocess_chunk(texts):
+    preprocess = _worker_processor._preprocess_fast
+    return [preprocess(text) for text in texts]
 
 
 # Example usage
@@ -0,0 +1,155 @@
+"""
+Assessment Value Type
+This module defines Assessment, the read-only result of the disease risk
+rules. The five risk levels are packed into one small integer (2 bits per
+risk) and display names are precomputed. It reads like the old assessment
+dict (a read-only Mapping), so the rule engine, the summary and guidance
+renderers and the backend all share it without intermediate dicts.
+"""
+
+from collections.abc import Mapping
+
+
+LEVELS = ('low', 'medium', 'high')
+LEVEL_CODES = {level: code for code, level in enumerate(LEVELS)}
+
+RISK_KEYS = ('diabetes_risk', 'blood_pressure_risk', 'obesity_risk',
+             'cardiovascular_risk', 'sleep_disorder_risk')
+KEYS = RISK_KEYS + ('bmi_category', 'overall_stress')
+
+# 'Diabetes', 'Blood Pressure', ... (as printed in summaries and guidance)
+RISK_DISPLAY_NAMES = tuple(key[:-len('_risk')].replace('_', ' ').title() for key in RISK_KEYS)
+
+# 'diabetes', 'blood_pressure', ... (guidance template keys)
+RISK_NAMES = tuple(key[:-len('_risk')] for key in RISK_KEYS)
+
+BITS_PER_RISK = 2
+_RISK_INDEX = {key: i for i, key in enumerate(RISK_KEYS)}
+
+# code -> (indices of high risks, indices of medium risks), filled on demand
+# (at most 4 ** len(RISK_KEYS) entries)
+_BY_LEVEL = {}
+
+
+def pack_levels(level_codes):
+    """
+    Pack per-risk level codes (RISK_KEYS order, 0 = low .. 2 = high)
+
+    Returns:
+        int: Bitfield with BITS_PER_RISK bits per risk
+    """
+    code = 0
+    for i, level in enumerate(level_codes):
+        code |= level << (BITS_PER_RISK * i)
+    return code
+
+
+class Assessment(Mapping):
+    """
+    Risk assessment: packed risk levels, overall stress level and BMI
+    category
+
+    Hashable and equal to a dict with the same items, so it can key caches
+    and still be compared with (or passed where code expects) a plain dict.
+    Instances are shared through lookup tables and caches: treat them as
+    read-only (plain slot assignment keeps construction as cheap as a dict).
+    """
+
+    __slots__ = ('code', 'overall_stress', 'bmi_category')
+
+    def __init__(self, code, overall_stress, bmi_category):
+        """
+        Args:
+            code (int): Risk levels packed with pack_levels()
+            overall_stress (str): Stress level the risks were assessed for
+            bmi_category (str): BMI category name
+        """
+        self.code = code
+        self.overall_stress = overall_stress
+        self.bmi_category = bmi_category
+
+    @classmethod
+    def from_mapping(cls, assessment):
+        """
+        Convert an assessment dict (missing or unknown risk levels count as
+        low, as the renderers treated them); Assessments pass through
+        """
+        if isinstance(assessment, Assessment):
+            return assessment
+        code = pack_levels(LEVEL_CODES.get(assessment.get(key), 0) for key in RISK_KEYS)
+        return cls(
+            code,
+            assessment.get('overall_stress', 'medium'),
+            assessment.get('bmi_category', 'normal')
+        )
+
+    # ===================== MAPPING =====================
+
+    def __getitem__(self, key):
+        index = _RISK_INDEX.get(key)
+        if index is not None:
+            return LEVELS[(self.code >> (BITS_PER_RISK * index)) & 3]
+        if key == 'bmi_category':
+            return self.bmi_category
+        if key == 'overall_stress':
+            return self.overall_stress
+        raise KeyError(key)
+
+    def __iter__(self):
+        return iter(KEYS)
+
+    def __len__(self):
+        return len(KEYS)
+
+    def __eq__(self, other):
+        if isinstance(other, Assessment):
+            return (self.code == other.code and self.overall_stress == other.overall_stress
+                    and self.bmi_category == other.bmi_category)
+        if isinstance(other, Mapping):
+            return dict(self.items()) == dict(other.items())
+        return NotImplemented
+
+    def __hash__(self):
+        return hash((self.code, self.overall_stress, self.bmi_category))
+
+    def __repr__(self):
+        return f"Assessment({dict(self.items())!r})"
+
+    # ===================== RISK VIEWS =====================
+
+    def level_code(self, index):
+        """
+        Level code (0 = low .. 2 = high) of the risk at RISK_KEYS[index]
+        """
+        return (self.code >> (BITS_PER_RISK * index)) & 3
+
+    def _by_level(self):
+        split = _BY_LEVEL.get(self.code)
+        if split is None:
+            levels = [self.level_code(i) for i in range(len(RISK_KEYS))]
+            split = (
+                tuple(i for i, level in enumerate(levels) if level == 2),
+                tuple(i for i, level in enumerate(levels) if level == 1)
+            )
+            _BY_LEVEL[self.code] = split
+        return split
+
+    @property
+    def high_risks(self):
+        """
+        Indices (into RISK_KEYS / RISK_DISPLAY_NAMES) of high risks, in order
+        """
+        return self._by_level()[0]
+
+    @property
+    def medium_risks(self):
+        """
+        Indices (into RISK_KEYS / RISK_DISPLAY_NAMES) of medium risks, in order
+        """
+        return self._by_level()[1]
+
+    def risk_levels(self):
+        """
+        Risk name -> level for the five risks (e.g. for JSON responses)
+        """
+        return {key: LEVELS[self.level_code(i)] for i, key in enumerate(RISK_KEYS)}
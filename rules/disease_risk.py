@@ -2,28 +2,142 @@
 Rule-Based Disease Risk Assessment Module
 This module implements a rule-based system to assess the risk of lifestyle diseases
 based on stress levels, BMI, sleep patterns, and physical activity.
+The points and thresholds are data (rules/risk_rules.json), compiled once by
+rules/rule_engine.py.
 """
 
+import math
+import os
+import threading
+import time
+
+import numpy as np
+
+try:
+    from rules.assessment import RISK_DISPLAY_NAMES, Assessment
+    from rules.rule_engine import (
+        DEFAULT_RULES_PATH, RISK_KEYS, RISK_LEVELS, decode_levels, level_codes, load_rules
+    )
+except ImportError:  # running as a script from inside rules/
+    from assessment import RISK_DISPLAY_NAMES, Assessment
+    from rule_engine import (
+        DEFAULT_RULES_PATH, RISK_KEYS, RISK_LEVELS, decode_levels, level_codes, load_rules
+    )
+
 
 class DiseaseRiskAssessor:
     """
     Rule-based system for assessing disease risks based on lifestyle factors
+    
+    The points and thresholds come from a rules file (rules/risk_rules.json)
+    compiled by rules/rule_engine.py. The file is checked for changes every
+    reload_interval seconds and a new version is swapped in atomically, so
+    thresholds can be tuned without restarting workers.
     """
     
-    def __init__(self):
+    def __init__(self, precompute=True, rules_path=None, reload_interval=None):
         """
-        Initialize disease risk assessor with risk thresholds
-        """
-        # BMI categories
-        self.bmi_categories = {
-            'underweight': (0, 18.5),
-            'normal': (18.5, 25),
-            'overweight': (25, 30),
-            'obese': (30, float('inf'))
-        }
+        Initialize disease risk assessor and load the risk rules
         
+        Args:
+            precompute (bool): Build the assessment lookup table (and verify it
+                against the rules) so assessments become O(1) lookups
+            rules_path (str): Rules file (default: RISK_RULES_PATH or
+                rules/risk_rules.json)
+            reload_interval (float): Seconds between checks of the rules file
+                (default: RISK_RULES_RELOAD_SECONDS or 5; 0 disables reloads)
+        
+        Raises:
+            ValueError: If the rules file is invalid
+        """
         # Risk level mapping
-        self.risk_levels = ['low', 'medium', 'high']
+        self.risk_levels = list(RISK_LEVELS)
+        
+        self.precompute = precompute
+        self.rules_path = rules_path or os.environ.get('RISK_RULES_PATH') or DEFAULT_RULES_PATH
+        if reload_interval is None:
+            reload_interval = float(os.environ.get('RISK_RULES_RELOAD_SECONDS', 5))
+        self.reload_interval = reload_interval
+        
+        self._reload_lock = threading.Lock()
+        self._next_check = 0.0
+        self._mtime = None
+        
+        # (compiled rules, (stress, activity, bmi band, sleep band) ->
+        # (Assessment, summary), summary by Assessment), replaced as
+        # one reference so readers never see a half-built version
+        self._state = None
+        self.reload_rules()
+    
+    # ===================== RULES =====================
+    
+    @property
+    def rules(self):
+        """
+        Compiled rules currently in use (rule_engine.RuleSet)
+        """
+        return self._state[0]
+    
+    @property
+    def bmi_categories(self):
+        """
+        BMI category name -> (lower, upper) bounds
+        """
+        return {name: (low, high) for name, low, high in self.rules.bmi_ranges}
+    
+    @property
+    def bmi_category_labels(self):
+        """
+        BMI category names indexed by the codes assess_batch returns
+        """
+        return self.rules.bmi_category_labels
+    
+    def reload_rules(self):
+        """
+        Load and compile the rules file, rebuild the lookup table and swap
+        them in together; calls already running finish on the old rules
+        
+        Returns:
+            RuleSet: The rules now in use
+        
+        Raises:
+            ValueError: If the rules are invalid (the current rules are kept)
+        """
+        mtime = os.stat(self.rules_path).st_mtime_ns
+        rules = load_rules(self.rules_path)
+        
+        table, summaries = {}, {}
+        if self.precompute:
+            table, summaries = self.build_lookup_table(rules)
+            self.verify_lookup_table(rules, table)
+        
+        self._mtime = mtime
+        self._state = (rules, table, summaries)
+        return rules
+    
+    def _maybe_reload(self):
+        if not self.reload_interval:
+            return
+        now = time.monotonic()
+        # One thread checks; the others carry on with the current rules
+        if now < self._next_check or not self._reload_lock.acquire(blocking=False):
+            return
+        try:
+            self._next_check = now + self.reload_interval
+            mtime = None
+            try:
+                mtime = os.stat(self.rules_path).st_mtime_ns
+                if mtime != self._mtime:
+                    self.reload_rules()
+                    print(f"🔄 Risk rules reloaded from {self.rules_path}")
+            except Exception as e:
+                if mtime is not None:
+                    self._mtime = mtime  # Don't retry until the file changes again
+                print(f"⚠️ Keeping current risk rules ({self.rules_path}): {e}")
+        finally:
+            self._reload_lock.release()
+    
+    # ===================== SINGLE PROFILE =====================
     
     def get_bmi_category(self, bmi):
         """
@@ -31,14 +145,11 @@ class DiseaseRiskAssessor:
         
         Args:
             bmi (float): Body Mass Index value
-            
+        
         Returns:
             str: BMI category
         """
-        for category, (lower, upper) in self.bmi_categories.items():
-            if lower <= bmi < upper:
-                return category
-        return 'normal'
+        return self.rules.bmi_category(bmi)
     
     def assess_diabetes_risk(self, stress_level, bmi, physical_activity, sleep_hours):
         """
@@ -49,43 +160,11 @@ class DiseaseRiskAssessor:
             bmi (float): Body Mass Index
             physical_activity (str): Activity level
             sleep_hours (float): Average sleep hours
-            
+        
         Returns:
             str: Risk level ('low', 'medium', 'high')
         """
-        risk_score = 0
-        
-        # BMI contribution
-        if bmi >= 30:
-            risk_score += 3
-        elif bmi >= 25:
-            risk_score += 2
-        elif bmi < 18.5:
-            risk_score += 1
-        
-        # Stress contribution
-        if stress_level == 'high':
-            risk_score += 2
-        elif stress_level == 'medium':
-            risk_score += 1
-        
-        # Physical activity contribution
-        if physical_activity == 'low':
-            risk_score += 2
-        elif physical_activity == 'medium':
-            risk_score += 1
-        
-        # Sleep contribution
-        if sleep_hours < 6 or sleep_hours > 9:
-            risk_score += 1
-        
-        # Determine risk level
-        if risk_score >= 6:
-            return 'high'
-        elif risk_score >= 3:
-            return 'medium'
-        else:
-            return 'low'
+        return self.evaluate_rules(stress_level, bmi, physical_activity, sleep_hours)['diabetes_risk']
     
     def assess_blood_pressure_risk(self, stress_level, bmi, physical_activity, sleep_hours):
         """
@@ -93,42 +172,11 @@ class DiseaseRiskAssessor:
         
         Args:
             Similar to assess_diabetes_risk
-            
+        
         Returns:
             str: Risk level
         """
-        risk_score = 0
-        
-        # Stress is a major factor for BP
-        if stress_level == 'high':
-            risk_score += 3
-        elif stress_level == 'medium':
-            risk_score += 2
-        
-        # BMI contribution
-        if bmi >= 30:
-            risk_score += 2
-        elif bmi >= 25:
-            risk_score += 1
-        
-        # Physical activity
-        if physical_activity == 'low':
-            risk_score += 2
-        elif physical_activity == 'medium':
-            risk_score += 1
-        
-        # Sleep quality
-        if sleep_hours < 6:
-            risk_score += 2
-        elif sleep_hours < 7:
-            risk_score += 1
-        
-        if risk_score >= 6:
-            return 'high'
-        elif risk_score >= 3:
-            return 'medium'
-        else:
-            return 'low'
+        return self.evaluate_rules(stress_level, bmi, physical_activity, sleep_hours)['blood_pressure_risk']
     
     def assess_obesity_risk(self, bmi, physical_activity, sleep_hours, stress_level):
         """
@@ -136,42 +184,11 @@ class DiseaseRiskAssessor:
         
         Args:
             Similar to previous methods
-            
+        
         Returns:
             str: Risk level
         """
-        risk_score = 0
-        
-        # BMI is primary factor
-        if bmi >= 30:
-            return 'high'  # Already obese
-        elif bmi >= 27:
-            risk_score += 3
-        elif bmi >= 25:
-            risk_score += 2
-        
-        # Physical activity
-        if physical_activity == 'low':
-            risk_score += 2
-        elif physical_activity == 'medium':
-            risk_score += 1
-        
-        # Stress (stress eating)
-        if stress_level == 'high':
-            risk_score += 2
-        elif stress_level == 'medium':
-            risk_score += 1
-        
-        # Sleep (affects metabolism)
-        if sleep_hours < 6 or sleep_hours > 9:
-            risk_score += 1
-        
-        if risk_score >= 5:
-            return 'high'
-        elif risk_score >= 3:
-            return 'medium'
-        else:
-            return 'low'
+        return self.evaluate_rules(stress_level, bmi, physical_activity, sleep_hours)['obesity_risk']
     
     def assess_cardiovascular_risk(self, stress_level, bmi, physical_activity, sleep_hours):
         """
@@ -179,71 +196,181 @@ class DiseaseRiskAssessor:
         
         Args:
             Similar to previous methods
-            
+        
         Returns:
             str: Risk level
         """
-        risk_score = 0
-        
-        # Multiple factors contribute
-        if stress_level == 'high':
-            risk_score += 3
-        elif stress_level == 'medium':
-            risk_score += 1
-        
-        if bmi >= 30:
-            risk_score += 3
-        elif bmi >= 25:
-            risk_score += 2
-        
-        if physical_activity == 'low':
-            risk_score += 3
-        elif physical_activity == 'medium':
-            risk_score += 1
-        
-        if sleep_hours < 6:
-            risk_score += 2
-        
-        if risk_score >= 7:
-            return 'high'
-        elif risk_score >= 4:
-            return 'medium'
-        else:
-            return 'low'
+        return self.evaluate_rules(stress_level, bmi, physical_activity, sleep_hours)['cardiovascular_risk']
     
     def assess_sleep_disorder_risk(self, stress_level, sleep_hours):
         """
-        Assess sleep disorder risk
+        Assess sleep disorder risk (BMI and activity do not contribute)
         
         Args:
             stress_level (str): Stress level
             sleep_hours (float): Average sleep hours
-            
+        
         Returns:
             str: Risk level
         """
-        risk_score = 0
-        
-        # Sleep hours
-        if sleep_hours < 5:
-            risk_score += 3
-        elif sleep_hours < 6:
-            risk_score += 2
-        elif sleep_hours < 7 or sleep_hours > 9:
-            risk_score += 1
-        
-        # Stress strongly affects sleep
-        if stress_level == 'high':
-            risk_score += 3
-        elif stress_level == 'medium':
-            risk_score += 2
-        
-        if risk_score >= 4:
-            return 'high'
-        elif risk_score >= 2:
-            return 'medium'
-        else:
-            return 'low'
+        return self.evaluate_rules(stress_level, 22.0, 'medium', sleep_hours)['sleep_disorder_risk']
+    
+    def evaluate_rules(self, stress_level, bmi, physical_activity, sleep_hours):
+        """
+        Run the compiled rules (no lookup table)
+        
+        Args:
+            stress_level (str): Stress level
+            bmi (float): Body Mass Index
+            physical_activity (str): Activity level
+            sleep_hours (float): Average sleep hours
+        
+        Returns:
+            Assessment: Risk level per disease (read-only mapping)
+        """
+        return self.rules.evaluate(stress_level, bmi, physical_activity, sleep_hours)
+    
+    # ===================== LOOKUP TABLE =====================
+    
+    def build_lookup_table(self, rules):
+        """
+        Precompute the assessment and summary for every input cell
+        (3 stress levels x 3 activity levels x every BMI / sleep band the
+        rules distinguish)
+        
+        Returns:
+            tuple: (cell -> (Assessment, summary), summary by Assessment)
+        """
+        table = {}
+        summaries = {}
+        
+        bmi_points = rules.band_representatives('bmi')
+        sleep_points = rules.band_representatives('sleep_hours')
+        
+        for stress_level in self.risk_levels:
+            for physical_activity in self.risk_levels:
+                for b, bmi in bmi_points.items():
+                    for s, sleep_hours in sleep_points.items():
+                        assessment = rules.evaluate(
+                            stress_level, bmi, physical_activity, sleep_hours
+                        )
+                        summary = self._render_summary(assessment)
+                        
+                        table[(stress_level, physical_activity, b, s)] = (assessment, summary)
+                        summaries[assessment] = summary
+        
+        return table, summaries
+    
+    def verify_lookup_table(self, rules, table):
+        """
+        Check every table cell against the compiled rules, on both sides of
+        every BMI / sleep threshold
+        
+        Raises:
+            ValueError: If a cell disagrees with the rules
+        """
+        for stress_level in self.risk_levels:
+            for physical_activity in self.risk_levels:
+                for bmi in rules.boundary_points('bmi'):
+                    for sleep_hours in rules.boundary_points('sleep_hours'):
+                        expected = rules.evaluate(
+                            stress_level, bmi, physical_activity, sleep_hours
+                        )
+                        assessment, summary = table[(
+                            stress_level, physical_activity,
+                            rules.band('bmi', bmi), rules.band('sleep_hours', sleep_hours)
+                        )]
+                        if assessment != expected or summary != self._render_summary(expected):
+                            raise ValueError(
+                                f"Lookup table mismatch for stress={stress_level}, bmi={bmi}, "
+                                f"activity={physical_activity}, sleep={sleep_hours}"
+                            )
+    
+    def reachable_assessments(self):
+        """
+        Every distinct assessment the rules can produce for valid inputs
+        
+        Returns:
+            list: Assessments
+        """
+        return [assessment for assessment, _ in self._state[1].values()]
+    
+    def lookup_assessment(self, stress_level, bmi, physical_activity, sleep_hours):
+        """
+        Get the frozen assessment and its summary text
+        
+        Args:
+            Same as get_comprehensive_assessment
+        
+        Returns:
+            tuple: (Assessment, summary text)
+        """
+        self._maybe_reload()
+        rules, table, _ = self._state
+        
+        if math.isfinite(bmi) and math.isfinite(sleep_hours):
+            cell = table.get((
+                stress_level, physical_activity,
+                rules.band('bmi', bmi), rules.band('sleep_hours', sleep_hours)
+            ))
+            if cell is not None:
+                return cell
+        
+        # Outside the table (unknown levels, non-finite numbers)
+        assessment = rules.evaluate(stress_level, bmi, physical_activity, sleep_hours)
+        return assessment, self._render_summary(assessment)
+    
+    # ===================== BATCH (NUMPY) =====================
+    
+    def assess_batch(self, stress_level, bmi, physical_activity, sleep_hours):
+        """
+        Assess many profiles at once with masked NumPy arithmetic
+        
+        Same rules as evaluate_rules, row for row (including NaN and
+        out-of-range inputs).
+        
+        Args:
+            stress_level (array-like): Level strings or level_codes()
+            bmi (array-like): Body Mass Index values
+            physical_activity (array-like): Level strings or level_codes()
+            sleep_hours (array-like): Average sleep hours
+        
+        Returns:
+            dict: RISK_KEYS -> int8 risk codes (index into RISK_LEVELS) and
+                'bmi_category' -> int8 codes (index into bmi_category_labels)
+        """
+        self._maybe_reload()
+        return self.rules.evaluate_batch(stress_level, bmi, physical_activity, sleep_hours)
+    
+    def verify_batch(self):
+        """
+        Check assess_batch against the compiled rules on both sides of every
+        threshold, plus NaN / negative / infinite inputs and unknown levels
+        
+        Raises:
+            ValueError: If a row disagrees with the rules
+        """
+        rules = self.rules
+        odd = [-1.0, float('nan'), float('inf')]
+        levels = self.risk_levels + ['unknown']
+        
+        rows = [
+            (stress_level, bmi, physical_activity, sleep_hours)
+            for stress_level in levels
+            for physical_activity in levels
+            for bmi in rules.boundary_points('bmi') + odd
+            for sleep_hours in rules.boundary_points('sleep_hours') + odd
+        ]
+        stress, bmi, activity, sleep = (np.array(column) for column in zip(*rows))
+        batch = rules.evaluate_batch(stress, bmi, activity, sleep)
+        
+        for i, row in enumerate(rows):
+            expected = rules.evaluate(*row)
+            for key in RISK_KEYS:
+                if RISK_LEVELS[batch[key][i]] != expected[key]:
+                    raise ValueError(f"assess_batch mismatch for {key} at {row}")
+            if rules.bmi_category_labels[batch['bmi_category'][i]] != expected['bmi_category']:
+                raise ValueError(f"assess_batch mismatch for bmi_category at {row}")
     
     def get_comprehensive_assessment(self, stress_level, bmi, physical_activity, sleep_hours):
         """
@@ -256,28 +383,10 @@ class DiseaseRiskAssessor:
             sleep_hours (float): Average sleep hours
             
         Returns:
-            dict: Dictionary of risk assessments for each disease
-        """
-        assessment = {
-            'diabetes_risk': self.assess_diabetes_risk(
-                stress_level, bmi, physical_activity, sleep_hours
-            ),
-            'blood_pressure_risk': self.assess_blood_pressure_risk(
-                stress_level, bmi, physical_activity, sleep_hours
-            ),
-            'obesity_risk': self.assess_obesity_risk(
-                bmi, physical_activity, sleep_hours, stress_level
-            ),
-            'cardiovascular_risk': self.assess_cardiovascular_risk(
-                stress_level, bmi, physical_activity, sleep_hours
-            ),
-            'sleep_disorder_risk': self.assess_sleep_disorder_risk(
-                stress_level, sleep_hours
-            ),
-            'bmi_category': self.get_bmi_category(bmi),
-            'overall_stress': stress_level
-        }
-        
+            Assessment: Risk level per disease (read-only mapping; dict()
+                it for a mutable copy)
+        """
+        assessment, _ = self.lookup_assessment(stress_level, bmi, physical_activity, sleep_hours)
         return assessment
     
     def get_risk_summary(self, assessment):
@@ -285,18 +394,20 @@ class DiseaseRiskAssessor:
         Generate a text summary of risk assessment
         
         Args:
-            assessment (dict): Risk assessment dictionary
+            assessment (Assessment): Risk assessment (or an equivalent dict)
             
         Returns:
             str: Human-readable summary
         """
-        high_risks = [k.replace('_risk', '').replace('_', ' ').title() 
-                      for k, v in assessment.items() 
-                      if k.endswith('_risk') and v == 'high']
-        
-        medium_risks = [k.replace('_risk', '').replace('_', ' ').title() 
-                        for k, v in assessment.items() 
-                        if k.endswith('_risk') and v == 'medium']
+        assessment = Assessment.from_mapping(assessment)
+        summary = self._state[2].get(assessment)
+        if summary is None:
+            summary = self._render_summary(assessment)
+        return summary
+    
+    def _render_summary(self, assessment):
+        high_risks = [RISK_DISPLAY_NAMES[i] for i in assessment.high_risks]
+        medium_risks = [RISK_DISPLAY_NAMES[i] for i in assessment.medium_risks]
         
         summary = "\n🏥 HEALTH RISK ASSESSMENT SUMMARY\n"
         summary += "=" * 50 + "\n\n"
@@ -316,8 +427,8 @@ class DiseaseRiskAssessor:
         if not high_risks and not medium_risks:
             summary += "✅ Good news! All risk levels are LOW.\n\n"
         
-        summary += f"📊 BMI Category: {assessment['bmi_category'].title()}\n"
-        summary += f"🧠 Stress Level: {assessment['overall_stress'].title()}\n"
+        summary += f"📊 BMI Category: {assessment.bmi_category.title()}\n"
+        summary += f"🧠 Stress Level: {assessment.overall_stress.title()}\n"
         
         return summary
 
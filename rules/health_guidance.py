@@ -4,16 +4,35 @@ This module generates personalized preventive health guidance
 based on risk assessment results.
 """
 
+import json
+import threading
+from collections import OrderedDict
+
+try:
+    from rules.assessment import RISK_DISPLAY_NAMES, RISK_NAMES, Assessment
+except ImportError:  # running as a script from inside rules/
+    from assessment import RISK_DISPLAY_NAMES, RISK_NAMES, Assessment
+
 
 class HealthGuidanceGenerator:
     """
     Generate personalized health guidance based on risk factors
     """
     
-    def __init__(self):
+    def __init__(self, cache_size=1024):
         """
         Initialize health guidance generator with recommendation templates
+        
+        Args:
+            cache_size (int): Maximum number of rendered guidance texts kept
         """
+        # Canonical assessment key -> (guidance text, sections, JSON-encoded sections)
+        self.cache_size = cache_size
+        self._cache = OrderedDict()
+        self._cache_lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        
         self.stress_management_tips = {
             'high': [
                 "Practice deep breathing exercises for 10 minutes daily",
@@ -194,16 +213,123 @@ class HealthGuidanceGenerator:
         disease_key = disease.lower().replace(' ', '_').replace('_risk', '')
         return self.disease_specific_guidance.get(disease_key, {}).get(risk_level, [])
     
+    # ===================== RENDERED GUIDANCE CACHE =====================
+    
+    def guidance_key(self, risk_assessment):
+        """
+        Canonical key of everything the comprehensive guidance depends on:
+        the overall stress level and the packed risk levels
+        
+        Args:
+            risk_assessment (Assessment): Risk assessment (or an equivalent dict)
+            
+        Returns:
+            tuple: Hashable cache key
+        """
+        risk_assessment = Assessment.from_mapping(risk_assessment)
+        return (risk_assessment.overall_stress, risk_assessment.code)
+    
+    def _cached_guidance(self, risk_assessment, count=True):
+        risk_assessment = Assessment.from_mapping(risk_assessment)
+        key = self.guidance_key(risk_assessment)
+        
+        with self._cache_lock:
+            entry = self._cache.get(key)
+            if entry is not None:
+                self._cache.move_to_end(key)
+                self._hits += count
+                return entry
+            self._misses += count
+        
+        sections = tuple(self._render_sections(risk_assessment))
+        text = ''.join(sections)
+        entry = (
+            text,
+            sections,
+            tuple(json.dumps(section, ensure_ascii=False).encode('utf-8') for section in sections)
+        )
+        
+        with self._cache_lock:
+            self._cache[key] = entry
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+        
+        return entry
+    
+    def prewarm(self, assessments):
+        """
+        Render and cache guidance for every given assessment
+        
+        Args:
+            assessments (iterable): Risk assessments, e.g.
+                DiseaseRiskAssessor.reachable_assessments()
+                
+        Returns:
+            int: Number of cached guidance texts
+        """
+        # Not counted: cache_info() describes request traffic
+        for assessment in assessments:
+            self._cached_guidance(assessment, count=False)
+        return len(self._cache)
+    
+    def cache_info(self):
+        """
+        Get guidance cache statistics
+        
+        Returns:
+            dict: Hits and misses since startup (prewarm() not counted),
+                current size and maximum size
+        """
+        with self._cache_lock:
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'size': len(self._cache),
+                'max_size': self.cache_size
+            }
+    
     def generate_comprehensive_guidance(self, risk_assessment):
         """
         Generate comprehensive health guidance based on all risk factors
         
         Args:
-            risk_assessment (dict): Dictionary of risk assessments
+            risk_assessment (Assessment): Risk assessment (or an equivalent dict)
             
         Returns:
             str: Formatted guidance text
         """
+        return self._cached_guidance(risk_assessment)[0]
+    
+    def get_guidance_sections(self, risk_assessment):
+        """
+        Comprehensive guidance split into its sections (disclaimer, stress
+        management, high priority, preventive care, wellness, action items,
+        closing); joined they give generate_comprehensive_guidance
+        
+        Args:
+            risk_assessment (Assessment): Risk assessment (or an equivalent dict)
+            
+        Returns:
+            tuple: Section texts
+        """
+        return self._cached_guidance(risk_assessment)[1]
+    
+    def get_guidance_sections_json(self, risk_assessment):
+        """
+        Same as get_guidance_sections, each section pre-encoded as a UTF-8
+        JSON string literal for streaming responses
+        
+        Args:
+            risk_assessment (Assessment): Risk assessment (or an equivalent dict)
+            
+        Returns:
+            tuple: Encoded section buffers (shared, do not modify)
+        """
+        return self._cached_guidance(risk_assessment)[2]
+    
+    def _render_sections(self, risk_assessment):
+        sections = []
+        
         guidance = "\n" + "="*60 + "\n"
         guidance += "🌟 PERSONALIZED HEALTH GUIDANCE\n"
         guidance += "="*60 + "\n\n"
@@ -216,46 +342,46 @@ class HealthGuidanceGenerator:
         guidance += "Please consult healthcare professionals for proper diagnosis\n"
         guidance += "and treatment of any health conditions.\n"
         guidance += "-" * 60 + "\n\n"
+        sections.append(guidance)
         
         # Stress management
-        stress_level = risk_assessment.get('overall_stress', 'medium')
-        guidance += "🧠 STRESS MANAGEMENT RECOMMENDATIONS:\n"
+        stress_level = risk_assessment.overall_stress
+        guidance = "🧠 STRESS MANAGEMENT RECOMMENDATIONS:\n"
         guidance += "-" * 60 + "\n"
         stress_tips = self.generate_stress_guidance(stress_level)
         for i, tip in enumerate(stress_tips[:5], 1):
             guidance += f"{i}. {tip}\n"
         guidance += "\n"
+        sections.append(guidance)
         
         # Disease-specific guidance for high and medium risks
-        high_risk_diseases = [k for k, v in risk_assessment.items() 
-                             if k.endswith('_risk') and v == 'high']
-        medium_risk_diseases = [k for k, v in risk_assessment.items() 
-                               if k.endswith('_risk') and v == 'medium']
+        high_risk_diseases = risk_assessment.high_risks
+        medium_risk_diseases = risk_assessment.medium_risks
         
         if high_risk_diseases:
-            guidance += "🚨 HIGH PRIORITY RECOMMENDATIONS:\n"
+            guidance = "🚨 HIGH PRIORITY RECOMMENDATIONS:\n"
             guidance += "-" * 60 + "\n"
-            for disease in high_risk_diseases:
-                disease_name = disease.replace('_risk', '').replace('_', ' ').title()
-                guidance += f"\n📍 {disease_name}:\n"
-                recommendations = self.generate_disease_guidance(disease, 'high')
+            for i in high_risk_diseases:
+                guidance += f"\n📍 {RISK_DISPLAY_NAMES[i]}:\n"
+                recommendations = self.disease_specific_guidance.get(RISK_NAMES[i], {}).get('high', [])
                 for i, rec in enumerate(recommendations[:5], 1):
                     guidance += f"   {i}. {rec}\n"
             guidance += "\n"
+            sections.append(guidance)
         
         if medium_risk_diseases:
-            guidance += "⚡ PREVENTIVE CARE RECOMMENDATIONS:\n"
+            guidance = "⚡ PREVENTIVE CARE RECOMMENDATIONS:\n"
             guidance += "-" * 60 + "\n"
-            for disease in medium_risk_diseases:
-                disease_name = disease.replace('_risk', '').replace('_', ' ').title()
-                guidance += f"\n📍 {disease_name}:\n"
-                recommendations = self.generate_disease_guidance(disease, 'medium')
+            for i in medium_risk_diseases:
+                guidance += f"\n📍 {RISK_DISPLAY_NAMES[i]}:\n"
+                recommendations = self.disease_specific_guidance.get(RISK_NAMES[i], {}).get('medium', [])
                 for i, rec in enumerate(recommendations[:4], 1):
                     guidance += f"   {i}. {rec}\n"
             guidance += "\n"
+            sections.append(guidance)
         
         # General wellness tips
-        guidance += "💪 GENERAL WELLNESS TIPS:\n"
+        guidance = "💪 GENERAL WELLNESS TIPS:\n"
         guidance += "-" * 60 + "\n"
         guidance += "1. Drink 8-10 glasses of water daily\n"
         guidance += "2. Eat a balanced diet with fruits and vegetables\n"
@@ -265,9 +391,10 @@ class HealthGuidanceGenerator:
         guidance += "6. Schedule regular health check-ups\n"
         guidance += "7. Avoid smoking and limit alcohol\n"
         guidance += "8. Maintain social connections\n\n"
+        sections.append(guidance)
         
         # Action items
-        guidance += "✅ IMMEDIATE ACTION ITEMS:\n"
+        guidance = "✅ IMMEDIATE ACTION ITEMS:\n"
         guidance += "-" * 60 + "\n"
         if high_risk_diseases:
             guidance += "• Schedule appointment with healthcare provider\n"
@@ -275,20 +402,22 @@ class HealthGuidanceGenerator:
         guidance += "• Begin implementing one new healthy habit this week\n"
         guidance += "• Set achievable short-term health goals\n"
         guidance += "• Create a support system for lifestyle changes\n\n"
+        sections.append(guidance)
         
-        guidance += "="*60 + "\n"
+        guidance = "="*60 + "\n"
         guidance += "Remember: Small, consistent changes lead to big results!\n"
         guidance += "Take it one step at a time. 🌱\n"
         guidance += "="*60 + "\n"
+        sections.append(guidance)
         
-        return guidance
+        return sections
     
     def generate_quick_tips(self, risk_assessment):
         """
         Generate quick, actionable tips based on top priorities
         
         Args:
-            risk_assessment (dict): Dictionary of risk assessments
+            risk_assessment (Assessment): Risk assessment (or an equivalent dict)
             
         Returns:
             list: List of quick tips (3-5 items)
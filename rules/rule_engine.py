@@ -0,0 +1,366 @@
+"""
+Rule Engine Module
+This module loads the declarative disease risk rules (rules/risk_rules.json)
+and compiles them once into a generated Python function for single profiles
+and NumPy masks for whole columns, so the points and thresholds live in data
+while evaluation stays a single fast path.
+"""
+
+import json
+import math
+import os
+from bisect import bisect_left, bisect_right
+
+import numpy as np
+
+try:
+    from rules.assessment import BITS_PER_RISK, LEVEL_CODES, LEVELS, RISK_KEYS, Assessment
+except ImportError:  # running as a script from inside rules/
+    from assessment import BITS_PER_RISK, LEVEL_CODES, LEVELS, RISK_KEYS, Assessment
+
+
+DEFAULT_RULES_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'risk_rules.json')
+
+# Compact codes used by the batch evaluator (index = code)
+RISK_LEVELS = np.array(LEVELS, dtype=object)
+
+NUMERIC_INPUTS = ('bmi', 'sleep_hours')
+LEVEL_INPUTS = ('stress_level', 'physical_activity')
+
+# Operators allowed on numeric inputs; the value lands in the upper band for
+# '<' / '>=' and in the lower band for '<=' / '>'
+NUMERIC_OPS = {'<': 0, '>=': 0, '<=': 1, '>': 1}
+
+
+def level_codes(values):
+    """
+    Encode low / medium / high as 0 / 1 / 2 (int8); anything else is -1,
+    which every rule scores like an unrecognised string
+
+    Args:
+        values (array-like): Level strings, or integer codes (passed through)
+
+    Returns:
+        ndarray: int8 codes
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in 'iu':
+        return values.astype(np.int8, copy=False)
+
+    codes = np.full(values.shape, -1, dtype=np.int8)
+    for level, code in LEVEL_CODES.items():
+        codes[values == level] = code
+    return codes
+
+
+def decode_levels(codes, labels=RISK_LEVELS):
+    """
+    Turn int8 codes from the batch evaluator back into strings
+    """
+    return labels[codes]
+
+
+def _number(value, where):
+    if isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+        raise ValueError(f"{where}: expected a finite number, got {value!r}")
+    return float(value)
+
+
+def _parse_condition(input_name, condition, where):
+    """
+    Normalize one condition into OR-ed (op, value) terms
+    """
+    if not isinstance(condition, list) or len(condition) < 2 or not isinstance(condition[0], str):
+        raise ValueError(f"{where}: expected [op, value, ...], got {condition!r}")
+    op, value = condition[0], condition[1]
+
+    if input_name in LEVEL_INPUTS:
+        if op != '==' or value not in LEVEL_CODES:
+            raise ValueError(f"{where}: {input_name} only supports ['==', level]")
+        return ((op, value),)
+
+    if op == 'outside':
+        low, high = (_number(v, where) for v in value)
+        return (('<', low), ('>', high))
+    if op not in NUMERIC_OPS:
+        raise ValueError(f"{where}: unknown operator {op!r}")
+    return ((op, _number(value, where)),)
+
+
+class RuleSet:
+    """
+    One compiled version of the rules file (immutable once built)
+    """
+
+    def __init__(self, spec, source=None):
+        """
+        Validate and compile a rules document
+
+        Args:
+            spec (dict): Parsed rules (see rules/risk_rules.json)
+            source (str): Where the rules came from (for messages)
+
+        Raises:
+            ValueError: If the rules are malformed
+        """
+        self.source = source
+        self.version = spec.get('version')
+
+        risks = spec.get('risks', {})
+        if tuple(risks) != RISK_KEYS:
+            raise ValueError(f"Rules must define {', '.join(RISK_KEYS)} in that order")
+
+        # risk -> (overrides, factors, (medium, high)); a factor is
+        # (input, [(terms, points), ...]) evaluated as an if / elif chain
+        self.risks = {}
+        for key, risk in risks.items():
+            overrides = []
+            for i, override in enumerate(risk.get('overrides', [])):
+                where = f"{key}.overrides[{i}]"
+                if override['input'] not in NUMERIC_INPUTS + LEVEL_INPUTS:
+                    raise ValueError(f"{where}: unknown input {override['input']!r}")
+                if override['level'] not in LEVEL_CODES:
+                    raise ValueError(f"{where}: unknown level {override['level']!r}")
+                terms = _parse_condition(override['input'], override['when'], where)
+                overrides.append((override['input'], terms, override['level']))
+
+            factors = []
+            for i, factor in enumerate(risk['factors']):
+                input_name = factor['input']
+                if input_name not in NUMERIC_INPUTS + LEVEL_INPUTS:
+                    raise ValueError(f"{key}.factors[{i}]: unknown input {input_name!r}")
+                chain = []
+                for j, condition in enumerate(factor['points']):
+                    where = f"{key}.factors[{i}].points[{j}]"
+                    terms = _parse_condition(input_name, condition, where)
+                    points = condition[2] if len(condition) > 2 else None
+                    if isinstance(points, bool) or not isinstance(points, int):
+                        raise ValueError(f"{where}: points must be an integer")
+                    chain.append((terms, points))
+                factors.append((input_name, chain))
+
+            thresholds = risk['thresholds']
+            medium = _number(thresholds['medium'], f"{key}.thresholds.medium")
+            high = _number(thresholds['high'], f"{key}.thresholds.high")
+            if not medium <= high:
+                raise ValueError(f"{key}: medium threshold is above high")
+            self.risks[key] = (overrides, factors, (medium, high))
+
+        categories = spec['bmi_categories']
+        self.bmi_ranges = []
+        for name, low, high in categories['ranges']:
+            low = _number(low, f"bmi_categories.{name}")
+            high = float('inf') if high is None else _number(high, f"bmi_categories.{name}")
+            self.bmi_ranges.append((str(name), low, high))
+        self.bmi_default = str(categories['default'])
+
+        names = [name for name, _, _ in self.bmi_ranges]
+        if self.bmi_default not in names:
+            names.append(self.bmi_default)
+        self.bmi_category_labels = np.array(names, dtype=object)
+
+        self._build_bands()
+        self.evaluate = self._compile_function()
+
+    # ===================== SINGLE PROFILE =====================
+
+    def _compile_function(self):
+        """
+        Generate straight-line Python for the rules (one if / elif chain per
+        factor, as the hand-written rules were) and compile it once; the
+        function returns an Assessment with the levels already packed
+
+        Only validated input names and repr() literals reach the source, so
+        editing the rules file cannot inject code
+        """
+        def test(input_name, terms):
+            return ' or '.join(f"{input_name} {op} {value!r}" for op, value in terms)
+
+        lines = ["def evaluate(stress_level, bmi, physical_activity, sleep_hours):"]
+        for key, (overrides, factors, (medium, high)) in self.risks.items():
+            indent = '    '
+            for n, (input_name, terms, level) in enumerate(overrides):
+                keyword = 'if' if n == 0 else 'elif'
+                lines.append(f"{indent}{keyword} {test(input_name, terms)}:")
+                lines.append(f"{indent}    {key} = {LEVEL_CODES[level]!r}")
+            if overrides:
+                lines.append(f"{indent}else:")
+                indent += '    '
+
+            lines.append(f"{indent}score = 0")
+            for input_name, chain in factors:
+                for n, (terms, points) in enumerate(chain):
+                    keyword = 'if' if n == 0 else 'elif'
+                    lines.append(f"{indent}{keyword} {test(input_name, terms)}:")
+                    lines.append(f"{indent}    score += {points!r}")
+            lines.append(
+                f"{indent}{key} = 2 if score >= {high!r} else 1 if score >= {medium!r} else 0"
+            )
+
+        for n, (name, low, high) in enumerate(self.bmi_ranges):
+            keyword = 'if' if n == 0 else 'elif'
+            lines.append(f"    {keyword} {low!r} <= bmi < {high!r}:")
+            lines.append(f"        bmi_category = {name!r}")
+        lines.append("    else:")
+        lines.append(f"        bmi_category = {self.bmi_default!r}")
+
+        code = ' | '.join(
+            f"{key} << {BITS_PER_RISK * i}" if i else key for i, key in enumerate(self.risks)
+        )
+        lines.append(f"    return Assessment({code}, stress_level, bmi_category)")
+
+        self.generated_source = '\n'.join(lines) + '\n'
+        namespace = {'inf': float('inf'), 'Assessment': Assessment}
+        exec(compile(self.generated_source, f"<risk rules {self.source or ''}>", 'exec'), namespace)
+        return namespace['evaluate']
+
+    def bmi_category(self, bmi):
+        """
+        BMI category name
+        """
+        for name, low, high in self.bmi_ranges:
+            if low <= bmi < high:
+                return name
+        return self.bmi_default
+
+    # ===================== BANDS =====================
+
+    def _build_bands(self):
+        # Every numeric threshold the rules use; values between two
+        # neighbouring thresholds always get the same assessment
+        self._cuts = {}
+        for input_name in NUMERIC_INPUTS:
+            cuts = ([], [])
+            terms = [term for overrides, factors, _ in self.risks.values()
+                     for name, condition, _ in overrides if name == input_name
+                     for term in condition]
+            terms += [term for overrides, factors, _ in self.risks.values()
+                      for name, chain in factors if name == input_name
+                      for condition, _ in chain for term in condition]
+            if input_name == 'bmi':
+                for _, low, high in self.bmi_ranges:
+                    terms.append(('>=', low))
+                    if math.isfinite(high):
+                        terms.append(('<', high))
+            for op, value in terms:
+                cuts[NUMERIC_OPS[op]].append(value)
+            self._cuts[input_name] = tuple(tuple(sorted(set(side))) for side in cuts)
+
+    def band(self, input_name, value):
+        """
+        Index of the band a finite numeric input falls in
+        """
+        upper_side, lower_side = self._cuts[input_name]
+        return bisect_right(upper_side, value) + bisect_left(lower_side, value)
+
+    def boundary_points(self, input_name):
+        """
+        Both sides of every threshold on an input, plus one point beyond
+        the lowest and highest threshold (sorted)
+        """
+        values = sorted(set(self._cuts[input_name][0] + self._cuts[input_name][1]))
+        if not values:
+            return [0.0]
+        points = {values[0] - 1.0, values[-1] + 1.0}
+        for value in values:
+            points.update((math.nextafter(value, -math.inf), value,
+                           math.nextafter(value, math.inf)))
+        return sorted(points)
+
+    def band_representatives(self, input_name):
+        """
+        One value per band
+
+        Returns:
+            dict: Band index -> value in that band
+        """
+        representatives = {}
+        for point in self.boundary_points(input_name):
+            representatives.setdefault(self.band(input_name, point), point)
+        return representatives
+
+    # ===================== BATCH =====================
+
+    def evaluate_batch(self, stress_level, bmi, physical_activity, sleep_hours):
+        """
+        Evaluate the rules over whole columns with NumPy masks
+
+        Returns:
+            dict: RISK_KEYS -> int8 codes (index into RISK_LEVELS) and
+                'bmi_category' -> int8 codes (index into bmi_category_labels)
+        """
+        inputs = {
+            'stress_level': level_codes(stress_level),
+            'physical_activity': level_codes(physical_activity),
+            'bmi': np.asarray(bmi, dtype=np.float64),
+            'sleep_hours': np.asarray(sleep_hours, dtype=np.float64)
+        }
+        shape = inputs['bmi'].shape
+
+        masks = {}
+
+        def mask(input_name, terms):
+            result = None
+            for op, value in terms:
+                key = (input_name, op, value)
+                term = masks.get(key)
+                if term is None:
+                    x = inputs[input_name]
+                    if op == '==':
+                        term = x == LEVEL_CODES[value]
+                    elif op == '<':
+                        term = x < value
+                    elif op == '<=':
+                        term = x <= value
+                    elif op == '>':
+                        term = x > value
+                    else:
+                        term = x >= value
+                    masks[key] = term
+                result = term if result is None else result | term
+            return result
+
+        codes = {}
+        for key, (overrides, factors, (medium, high)) in self.risks.items():
+            score = np.zeros(shape, dtype=np.int16)
+            for input_name, chain in factors:
+                taken = np.zeros(shape, dtype=bool)
+                for terms, points in chain:
+                    # elif: only rows no earlier branch of this factor took
+                    hit = mask(input_name, terms) & ~taken
+                    score += hit * np.int16(points)
+                    taken |= hit
+            risk = (score >= medium).astype(np.int8) + (score >= high)
+
+            # First matching override wins, so apply them last to first
+            for input_name, terms, level in reversed(overrides):
+                risk[mask(input_name, terms)] = LEVEL_CODES[level]
+            codes[key] = risk
+
+        x = inputs['bmi']
+        labels = list(self.bmi_category_labels)
+        category = np.full(shape, labels.index(self.bmi_default), dtype=np.int8)
+        assigned = np.zeros(shape, dtype=bool)
+        for name, low, high in self.bmi_ranges:
+            hit = (x >= low) & (x < high) & ~assigned
+            category[hit] = labels.index(name)
+            assigned |= hit
+        codes['bmi_category'] = category
+
+        return codes
+
+
+def load_rules(path=None):
+    """
+    Read and compile a rules file
+
+    Args:
+        path (str): JSON rules file (default: rules/risk_rules.json)
+
+    Returns:
+        RuleSet: Compiled rules
+    """
+    path = path or DEFAULT_RULES_PATH
+    with open(path, 'r', encoding='utf-8') as f:
+        spec = json.load(f)
+    return RuleSet(spec, source=path)
@@ -0,0 +1,388 @@
+"""
+Cohort Scoring Script
+This script scores a whole file of lifestyle profiles (CSV or Parquet, shaped
+like data/lifestyle_dataset.csv) with the stress model and the disease risk
+rules, streaming it in chunks so memory stays bounded whatever the input size.
+
+Usage:
+    python score_cohort.py data/lifestyle_dataset.csv outputs/cohort_scores.csv
+    python score_cohort.py big.parquet scores.parquet --workers 4 --chunk-size 50000
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+# Ensure we can import from parent directory
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from chatbot.health_bot import HealthChatbot
+from nlp.features import ACTIVITY_MAPPING, FEATURE_COLUMNS
+from rules.disease_risk import RISK_LEVELS, decode_levels
+
+
+RISK_COLUMNS = [
+    'diabetes_risk', 'blood_pressure_risk', 'obesity_risk',
+    'cardiovascular_risk', 'sleep_disorder_risk', 'bmi_category'
+]
+
+# Command-line defaults for inputs lifestyle_dataset.csv does not record
+DEFAULT_WORK_HOURS = 8.0
+DEFAULT_SOCIAL_INTERACTION = 'medium'
+
+# Set in each worker process (or in this process when workers=0)
+_scorer = None
+
+
+class CohortScorer:
+    """
+    Scores one chunk of profiles: stress (model or input column), disease
+    risks and optionally the rule-based text stress level
+    """
+
+    def __init__(self, model_type='logistic', compiled=False, stress_from_column=False,
+                 work_hours=None, social_interaction=None, text_column=None, keep=()):
+        """
+        Args:
+            model_type (str): 'logistic', 'decision_tree' or 'random_forest'
+            compiled (bool): Use the NumPy-only predictor from the model bundle
+            stress_from_column (bool): Take stress from the input stress_level
+                column instead of predicting it
+            work_hours (float): Used where the input has no work_hours
+            social_interaction (str): Used where the input has no
+                social_interaction
+            text_column (str): Free-text column to score with the keyword rules
+            keep (tuple): Input columns copied to the output (e.g. user_id)
+        """
+        self.stress_from_column = stress_from_column
+        self.work_hours = work_hours
+        self.social_interaction = social_interaction
+        self.text_column = text_column
+        self.keep = list(keep)
+        self.chatbot = HealthChatbot(model_type=model_type, compiled=compiled)
+
+    def load(self):
+        """
+        Load the components this job needs
+        """
+        components = ['risk_assessor']
+        if not self.stress_from_column:
+            components.append('stress_predictor')
+        if self.text_column:
+            components.append('text_processor')
+        self.chatbot.prewarm(components)
+        self.chatbot.risk_assessor.verify_batch()
+
+    def _profiles(self, df):
+        profiles = {}
+        for column, default in (('work_hours', self.work_hours),
+                                ('social_interaction', self.social_interaction)):
+            if column in df:
+                values = df[column]
+                if default is not None:
+                    values = values.fillna(default)
+            elif default is not None:
+                values = pd.Series(default, index=df.index)
+            else:
+                raise ValueError(f"Input has no '{column}' column; pass a default for it")
+            profiles[column] = values
+
+        profiles['sleep_hours'] = pd.to_numeric(df['sleep_hours'], errors='coerce')
+        profiles['physical_activity'] = df['physical_activity']
+
+        for column in ('physical_activity', 'social_interaction'):
+            profiles[column] = profiles[column].astype(str).str.strip().str.lower()
+        profiles['work_hours'] = pd.to_numeric(profiles['work_hours'], errors='coerce')
+
+        return {column: profiles[column].to_numpy() for column in FEATURE_COLUMNS}
+
+    def _stress_levels(self, df):
+        stress = np.full(len(df), '', dtype=object)
+
+        if self.stress_from_column:
+            levels = df['stress_level'].astype(str).str.strip().str.lower().to_numpy(dtype=object)
+            valid = np.isin(levels, list(ACTIVITY_MAPPING))
+            stress[valid] = levels[valid]
+            return stress
+
+        profiles = self._profiles(df)
+        # Rows the model cannot encode are left unscored instead of failing the job
+        valid = (np.isfinite(profiles['sleep_hours'])
+                 & np.isfinite(profiles['work_hours'])
+                 & np.isin(profiles['physical_activity'], list(ACTIVITY_MAPPING))
+                 & np.isin(profiles['social_interaction'], list(ACTIVITY_MAPPING)))
+        if valid.any():
+            stress[valid] = self.chatbot.predict_stress_batch(
+                {column: values[valid] for column, values in profiles.items()}
+            )
+        return stress
+
+    def score(self, df):
+        """
+        Score one chunk
+
+        Args:
+            df (DataFrame): Input rows
+
+        Returns:
+            DataFrame: keep columns, stress_level, RISK_COLUMNS (if the
+                input has bmi) and, with a text column, text_stress_level
+                (empty strings where a row could not be scored)
+        """
+        out = pd.DataFrame({column: df[column].to_numpy() for column in self.keep})
+
+        stress = self._stress_levels(df)
+        out['stress_level'] = stress
+
+        if 'bmi' in df:
+            for column, values in self.score_risks(df, stress).items():
+                out[column] = values
+
+        if self.text_column:
+            out['text_stress_level'] = self.score_text(df[self.text_column])
+
+        return out
+
+    def score_risks(self, df, stress):
+        """
+        Disease risks per row (vectorized rules, see assess_batch)
+
+        Returns:
+            dict: RISK_COLUMNS -> array (empty strings for unscored rows)
+        """
+        bmi = pd.to_numeric(df['bmi'], errors='coerce').to_numpy(dtype=np.float64)
+        sleep = pd.to_numeric(df['sleep_hours'], errors='coerce').to_numpy(dtype=np.float64)
+        activity = df['physical_activity'].astype(str).str.strip().str.lower().to_numpy(dtype=object)
+
+        assessor = self.chatbot.risk_assessor
+        codes = assessor.assess_batch(stress, bmi, activity, sleep)
+        valid = (stress != '') & np.isfinite(bmi) & np.isfinite(sleep)
+
+        risks = {}
+        for column in RISK_COLUMNS:
+            labels = assessor.bmi_category_labels if column == 'bmi_category' else RISK_LEVELS
+            values = decode_levels(codes[column], labels)
+            values[~valid] = ''
+            risks[column] = values
+        return risks
+
+    def score_text(self, texts):
+        """
+        Rule-based stress level per message (one batched preprocessing pass)
+        """
+        from nlp.text_processor import classify_stress_counts
+
+        features = self.chatbot.text_processor.extract_stress_features_batch(
+            texts.fillna('').astype(str).tolist()
+        )
+        return [
+            classify_stress_counts(high, low) for high, low in
+            zip(features['high_stress_keywords'], features['low_stress_keywords'])
+        ]
+
+
+def _init_worker(options):
+    global _scorer
+    _scorer = CohortScorer(**options)
+    _scorer.load()
+
+
+def _score_chunk(df):
+    return _scorer.score(df)
+
+
+# ===================== INPUT / OUTPUT =====================
+
+def _import_pyarrow():
+    """
+    pyarrow is optional (Parquet only); fail with an actionable message
+
+    Raises:
+        ImportError: If pyarrow is not installed
+    """
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "Parquet files need pyarrow (pip install pyarrow); CSV works without it"
+        ) from None
+    return pyarrow
+
+
+def read_chunks(path, chunk_size):
+    """
+    Stream a CSV or Parquet file as DataFrames of at most chunk_size rows
+    """
+    if path.endswith('.parquet'):
+        pq = _import_pyarrow().parquet
+
+        for batch in pq.ParquetFile(path).iter_batches(batch_size=chunk_size):
+            yield batch.to_pandas()
+    else:
+        yield from pd.read_csv(path, chunksize=chunk_size)
+
+
+class ChunkWriter:
+    """
+    Appends scored chunks to a CSV or Parquet file as they complete
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.parquet = path.endswith('.parquet')
+        self._writer = None
+        self._header = True
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        if not self.parquet and os.path.exists(path):
+            os.remove(path)
+
+    def write(self, df):
+        if self.parquet:
+            pa = _import_pyarrow()
+            pq = pa.parquet
+
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            if self._writer is None:
+                self._writer = pq.ParquetWriter(self.path, table.schema)
+            self._writer.write_table(table)
+        else:
+            df.to_csv(self.path, mode='a', header=self._header, index=False)
+            self._header = False
+
+    def close(self):
+        if self._writer is not None:
+            self._writer.close()
+
+
+def score_file(input_path, output_path, workers=0, chunk_size=10000, max_in_flight=None,
+               **options):
+    """
+    Score a cohort file chunk by chunk, writing results in input order
+
+    Args:
+        input_path (str): CSV or .parquet input
+        output_path (str): CSV or .parquet output (overwritten)
+        workers (int): Scoring processes (0 = this process)
+        chunk_size (int): Rows per chunk
+        max_in_flight (int): Chunks queued or running at once (default
+            2 x workers); with chunk_size this bounds memory
+        **options: CohortScorer arguments
+
+    Returns:
+        dict: rows, seconds and rows_per_sec
+
+    Raises:
+        ImportError: If a .parquet path is given without pyarrow installed
+    """
+    # Check before any chunk is scored rather than when the first one is written
+    if input_path.endswith('.parquet') or output_path.endswith('.parquet'):
+        _import_pyarrow()
+
+    if options.get('keep') is None:
+        header = next(read_chunks(input_path, 1))
+        options['keep'] = [column for column in ('user_id',) if column in header]
+
+    writer = ChunkWriter(output_path)
+    rows = 0
+    start = time.perf_counter()
+
+    def report(scored):
+        nonlocal rows
+        writer.write(scored)
+        rows += len(scored)
+        elapsed = time.perf_counter() - start
+        print(f"   {rows:,} rows scored ({rows / elapsed:,.0f} rows/sec)", flush=True)
+
+    try:
+        chunks = read_chunks(input_path, chunk_size)
+        if not workers:
+            _init_worker(options)
+            for chunk in chunks:
+                report(_score_chunk(chunk))
+        else:
+            max_in_flight = max_in_flight or 2 * workers
+            pending = deque()
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                     initargs=(options,)) as pool:
+                for chunk in chunks:
+                    pending.append(pool.submit(_score_chunk, chunk))
+                    if len(pending) >= max_in_flight:
+                        report(pending.popleft().result())
+                while pending:
+                    report(pending.popleft().result())
+    finally:
+        writer.close()
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_sec': rows / elapsed if elapsed else 0.0
+    }
+
+
+def main():
+    """
+    Command-line entry point
+    """
+    parser = argparse.ArgumentParser(description="Score a cohort file of lifestyle profiles")
+    parser.add_argument('input', help="CSV or .parquet file of profiles")
+    parser.add_argument('output', help="CSV or .parquet file to write")
+    parser.add_argument('--model', default='logistic',
+                        choices=['logistic', 'decision_tree', 'random_forest'])
+    parser.add_argument('--compiled', action='store_true',
+                        help="NumPy-only predictor from the memory-mapped model bundle")
+    parser.add_argument('--stress-from-column', action='store_true',
+                        help="Use the input stress_level column instead of the model")
+    parser.add_argument('--work-hours', type=float, default=DEFAULT_WORK_HOURS,
+                        help="Work hours for rows / files without work_hours "
+                             f"(default: {DEFAULT_WORK_HOURS:g})")
+    parser.add_argument('--social-interaction', choices=list(ACTIVITY_MAPPING),
+                        default=DEFAULT_SOCIAL_INTERACTION,
+                        help="Level for rows / files without social_interaction "
+                             f"(default: {DEFAULT_SOCIAL_INTERACTION})")
+    parser.add_argument('--text-column', help="Also score this free-text column")
+    parser.add_argument('--keep', nargs='*',
+                        help="Input columns copied to the output (default: user_id)")
+    parser.add_argument('--workers', type=int, default=0,
+                        help="Scoring processes (0 = this process)")
+    parser.add_argument('--chunk-size', type=int, default=10000)
+    args = parser.parse_args()
+
+    print("\n" + "="*70)
+    print("🚀 SCORING COHORT")
+    print("="*70 + "\n")
+    print(f"📂 {args.input} → {args.output}")
+
+    try:
+        result = score_file(
+            args.input, args.output,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            model_type=args.model,
+            compiled=args.compiled,
+            stress_from_column=args.stress_from_column,
+            work_hours=args.work_hours,
+            social_interaction=args.social_interaction,
+            text_column=args.text_column,
+            keep=args.keep
+        )
+    except (ImportError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    print(f"\n✅ {result['rows']:,} rows in {result['seconds']:.1f}s "
+          f"({result['rows_per_sec']:,.0f} rows/sec)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,9 @@
+"""
+Shared pytest setup: make the project root importable (nlp, rules, chatbot)
+"""
+
+import os
+import sys
+
+# allow imports from project root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,96 @@
+"""
+Tests for ChatService conversation routing (chatbot/chat_service.py)
+"""
+
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from chatbot.chat_service import BATCH_SIZE_BUCKETS, QUESTIONS, ChatError, ChatService
+from chatbot.health_bot import HealthChatbot
+from chatbot.metrics import MetricsRegistry
+from chatbot.session_store import MemorySessionStore
+from nlp.micro_batcher import MicroBatchPredictor
+
+
+def test_answers_text_step_only_for_the_free_text_question():
+    sessions = MemorySessionStore()
+    service = ChatService(None, sessions)
+
+    assert not service.answers_text_step({"message": "hi"})
+    assert not service.answers_text_step({"message": "hi", "session_id": "missing"})
+
+    reply, collected = service.advance_session({"message": "hi"})
+    assert collected is None
+    data = {"message": "I feel stressed", "session_id": reply["session_id"]}
+    assert service.answers_text_step(data)
+
+    for step in range(1, len(QUESTIONS) + 1):
+        session = sessions.get(reply["session_id"])
+        session.step = step
+        sessions.save(reply["session_id"], session)
+        assert not service.answers_text_step(data)
+
+
+def test_routing_check_does_not_count_session_lookups():
+    sessions = MemorySessionStore()
+    service = ChatService(None, sessions)
+    reply, _ = service.advance_session({"message": "hi"})
+    data = {"message": "not a number", "session_id": reply["session_id"]}
+    session = sessions.peek(reply["session_id"])
+    session.step = 1
+    sessions.save(reply["session_id"], session)
+
+    assert not service.answers_text_step(data)
+    assert not service.answers_text_step({"message": "hi", "session_id": "missing"})
+    with pytest.raises(ChatError):
+        service.advance_session(data)
+
+    stats = sessions.stats()
+    assert (stats["hits"], stats["misses"]) == (1, 0)
+
+
+def test_guidance_cache_is_exported():
+    metrics = MetricsRegistry()
+    chatbot = HealthChatbot()
+    ChatService(chatbot, MemorySessionStore(), metrics=metrics)
+    assert "guidance_cache" not in metrics.render()
+
+    generator = chatbot.guidance_generator  # loads and prewarms (not counted)
+    prewarmed = generator.cache_info()["size"]
+    assessment = next(iter(chatbot.risk_assessor.reachable_assessments()))
+    generator.generate_comprehensive_guidance(assessment)
+
+    text = metrics.render()
+    assert f"s2h_guidance_cache_entries {prewarmed}" in text
+    assert "s2h_guidance_cache_hits_total 1" in text
+    assert "s2h_guidance_cache_misses_total 0" in text
+
+
+class ConstantPredictor:
+    def predict_batch(self, columns):
+        return ['medium'] * len(columns['sleep_hours'])
+
+
+def test_micro_batching_is_exported():
+    metrics = MetricsRegistry()
+    chatbot = HealthChatbot()
+    service = ChatService(chatbot, MemorySessionStore(), metrics=metrics)
+    # Not loaded yet: the scrape must not load it
+    assert "micro_batch" not in metrics.render()
+    assert chatbot.loaded_component("stress_predictor") is None
+
+    histogram = metrics.histogram("micro_batch_size", buckets=BATCH_SIZE_BUCKETS)
+    chatbot.stress_predictor = MicroBatchPredictor(ConstantPredictor(), max_wait_ms=20,
+                                                   on_batch=histogram.observe)
+    with ThreadPoolExecutor(8) as pool:
+        results = list(pool.map(lambda _: chatbot.stress_predictor.predict(7, 'low', 8, 'medium'),
+                                range(8)))
+    assert results == ['medium'] * 8
+
+    text = service.metrics.render()
+    stats = chatbot.stress_predictor.stats()
+    assert f"s2h_micro_batch_size_count {stats['batches']}" in text
+    assert "s2h_micro_batch_size_sum 8" in text
+    assert "s2h_micro_batch_queue_depth 0" in text
+    assert "s2h_micro_batch_errors_total 0" in text
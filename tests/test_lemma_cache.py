@@ -0,0 +1,69 @@
+"""
+Tests for the lemma cache (nlp/lemma_cache.py): persistence across restarts
+and the counters exported on /metrics
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+from nlp.lemma_cache import LemmaCache
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def test_save_and_reload_keep_recent_entries(tmp_path):
+    path = str(tmp_path / 'lemmas.json')
+    cache = LemmaCache(maxsize=2, path=path)
+    cache.put('running', 'run')
+    cache.put('cats', 'cat')
+    cache.put('feet', 'foot')
+    assert cache.stats()['evictions'] == 1
+    assert cache.save_if_changed()
+
+    reloaded = LemmaCache(maxsize=2, path=path)
+    assert len(reloaded) == 2
+    assert reloaded.get('feet') == 'foot' and reloaded.get('running') is None
+    # Nothing added since the load, so nothing to write
+    assert not reloaded.save_if_changed()
+
+
+def test_save_if_changed_without_path_is_a_no_op():
+    cache = LemmaCache()
+    cache.put('cats', 'cat')
+    assert not cache.save_if_changed()
+
+
+def test_shared_cache_is_saved_at_exit(tmp_path):
+    path = tmp_path / 'lemmas.json'
+    script = (
+        "from nlp.lemma_cache import get_shared_cache\n"
+        "get_shared_cache().lemmatize_many(['cats', 'feet'], lambda w: w[:-1])\n"
+    )
+    env = dict(os.environ, LEMMA_CACHE_PATH=str(path), PYTHONPATH=PROJECT_ROOT)
+    subprocess.run([sys.executable, '-c', script], env=env, check=True, cwd=PROJECT_ROOT)
+
+    assert json.loads(path.read_text()) == [['cats', 'cat'], ['feet', 'fee']]
+
+    # The next start begins warm
+    script = (
+        "from nlp.lemma_cache import get_shared_cache\n"
+        "cache = get_shared_cache()\n"
+        "cache.lemmatize_many(['cats', 'feet'], lambda w: 1 / 0)\n"
+        "print(cache.stats()['hits'])\n"
+    )
+    result = subprocess.run([sys.executable, '-c', script], env=env, check=True,
+                            cwd=PROJECT_ROOT, capture_output=True, text=True)
+    assert result.stdout.strip() == '2'
+
+
+def test_cache_counters_are_exported():
+    from chatbot.chat_service import ChatService
+    from chatbot.session_store import MemorySessionStore
+
+    text = ChatService(None, MemorySessionStore()).metrics.render()
+    for name in ('lemma_cache_entries', 'lemma_cache_max_entries', 'lemma_cache_hits_total',
+                 'lemma_cache_misses_total', 'lemma_cache_evictions_total'):
+        assert f"\ns2h_{name} " in text, name
@@ -0,0 +1,136 @@
+"""
+Tests for model bundles (nlp/model_bundle.py) and the compiled predictors
+they hold (nlp/compiled_predictor.py)
+"""
+
+import json
+import os
+
+import numpy as np
+import pytest
+
+pytest.importorskip('sklearn')
+pytest.importorskip('pandas')
+
+from nlp.compiled_predictor import CompiledTreePredictor
+from nlp.ml_predictor import StressPredictor
+from nlp.model_bundle import (
+    BUNDLE_FORMAT, HEADER_BYTES, MAGIC, MODEL_TYPES, load_bundle, read_bundle,
+    read_manifest, save_bundle, write_bundle
+)
+
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'data', 'stress_dataset.csv')
+
+
+@pytest.fixture(scope='module', params=MODEL_TYPES)
+def trained(request):
+    predictor = StressPredictor(model_type=request.param)
+    predictor.train(DATA_PATH)
+    return predictor
+
+
+@pytest.fixture(scope='module')
+def profiles():
+    rng = np.random.default_rng(7)
+    n = 5000
+    return {
+        'sleep_hours': rng.uniform(0, 24, n),
+        'physical_activity': rng.choice(['low', 'medium', 'high', 'High'], n),
+        'work_hours': rng.uniform(0, 24, n),
+        'social_interaction': rng.choice(['low', 'Medium', 'high'], n),
+    }
+
+
+def test_round_trip_matches_sklearn(trained, profiles, tmp_path):
+    path = tmp_path / 'model.bundle'
+    manifest = save_bundle(path, trained.compile(), metadata={'note': 'test'})
+    predictor = load_bundle(path)
+
+    assert predictor.model_type == trained.model_type
+    assert predictor.manifest['checksum'] == manifest['checksum']
+    assert predictor.manifest['format'] == BUNDLE_FORMAT
+    assert predictor.manifest['metadata'] == {'note': 'test'}
+    assert 'scikit-learn' in predictor.manifest['libraries']
+
+    np.testing.assert_array_equal(predictor.predict_batch(profiles), trained.predict_batch(profiles))
+    expected = trained.predict_proba_batch(profiles)
+    actual = predictor.predict_proba_batch(profiles)
+    for level in expected:
+        np.testing.assert_array_equal(actual[level], expected[level])
+
+    for row in zip(*(profiles[key][:200] for key in profiles)):
+        assert predictor.predict(*row) == trained.predict(*row)
+        assert predictor.get_prediction_probability(*row) == trained.get_prediction_probability(*row)
+
+
+def test_arrays_are_read_only_memory_maps(trained, tmp_path):
+    path = tmp_path / 'model.bundle'
+    compiled = trained.compile()
+    save_bundle(path, compiled)
+    _, arrays = read_bundle(path)
+
+    for name, array in compiled.to_arrays().items():
+        mapped = arrays[name]
+        assert isinstance(mapped.base, np.memmap), name
+        assert not mapped.flags.writeable, name
+        assert mapped.dtype == np.asarray(array).dtype, name
+        np.testing.assert_array_equal(mapped, array)
+        # Memory order is kept (it decides the matmul summation order)
+        assert mapped.flags.f_contiguous == np.asarray(array).flags.f_contiguous, name
+
+
+def test_fortran_order_is_preserved(tmp_path):
+    array = np.asfortranarray(np.arange(12, dtype=np.float64).reshape(3, 4))
+    path = tmp_path / 'arrays.bundle'
+    write_bundle(path, {'a': array, 'b': np.arange(5, dtype=np.int32)}, {'format': BUNDLE_FORMAT})
+    _, arrays = read_bundle(path)
+
+    np.testing.assert_array_equal(arrays['a'], array)
+    assert arrays['a'].flags.f_contiguous and not arrays['a'].flags.c_contiguous
+    np.testing.assert_array_equal(arrays['b'], np.arange(5))
+
+
+def test_corrupted_data_is_detected(trained, tmp_path):
+    path = tmp_path / 'model.bundle'
+    save_bundle(path, trained.compile())
+    manifest, data_start = read_manifest(path)
+
+    raw = bytearray(path.read_bytes())
+    raw[data_start + manifest['data_bytes'] // 2] ^= 0xFF
+    path.write_bytes(bytes(raw))
+
+    with pytest.raises(ValueError, match='checksum'):
+        load_bundle(path)
+    # Skipping the check still maps the (corrupted) arrays
+    assert load_bundle(path, verify=False).model_type == trained.model_type
+
+
+def test_not_a_bundle_is_rejected(tmp_path):
+    path = tmp_path / 'model.bundle'
+    path.write_bytes(b'not a bundle at all')
+    with pytest.raises(ValueError, match='not a model bundle'):
+        load_bundle(path)
+
+
+def test_newer_format_is_rejected(tmp_path):
+    header = json.dumps({'format': BUNDLE_FORMAT + 1}).encode('utf-8')
+    path = tmp_path / 'model.bundle'
+    path.write_bytes(MAGIC + len(header).to_bytes(8, 'little') + header)
+    assert len(MAGIC) + 8 == HEADER_BYTES
+    with pytest.raises(ValueError, match='bundle format'):
+        load_bundle(path)
+
+
+def test_large_forest_batch_walks_in_blocks(profiles):
+    trained = StressPredictor(model_type='random_forest')
+    trained.train(DATA_PATH)
+    compiled = CompiledTreePredictor.from_estimators(trained.scaler, trained.model,
+                                                     trained.label_encoder)
+    many = {key: np.tile(values, 2) for key, values in profiles.items()}  # > one block
+
+    expected = trained.predict_proba_batch(many)
+    actual = compiled.predict_proba_batch(many)
+    for level in expected:
+        np.testing.assert_array_equal(actual[level], expected[level])
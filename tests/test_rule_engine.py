@@ -0,0 +1,126 @@
+"""
+Tests for the risk rules compiler and hot reload (rules/rule_engine.py,
+rules/disease_risk.py)
+"""
+
+import copy
+import json
+import os
+
+import pytest
+
+from rules.disease_risk import DiseaseRiskAssessor
+from rules.rule_engine import DEFAULT_RULES_PATH, RuleSet, load_rules
+
+
+@pytest.fixture
+def spec():
+    with open(DEFAULT_RULES_PATH, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+@pytest.fixture
+def rules_file(tmp_path, spec):
+    path = tmp_path / 'risk_rules.json'
+    path.write_text(json.dumps(spec), encoding='utf-8')
+    return path
+
+
+def write_rules(path, spec):
+    path.write_text(json.dumps(spec), encoding='utf-8')
+    # Make sure the reload check sees a new mtime even on coarse clocks
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+
+def test_default_rules_compile():
+    rules = load_rules()
+    assessment = rules.evaluate('high', 31.0, 'low', 5.0)
+    assert assessment['diabetes_risk'] == 'high'
+    assert assessment['obesity_risk'] == 'high'
+    assert assessment['bmi_category'] == 'obese'
+
+
+def test_scalar_and_batch_evaluators_agree():
+    rules = load_rules()
+    levels = ['low', 'medium', 'high', 'unknown']
+    bmis = rules.boundary_points('bmi')
+    sleeps = rules.boundary_points('sleep_hours')
+    rows = [(s, b, a, h) for s in levels for b in bmis for a in levels for h in sleeps]
+
+    codes = rules.evaluate_batch(*(list(column) for column in zip(*rows)))
+    for i, row in enumerate(rows):
+        assessment = rules.evaluate(*row)
+        for key in ('diabetes_risk', 'blood_pressure_risk', 'obesity_risk',
+                    'cardiovascular_risk', 'sleep_disorder_risk'):
+            assert assessment[key] == ['low', 'medium', 'high'][codes[key][i]], (row, key)
+        assert assessment['bmi_category'] == rules.bmi_category_labels[codes['bmi_category'][i]]
+
+
+@pytest.mark.parametrize('value', [
+    '__import__("os").getpid() and 6', '6', None, True, float('nan'), [6],
+])
+def test_non_numeric_threshold_is_rejected(spec, value):
+    spec['risks']['diabetes_risk']['thresholds']['high'] = value
+    with pytest.raises(ValueError, match='thresholds.high'):
+        RuleSet(spec)
+
+
+def test_medium_above_high_is_rejected(spec):
+    spec['risks']['diabetes_risk']['thresholds'] = {'medium': 7, 'high': 6}
+    with pytest.raises(ValueError, match='medium threshold is above high'):
+        RuleSet(spec)
+
+
+def test_unknown_override_input_is_rejected(spec, capsys):
+    spec['risks']['obesity_risk']['overrides'][0]['input'] = 'print("INJECTED") or bmi'
+    with pytest.raises(ValueError, match='unknown input'):
+        RuleSet(spec)
+    assert 'INJECTED' not in capsys.readouterr().out
+
+
+@pytest.mark.parametrize('condition', [['<'], '<', [['<'], 6, 1], ['>=', 30]])
+def test_malformed_condition_is_rejected(spec, condition):
+    spec['risks']['diabetes_risk']['factors'][0]['points'][0] = condition
+    with pytest.raises(ValueError):
+        RuleSet(spec)
+
+
+def test_generated_source_only_holds_literals(spec):
+    spec['risks']['diabetes_risk']['thresholds'] = {'medium': 3, 'high': 6.5}
+    rules = RuleSet(spec)
+    assert 'score >= 6.5 else 1 if score >= 3.0 else 0' in rules.generated_source
+    assert rules.evaluate('high', 31.0, 'low', 5.0)['diabetes_risk'] == 'high'
+
+
+def test_invalid_reload_keeps_current_rules(rules_file, spec, capsys):
+    assessor = DiseaseRiskAssessor(precompute=False, rules_path=str(rules_file), reload_interval=0)
+    before = assessor.rules
+
+    bad = copy.deepcopy(spec)
+    bad['risks']['diabetes_risk']['thresholds']['high'] = '__import__("os").getpid() and 6'
+    write_rules(rules_file, bad)
+
+    with pytest.raises(ValueError):
+        assessor.reload_rules()
+    assert assessor.rules is before
+
+    # The periodic check logs the error and keeps serving the old rules
+    assessor.reload_interval = 0.001
+    assessor._next_check = 0.0
+    result = assessor.get_comprehensive_assessment('high', 31.0, 'low', 5.0)
+    assert assessor.rules is before
+    assert result['diabetes_risk'] == 'high'
+    assert 'Keeping current risk rules' in capsys.readouterr().out
+
+
+def test_valid_reload_swaps_rules(rules_file, spec):
+    assessor = DiseaseRiskAssessor(precompute=True, rules_path=str(rules_file), reload_interval=0.001)
+    assert assessor.get_comprehensive_assessment('low', 22.0, 'high', 8.0)['sleep_disorder_risk'] == 'low'
+
+    edited = copy.deepcopy(spec)
+    edited['risks']['sleep_disorder_risk']['thresholds'] = {'medium': 0, 'high': 0}
+    write_rules(rules_file, edited)
+    assessor._next_check = 0.0
+
+    assert assessor.get_comprehensive_assessment('low', 22.0, 'high', 8.0)['sleep_disorder_risk'] == 'high'
@@ -0,0 +1,71 @@
+"""
+End-to-end tests for cohort scoring (score_cohort.py)
+"""
+
+import os
+import sys
+
+import pytest
+
+pd = pytest.importorskip('pandas')
+
+import score_cohort
+from score_cohort import RISK_COLUMNS, CohortScorer, score_file
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIFESTYLE_PATH = os.path.join(PROJECT_ROOT, 'data', 'lifestyle_dataset.csv')
+
+needs_model = pytest.mark.skipif(
+    not os.path.isdir(os.path.join(PROJECT_ROOT, 'models', 'logistic')),
+    reason="model not trained, run train_models.py"
+)
+
+
+def read_output(path):
+    return pd.read_csv(path, keep_default_na=False)
+
+
+def test_score_file_with_stress_from_column(tmp_path):
+    output = tmp_path / 'scores.csv'
+    result = score_file(LIFESTYLE_PATH, str(output), chunk_size=7, stress_from_column=True)
+
+    source = pd.read_csv(LIFESTYLE_PATH)
+    scored = read_output(output)
+    assert result['rows'] == len(source) == len(scored)
+    assert list(scored.columns) == ['user_id', 'stress_level', *RISK_COLUMNS]
+    assert scored['user_id'].tolist() == source['user_id'].tolist()
+    assert scored['stress_level'].tolist() == source['stress_level'].str.lower().tolist()
+    for column in RISK_COLUMNS[:-1]:
+        assert set(scored[column]) <= {'low', 'medium', 'high'}
+
+
+@needs_model
+def test_cli_defaults_score_lifestyle_dataset(tmp_path, monkeypatch, capsys):
+    output = tmp_path / 'scores.csv'
+    monkeypatch.setattr(sys, 'argv', ['score_cohort.py', LIFESTYLE_PATH, str(output)])
+    score_cohort.main()
+
+    scored = read_output(output)
+    assert len(scored) == len(pd.read_csv(LIFESTYLE_PATH))
+    assert set(scored['stress_level']) <= {'low', 'medium', 'high'}
+    assert (scored['stress_level'] != '').all()
+    assert 'rows/sec' in capsys.readouterr().out
+
+
+def test_missing_column_without_default_is_a_clear_error():
+    scorer = CohortScorer(stress_from_column=False)
+    with pytest.raises(ValueError, match="no 'work_hours' column"):
+        scorer._profiles(pd.read_csv(LIFESTYLE_PATH))
+
+
+def test_cli_reports_errors_without_traceback(tmp_path, monkeypatch, capsys):
+    def failing_score_file(*args, **kwargs):
+        raise ValueError("bad input")
+
+    monkeypatch.setattr(score_cohort, 'score_file', failing_score_file)
+    monkeypatch.setattr(sys, 'argv', ['score_cohort.py', LIFESTYLE_PATH, str(tmp_path / 'x.csv')])
+    with pytest.raises(SystemExit) as exit_info:
+        score_cohort.main()
+    assert exit_info.value.code == 1
+    assert '❌ bad input' in capsys.readouterr().out
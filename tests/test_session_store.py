@@ -0,0 +1,166 @@
+"""
+Tests for the session stores (chatbot/session_store.py)
+"""
+
+import threading
+import time
+
+import pytest
+
+from chatbot.session_store import (
+    ChatSession, MemorySessionStore, RedisSessionStore, SQLiteSessionStore, create_session_store
+)
+
+
+def test_get_does_not_hide_expired_sessions_from_the_sweep():
+    store = MemorySessionStore(ttl_seconds=0.05)
+    store.save('abandoned', ChatSession())
+    store.save('active', ChatSession())
+
+    # A read (e.g. a request rejected by validation) must not move the
+    # session behind live ones without renewing its expiry
+    assert store.get('abandoned') is not None
+    time.sleep(0.1)
+
+    store.save('new', ChatSession())
+    assert len(store) == 1
+    assert store.stats()['expired'] == 2
+
+
+def test_expired_session_is_a_miss():
+    store = MemorySessionStore(ttl_seconds=0.05)
+    store.save('a', ChatSession())
+    time.sleep(0.1)
+    assert store.get('a') is None
+    assert len(store) == 0
+
+
+def test_oldest_saved_session_is_evicted():
+    store = MemorySessionStore(max_sessions=2)
+    store.save('a', ChatSession())
+    store.save('b', ChatSession())
+    store.get('a')
+    store.save('a', ChatSession())
+    store.save('c', ChatSession())
+
+    assert store.get('b') is None
+    assert store.get('a') is not None and store.get('c') is not None
+    assert store.stats()['evicted'] == 1
+
+
+def test_sqlite_round_trip(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / 'sessions.db'))
+    session = ChatSession()
+    store.save('a', session)
+    session.step = 2
+    session.answers[1] = 'I feel stressed'
+    store.save('a', session)
+
+    loaded = store.get('a')
+    assert loaded.step == 2 and loaded.answers[1] == 'I feel stressed'
+    assert store.get('missing') is None
+    store.delete('a')
+    assert len(store) == 0
+    stats = store.stats()
+    assert (stats['created'], stats['completed'], stats['hits'], stats['misses']) == (1, 1, 1, 1)
+
+
+def test_sqlite_purge_counts_expired(tmp_path, monkeypatch):
+    monkeypatch.setattr(SQLiteSessionStore, 'PURGE_EVERY', 4)
+    store = SQLiteSessionStore(str(tmp_path / 'sessions.db'), ttl_seconds=0.05)
+    store.save('a', ChatSession())
+    store.save('b', ChatSession())
+    time.sleep(0.1)
+    assert store.get('a') is None  # expired rows are never returned
+
+    store.save('c', ChatSession())
+    store.save('d', ChatSession())  # 4th write: purge
+    assert store.stats()['expired'] == 2
+    assert len(store) == 2
+
+
+def test_sqlite_writes_are_counted_across_threads(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / 'sessions.db'))
+
+    def save_many(worker):
+        for i in range(50):
+            store.save(f'{worker}-{i}', ChatSession())
+
+    threads = [threading.Thread(target=save_many, args=(n,)) for n in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert store._writes == 200
+    assert len(store) == 200
+
+
+def test_sqlite_oldest_saved_session_is_evicted(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / 'sessions.db'), max_sessions=2)
+    store.save('a', ChatSession())
+    store.save('b', ChatSession())
+    answered = ChatSession(step=1)
+    store.save('a', answered)  # renews a
+    store.save('c', ChatSession())
+
+    assert store.get('b') is None
+    assert store.get('a') is not None and store.get('c') is not None
+    assert store.stats()['evicted'] == 1
+
+
+def test_sqlite_cap_drops_expired_sessions_first(tmp_path):
+    store = SQLiteSessionStore(str(tmp_path / 'sessions.db'), ttl_seconds=0.05, max_sessions=2)
+    store.save('a', ChatSession())
+    store.save('b', ChatSession())
+    time.sleep(0.1)
+    store.save('c', ChatSession())
+
+    stats = store.stats()
+    assert (stats['expired'], stats['evicted'], stats['active']) == (2, 0, 1)
+
+
+class DictRedis:
+    """Just the redis-py calls RedisSessionStore uses"""
+
+    def __init__(self):
+        self.data = {}
+
+    def get(self, key):
+        return self.data.get(key)
+
+    def set(self, key, value, ex=None):
+        self.data[key] = value
+
+    def delete(self, key):
+        return 1 if self.data.pop(key, None) is not None else 0
+
+
+def test_redis_stats_leave_out_expiry():
+    store = RedisSessionStore(DictRedis())
+    store.save('a', ChatSession())
+    assert store.get('a') is not None
+    store.delete('a')
+
+    stats = store.stats()
+    assert 'expired' not in stats and 'evicted' not in stats
+    assert (stats['created'], stats['completed'], stats['hits']) == (1, 1, 1)
+
+
+def test_create_session_store_urls(tmp_path, monkeypatch):
+    memory = create_session_store('memory://', ttl_seconds=5, max_sessions=3)
+    assert isinstance(memory, MemorySessionStore)
+    assert (memory.ttl_seconds, memory.max_sessions) == (5, 3)
+
+    path = tmp_path / 'sessions.db'
+    sqlite = create_session_store(f'sqlite:///{path}', ttl_seconds=5, max_sessions=3)
+    assert isinstance(sqlite, SQLiteSessionStore)
+    assert (sqlite.path, sqlite.ttl_seconds, sqlite.max_sessions) == (str(path), 5, 3)
+    assert path.exists()
+
+    monkeypatch.setattr(RedisSessionStore, 'from_url',
+                        classmethod(lambda cls, url, **kwargs: (url, kwargs)))
+    assert create_session_store('redis://localhost:6379/0', ttl_seconds=5) == \
+        ('redis://localhost:6379/0', {'ttl_seconds': 5})
+
+    with pytest.raises(ValueError, match='Unknown session store URL'):
+        create_session_store('postgres://localhost/sessions')
@@ -0,0 +1,29 @@
+"""
+Tests for text model training (nlp/text_predictor.py)
+"""
+
+import os
+
+import pytest
+
+pytest.importorskip('sklearn')
+pd = pytest.importorskip('pandas')
+
+from nlp.text_predictor import TextStressPredictor
+
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                         'data', 'stress_dataset.csv')
+
+
+def test_single_chunk_file_reports_held_out_accuracy(capsys):
+    metrics = TextStressPredictor(n_features=2 ** 12).train(DATA_PATH, epochs=2)
+    assert 0.0 <= metrics['accuracy'] <= 1.0
+    assert 'Held-out accuracy' in capsys.readouterr().out
+
+
+def test_chunked_file_reports_progressive_accuracy(capsys):
+    metrics = TextStressPredictor(n_features=2 ** 12).train(DATA_PATH, chunk_size=10, epochs=2)
+    assert 0.0 <= metrics['accuracy'] <= 1.0
+    assert metrics['n_samples'] == len(pd.read_csv(DATA_PATH).dropna(subset=['text', 'stress_level']))
+    assert 'progressive accuracy' in capsys.readouterr().out
@@ -0,0 +1,83 @@
+"""
+Tests for incremental TextSession features (nlp/text_processor.py): after
+every fed chunk they must equal extract_stress_features() on the text so far
+"""
+
+import random
+import re
+
+import pytest
+
+from nlp.text_processor import TextProcessor
+
+
+MESSAGES = [
+    "I feel extremely stressed and can't sleep well",
+    "Work has been CHAOTIC, I'm overwhelmed... anxiety everywhere!!",
+    "Honestly I'm calm, relaxed and happy; life is great and balanced",
+    "burnt out, burnt-out, burnout: I cannot keep going, gonna panic",
+    "stressed stressed stressed but motivated and content",
+    "   leading spaces,\ttabs\nand newlines   between   words  ",
+    "wonderful harmony 123 with numbers 4u and symbols #calm @peaceful",
+    "",
+]
+
+
+@pytest.fixture(scope='module')
+def processor():
+    processor = TextProcessor(use_spacy=False)
+    try:
+        processor.warm_up()
+    except LookupError as e:
+        pytest.skip(f"NLTK data not installed: {e}")
+    return processor
+
+
+def expected(processor, text):
+    features = processor.extract_stress_features(text)
+    processed_text = features.pop('processed_text')
+    return features, processed_text
+
+
+def chunkings(text, seed):
+    rng = random.Random(seed)
+    yield [text]
+    yield list(text)
+    yield re.split(r'(?<= )', text)
+    for _ in range(3):
+        cuts = sorted(rng.sample(range(len(text) + 1), min(len(text), rng.randint(1, 6))))
+        yield [text[i:j] for i, j in zip([0] + cuts, cuts + [len(text)])]
+
+
+@pytest.mark.parametrize('text', MESSAGES)
+def test_session_matches_full_extraction_after_every_chunk(processor, text):
+    for chunks in chunkings(text, seed=len(text)):
+        session = processor.session()
+        typed = ''
+        for chunk in chunks:
+            session.feed(chunk)
+            typed += chunk
+            features, processed_text = expected(processor, typed)
+            assert session.features() == features, (chunks, typed)
+            assert session.processed_text() == processed_text, (chunks, typed)
+        assert session.length == len(text)
+
+
+@pytest.mark.parametrize('text', MESSAGES)
+def test_session_prediction_matches_processor(processor, text):
+    session = processor.session()
+    session.feed(text)
+    assert session.predict_stress() == processor.predict_stress_from_text(text)
+
+
+def test_features_do_not_commit_the_unfinished_word(processor):
+    session = processor.session()
+    session.feed("I am stre")
+    session.features()
+    session.feed("ssed")
+    assert session.features() == expected(processor, "I am stressed")[0]
+
+    session.feed(" and burnt")
+    session.features()
+    session.feed(" out")
+    assert session.features() == expected(processor, "I am stressed and burnt out")[0]
@@ -68,6 +68,90 @@ def train_ml_models():
     return models_trained
 
 
+def train_text_model():
+    """
+    Train the hashing-vectorizer text model (streams the CSV in chunks)
+    """
+    print("\n" + "="*70)
+    print("🚀 TRAINING TEXT MODEL")
+    print("="*70 + "\n")
+    
+    try:
+        from nlp.text_predictor import TextStressPredictor
+        
+        predictor = TextStressPredictor()
+        
+        # Train model on the free-text column
+        metrics = predictor.train('data/stress_dataset.csv', text_column='text')
+        
+        # Save model
+        predictor.save_model('models/text')
+        
+        # Test prediction
+        print("\n✅ Testing text model...")
+        print(f"   'I feel anxious and overwhelmed' → "
+              f"{predictor.predict('I feel anxious and overwhelmed')}")
+        print(f"   'I feel calm and relaxed' → {predictor.predict('I feel calm and relaxed')}")
+        
+        print("\n✅ Text model trained and saved successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Error training text model: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
+def train_fused_model():
+    """
+    Train the fused text + lifestyle model
+    """
+    print("\n" + "="*70)
+    print("🚀 TRAINING FUSED TEXT + LIFESTYLE MODEL")
+    print("="*70 + "\n")
+    
+    try:
+        from nlp.fused_predictor import FusedStressPredictor
+        
+        predictor = FusedStressPredictor()
+        
+        # Train model (text features are extracted in one batched pass)
+        metrics = predictor.train('data/stress_dataset.csv')
+        
+        # Save model
+        predictor.save_model('models/fused')
+        
+        # Test prediction
+        print("\n✅ Testing fused model...")
+        test_stress = predictor.predict(
+            "I feel anxious and overwhelmed",
+            sleep_hours=5,
+            physical_activity='low',
+            work_hours=11,
+            social_interaction='low'
+        )
+        print(f"   Test prediction (high stress profile): {test_stress}")
+        
+        test_stress2 = predictor.predict(
+            "I feel calm and relaxed",
+            sleep_hours=8,
+            physical_activity='high',
+            work_hours=7,
+            social_interaction='high'
+        )
+        print(f"   Test prediction (low stress profile): {test_stress2}")
+        
+        print("\n✅ Fused model trained and saved successfully!")
+        return True
+        
+    except Exception as e:
+        print(f"\n❌ Error training fused model: {e}")
+        import traceback
+        traceback.print_exc()
+        return False
+
+
 def train_deep_learning_model():
     """
     Train deep learning model (optional)
@@ -148,6 +232,12 @@ def main():
     # Train ML models
     ml_models = train_ml_models()
     
+    # Train text model
+    text_trained = train_text_model()
+    
+    # Train fused text + lifestyle model
+    fused_trained = train_fused_model()
+    
     # Ask about deep learning
     print("\n" + "="*70)
     print("\nWould you like to train the deep learning model? (yes/no)")
@@ -168,6 +258,16 @@ def main():
     for model in ml_models:
         print(f"   • {model}")
     
+    if text_trained:
+        print(f"\n✅ Text Model: Trained")
+    else:
+        print(f"\n❌ Text Model: Failed")
+    
+    if fused_trained:
+        print(f"\n✅ Fused Model: Trained")
+    else:
+        print(f"\n❌ Fused Model: Failed")
+    
     if dl_trained:
         print(f"\n✅ Deep Learning Model: Trained")
     else: